@@ -18,6 +18,12 @@ if [ ! -f "$SUBDOMAIN_FILE" ]; then
     exit 1
 fi
 
+# The Python resolver sends the queries itself, many at a time, instead of running host for each name
+RESOLVER="$(dirname "$0")/subdomain-resolver.py"
+if command -v python3 > /dev/null && [ -f "$RESOLVER" ]; then
+    exec python3 "$RESOLVER" "$DOMAIN" "$SUBDOMAIN_FILE" "$OUTPUT_FILE" "${@:4}"
+fi
+
 echo "Checking subdomains for $DOMAIN using list from $SUBDOMAIN_FILE..."
 echo "Only active subdomains will be saved to $OUTPUT_FILE"
 echo "-------------------------------------------------------------"
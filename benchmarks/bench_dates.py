@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Micro-benchmark of date recognition: the original regex cascade plus dateutil against DateRecognizer
+
+Usage: python3 benchmarks/bench_dates.py [--size N]
+"""
+import argparse
+import random
+
+from common import load_blog_scraper, time_per_call
+import legacy
+
+MONTHS = ['January', 'February', 'March', 'April', 'May', 'June', 'July', 'August',
+          'September', 'October', 'November', 'December']
+NOISE = [
+    'Read more', '5 min read', 'Share this article', 'Threat Intelligence', 'By Research Team',
+    'Subscribe to our newsletter', 'Malware', 'Vulnerability Research', 'Contact us', 'Load more posts',
+    'Ransomware operators are increasingly targeting hypervisors', '', '  ', 'Page 2 of 14',
+]
+
+def build_corpus(size, seed=1):
+    """Date-bearing and date-free fragments in the mix seen on vendor listing pages"""
+    rng = random.Random(seed)
+    # Listings repeat a handful of recent days many times over
+    days = [(2025, rng.randint(1, 12), rng.randint(1, 28)) for _ in range(30)]
+    texts, attributes = [], []
+    for _ in range(size):
+        year, month, day = rng.choice(days)
+        name = MONTHS[month - 1]
+        texts.append(rng.choice([
+            f'{name[:3]} {day}, {year}',
+            f'{name} {day}, {year}',
+            f'{day} {name[:3]} {year}',
+            f'{day} {name} {year}',
+            f'{year}-{month:02d}-{day:02d}',
+            f'{month:02d}/{day:02d}/{year}',
+            f'Posted on {name} {day}, {year} by Threat Research',
+            f'{name[:3]} {day}, {year} | 6 min read',
+            rng.choice(NOISE),
+            rng.choice(NOISE),
+        ]))
+        attributes.append(rng.choice([
+            f'{year}-{month:02d}-{day:02d}',
+            f'{year}-{month:02d}-{day:02d}T{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00Z',
+            f'{year}-{month:02d}-{day:02d}T09:30:00+00:00',
+            f'{name[:3]} {day}, {year}',
+        ]))
+    return texts, attributes
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--size', type=int, default=20000, help="number of fragments in the corpus")
+    args = arg_parser.parse_args()
+    
+    module = load_blog_scraper()
+    recognizer = module.DateRecognizer()
+    texts, attributes = build_corpus(args.size)
+    
+    mismatches = sum(legacy.extract_date_from_text(t) != recognizer.search(t) for t in texts)
+    mismatches += sum(legacy.parse_date(a) != recognizer.parse(a) for a in attributes)
+    
+    def cold(func):
+        def run(item):
+            recognizer.cache_clear()
+            return func(item)
+        return run
+    
+    rows = [
+        ('text search', texts, legacy.extract_date_from_text, recognizer.search),
+        ('attribute parse', attributes, legacy.parse_date, recognizer.parse),
+    ]
+    print(f"Corpus: {len(texts)} text fragments, {len(attributes)} datetime attributes, {mismatches} mismatches")
+    print(f"{'':<18}{'original':>12}{'cold cache':>12}{'warm cache':>12}{'speedup':>10}")
+    for label, inputs, original, optimized in rows:
+        before = time_per_call(original, inputs, repeat=3)
+        uncached = time_per_call(cold(optimized), inputs, repeat=3)
+        recognizer.cache_clear()
+        cached = time_per_call(optimized, inputs)
+        print(f"{label:<18}{before:>10.2f}us{uncached:>10.2f}us{cached:>10.2f}us{before / cached:>9.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Compare cluster_stories with checking every pair of posts, for speed and for the stories found
+
+Generated posts tell random stories, a share of them retold by other blogs with words
+reordered, dropped or added, and some reached again through a tracking or AMP URL.
+The pairwise check compares the titles of every two posts of different blogs; recall
+is the share of the pairs it finds similar enough that cluster_stories put in one story.
+
+Usage: python3 benchmarks/bench_dedupe.py [--sizes N,N,...] [--pairwise-limit N]
+"""
+import argparse
+import random
+import time
+
+from common import load_blog_scraper
+
+TOPIC_WORDS = [
+    'ransomware', 'botnet', 'loader', 'backdoor', 'stealer', 'phishing', 'exploit', 'zero-day', 'patch',
+    'vulnerability', 'campaign', 'espionage', 'supply-chain', 'firmware', 'router', 'vpn', 'gateway',
+    'exchange', 'fortios', 'ivanti', 'citrix', 'android', 'ios', 'macos', 'linux', 'windows', 'kubernetes',
+    'cloud', 'credentials', 'wiper', 'apt28', 'lazarus', 'lockbit', 'akira', 'qakbot', 'emotet', 'telegram',
+    'npm', 'pypi', 'github', 'cve-2024-3400', 'cve-2023-4966', 'critical', 'actively', 'exploited', 'targets',
+    'abuses', 'spreads', 'hijacks', 'steals', 'disrupts', 'analysis', 'operators', 'infrastructure',
+]
+FILLER = ['the', 'a', 'new', 'in', 'of', 'for', 'with', 'how', 'and', 'on']
+SYLLABLES = ['ka', 'ro', 'vi', 'zen', 'tor', 'mi', 'lux', 'dra', 'pho', 'nex', 'qu', 'sil']
+
+def generate_posts(count, seed=1):
+    """count posts from 40 blogs over four days, about a third of them retelling an earlier story"""
+    rng = random.Random(seed)
+    # Product, malware and actor names make titles of different stories differ
+    names = list({''.join(rng.choice(SYLLABLES) for _ in range(3)) for _ in range(3000)})
+    posts, stories = [], []
+    for i in range(count):
+        blog = f"Blog {rng.randrange(40)}"
+        date = f"2025-04-{rng.randint(18, 21)}"
+        url = f"https://blog{blog.split()[1]}.example.com/posts/{i}"
+        if stories and rng.random() < 0.35:
+            words, story_date = rng.choice(stories)
+            words = [word for word in words if rng.random() > 0.15]
+            words += rng.sample(FILLER, 2)
+            rng.shuffle(words)
+            date = story_date
+        else:
+            words = rng.sample(TOPIC_WORDS, rng.randint(3, 5)) + rng.sample(names, rng.randint(1, 3))
+            stories.append((words, date))
+        posts.append({'Blog': blog, 'Title': ' '.join(words).capitalize(), 'Date': date, 'URL': url})
+        if rng.random() < 0.05:
+            posts.append(dict(posts[-1], URL=url + rng.choice(['/amp', '?utm_source=twitter', '/?amp=1'])))
+    return posts
+
+def similar_pairs(module, posts):
+    """The URLs of every two posts of different blogs whose titles cluster_stories would join, comparing all pairs"""
+    unique = {}
+    for post in posts:
+        unique.setdefault(module.canonical_url(post['URL']), post)
+    posts = list(unique.values())
+    features = [module.title_features(post['Title']) for post in posts]
+    pairs = set()
+    for i in range(len(posts)):
+        for j in range(i):
+            if posts[i]['Blog'] != posts[j]['Blog'] and module.jaccard(features[i], features[j]) >= module.DEDUP_THRESHOLD:
+                pairs.add(tuple(sorted((posts[i]['URL'], posts[j]['URL']))))
+    return pairs
+
+def story_of(stories):
+    """{post URL: index of its story}"""
+    return {post['URL']: index for index, story in enumerate(stories) for post in story}
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--sizes', default='200,1000,5000,20000', help="comma-separated numbers of posts")
+    arg_parser.add_argument('--pairwise-limit', type=int, default=5000,
+                            help="largest number of posts to run the pairwise check on")
+    args = arg_parser.parse_args()
+    
+    module = load_blog_scraper()
+    print(f"{'posts':>8}{'unique':>8}{'stories':>9}{'LSH ms':>10}{'pairwise ms':>13}{'speedup':>9}{'recall':>8}")
+    for size in [int(size) for size in args.sizes.split(',')]:
+        posts = generate_posts(size)
+        # Every date of the generated posts is within DEDUP_MAX_DAYS, as in a real scan window
+        start = time.perf_counter()
+        unique, stories = module.cluster_stories(posts)
+        lsh = time.perf_counter() - start
+        line = f"{size:>8}{len(unique):>8}{len(stories):>9}{lsh * 1e3:>10.1f}"
+        if size <= args.pairwise_limit:
+            start = time.perf_counter()
+            expected = similar_pairs(module, posts)
+            pairwise = time.perf_counter() - start
+            found = story_of(stories)
+            joined = sum(1 for a, b in expected if a in found and found.get(a) == found.get(b))
+            recall = joined / len(expected) if expected else 1.0
+            line += f"{pairwise * 1e3:>13.1f}{pairwise / lsh:>8.1f}x{recall:>8.1%}"
+        print(line)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Check extract_date against the original selector cascade and time both
+
+Runs over benchmarks/corpus/articles.html, a generated listing page with deeply
+nested article markup, and any saved vendor pages given with --pages. Dates with a
+timezone offset must come back as naive local time, which is what they are compared
+with the window in; the original cascade's are converted the same way to compare.
+
+Usage: python3 benchmarks/bench_extract_date.py [--pages DIR] [--articles N]
+"""
+import argparse
+import glob
+import os
+import time
+
+from bs4 import BeautifulSoup
+
+from common import REPO_DIR, generated_listing, load_blog_scraper, scratch_cache_dir
+import legacy
+
+CORPUS = os.path.join(REPO_DIR, 'benchmarks', 'corpus', 'articles.html')
+# The container selectors process_blog used to collect articles with
+ARTICLE_SELECTORS = [
+    'article', '.post', '.entry', '.blog-post', '.blog-entry',
+    '.article', '.news-item', '.card', '.content-item',
+    '.list-item', 'li.item', '.resource-item', '.col-md-4',
+    '.post-item', '.blog-item', '.m-post-card'
+]
+
+def collect_cases(pages_dir, articles):
+    cases = []
+    soup = BeautifulSoup(open(CORPUS, encoding='utf-8').read(), 'html.parser')
+    for article in soup.find_all('article'):
+        cases.append((article, article.get('data-blog', 'Corpus')))
+    
+    soup = BeautifulSoup(generated_listing(articles), 'html.parser')
+    cases.extend((article, 'Generated') for article in soup.find_all('article'))
+    
+    for path in sorted(glob.glob(os.path.join(pages_dir, '*.html'))) if pages_dir else []:
+        with open(path, 'rb') as f:
+            soup = BeautifulSoup(f.read(), 'html.parser')
+        name = os.path.splitext(os.path.basename(path))[0]
+        for selector in ARTICLE_SELECTORS:
+            cases.extend((article, name) for article in soup.select(selector))
+    return cases
+
+def run(extract, cases):
+    start = time.perf_counter()
+    dates = [extract(article, blog, 'https://example.com/') for article, blog in cases]
+    return dates, time.perf_counter() - start
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--pages', help="directory of saved vendor pages (*.html)")
+    arg_parser.add_argument('--articles', type=int, default=200, help="articles in the generated listing")
+    args = arg_parser.parse_args()
+    
+    module = load_blog_scraper()
+    scraper = module.BlogScraper(cache_dir=scratch_cache_dir(), use_cache=False)
+    cases = collect_cases(args.pages, args.articles)
+    
+    expected, legacy_time = run(legacy.extract_date, cases)
+    expected = [module.to_local_naive(date) for date in expected]
+    module.DATE_RECOGNIZER.cache_clear()
+    actual, new_time = run(scraper.extract_date, cases)
+    
+    mismatches = [(blog, a, b) for (article, blog), a, b in zip(cases, expected, actual)
+                  if a != b or b is not None and b.tzinfo is not None]
+    for blog, a, b in mismatches[:20]:
+        print(f"MISMATCH {blog}: original {a}, now {b!r}")
+    found = sum(date is not None for date in actual)
+    print(f"{len(cases)} articles, {found} dated, {len(mismatches)} mismatches")
+    print(f"original cascade: {legacy_time * 1e3:8.1f} ms ({legacy_time / len(cases) * 1e6:.0f} us/article)")
+    print(f"single walk:      {new_time * 1e3:8.1f} ms ({new_time / len(cases) * 1e6:.0f} us/article)")
+    print(f"speedup:          {legacy_time / new_time:8.1f}x")
+    return 1 if mismatches else 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Check extract_iocs against benchmarks/corpus/iocs.html and measure its throughput in MB/s
+
+Every case of the fixture must yield exactly the indicators it lists. The throughput
+corpus is the fixture text mixed with generated article prose, plus the text of any
+saved pages given with --pages. extract_iocs, which runs the combined pattern over
+the words holding an anchor character only, is compared with the same pattern run
+over the whole text and with one sweep per indicator type.
+
+Usage: python3 benchmarks/bench_iocs.py [--size MB] [--pages DIR]
+"""
+import argparse
+import glob
+import os
+import random
+import re
+import time
+
+from bs4 import BeautifulSoup
+
+from common import REPO_DIR, load_blog_scraper, scratch_cache_dir
+
+CORPUS = os.path.join(REPO_DIR, 'benchmarks', 'corpus', 'iocs.html')
+WORDS = [
+    'the', 'actor', 'deployed', 'a', 'loader', 'that', 'persists', 'through', 'scheduled', 'tasks', 'and',
+    'exfiltrates', 'data', 'to', 'cloud', 'storage', 'operators', 'abused', 'legitimate', 'remote', 'tools',
+    'after', 'initial', 'access', 'via', 'phishing', 'emails', 'with', 'malicious', 'attachments', 'in',
+    'version', '2.4.1', 'on', 'April', '21,', '2025', 'we', 'observed', 'lateral', 'movement', 'across', 'hosts',
+]
+
+def check_fixture(module):
+    """Cases of the fixture whose indicators differ from the expected ones, and all case texts"""
+    soup = BeautifulSoup(open(CORPUS, encoding='utf-8').read(), 'html.parser')
+    failures, texts = [], []
+    for case in soup.find_all('p'):
+        text = case.get_text(' ')
+        texts.append(text)
+        expected = set(case['data-expect'].split())
+        found = {f"{kind}={value}" for kind, values in module.extract_iocs(text).items() for value in values}
+        if found != expected:
+            failures.append((text, expected - found, found - expected))
+    return failures, texts
+
+def build_corpus(texts, pages_text, size, seed=1):
+    """Generated prose with a fixture case every few paragraphs, about size bytes of it"""
+    rng = random.Random(seed)
+    parts = list(pages_text)
+    total = sum(len(part) for part in parts)
+    while total < size:
+        paragraph = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(40, 120))) + '.'
+        if rng.random() < 0.3:
+            paragraph += ' ' + rng.choice(texts)
+        parts.append(paragraph)
+        total += len(paragraph) + 2
+    return '\n\n'.join(parts)
+
+def per_type_sweeps(module, sweeps, text):
+    """The approach the combined pattern replaces: one finditer over the whole text per indicator type"""
+    found = {}
+    for kind, pattern in sweeps:
+        for match in pattern.finditer(text):
+            found.setdefault(kind, {})[module.refang(match.group())] = None
+    return found
+
+def throughput(func, text, repeat):
+    """Best MB/s of func over text"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(text.encode('utf-8')) / 1024 / 1024 / best
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--size', type=float, default=4, help="MB of text to scan")
+    arg_parser.add_argument('--pages', help="directory of saved article pages (*.html) to add to the corpus")
+    arg_parser.add_argument('--repeat', type=int, default=3, help="timing runs, the fastest is reported")
+    args = arg_parser.parse_args()
+    
+    module = load_blog_scraper()
+    failures, texts = check_fixture(module)
+    for text, missing, extra in failures:
+        print(f"MISMATCH {text[:60]!r}: missing {sorted(missing)}, unexpected {sorted(extra)}")
+    print(f"fixture: {len(texts)} cases, {len(failures)} mismatches")
+    
+    scraper = module.BlogScraper(cache_dir=scratch_cache_dir(), use_cache=False)
+    pages = []
+    for path in sorted(glob.glob(os.path.join(args.pages, '*.html'))) if args.pages else []:
+        with open(path, 'rb') as f:
+            pages.append(module.FetchedPage(path, 200, {}, f.read()))
+    start = time.perf_counter()
+    pages_text = [scraper.article_text(page) for page in pages]
+    html_seconds = time.perf_counter() - start
+    
+    corpus = build_corpus(texts, pages_text, int(args.size * 1024 * 1024))
+    found = module.extract_iocs(corpus)
+    print(f"corpus: {len(corpus.encode('utf-8')) / 1024 / 1024:.1f} MB of text, "
+          f"{sum(len(values) for values in found.values())} distinct indicators "
+          f"({', '.join(f'{len(values)} {kind}' for kind, values in found.items())})")
+    anchored = throughput(module.extract_iocs, corpus, args.repeat)
+    whole = throughput(lambda text: list(module.IOC_PATTERN.finditer(text)), corpus, args.repeat)
+    patterns = [(kind, re.compile(pattern, re.I)) for kind, pattern in module.IOC_PATTERNS]
+    sweeps = throughput(lambda text: per_type_sweeps(module, patterns, text), corpus, args.repeat)
+    print(f"extract_iocs:                  {anchored:8.1f} MB/s")
+    print(f"combined pattern, whole text:  {whole:8.1f} MB/s ({anchored / whole:.1f}x slower)")
+    print(f"one sweep per type:            {sweeps:8.1f} MB/s ({anchored / sweeps:.1f}x slower)")
+    if pages:
+        html_bytes = sum(len(page.content) for page in pages)
+        print(f"page text extraction:          {html_bytes / 1024 / 1024 / html_seconds:8.1f} MB/s of HTML "
+              f"({len(pages)} pages)")
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Compare parse time and peak memory of the BeautifulSoup backends on saved vendor pages
+
+Pages are read from benchmarks/pages/*.html (or --pages DIR). Use --save to download
+fresh copies of every BLOG_URLS page there first. Without saved pages a generated
+listing page is used.
+
+Usage: python3 benchmarks/bench_parsers.py [--save] [--pages DIR] [--repeat N]
+"""
+import argparse
+import glob
+import os
+import re
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+from common import REPO_DIR, generated_listing, load_blog_scraper, scratch_cache_dir
+
+PAGES_DIR = os.path.join(REPO_DIR, 'benchmarks', 'pages')
+
+def page_file_name(blog_name):
+    return re.sub(r'[^a-z0-9]+', '-', blog_name.lower()).strip('-') + '.html'
+
+def save_pages(module, pages_dir):
+    os.makedirs(pages_dir, exist_ok=True)
+    scraper = module.BlogScraper(cache_dir=scratch_cache_dir(), use_cache=False)
+    for blog_name, url in module.BLOG_URLS.items():
+        response = scraper.make_request(scraper.clean_url(url))
+        if response is not None:
+            with open(os.path.join(pages_dir, page_file_name(blog_name)), 'wb') as f:
+                f.write(response.content)
+            print(f"saved {blog_name} ({len(response.content) // 1024} KB)")
+
+def load_pages(pages_dir):
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(pages_dir, '*.html'))):
+        with open(path, 'rb') as f:
+            pages[os.path.basename(path)] = f.read()
+    if not pages:
+        print(f"No saved pages in {pages_dir}, using a generated listing page")
+        pages['generated.html'] = generated_listing(300).encode('utf-8')
+    return pages
+
+def measure(parse, content, repeat):
+    """Best parse time in ms and peak traced memory in MB, plus the containers found"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        soup = parse(content)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    tracemalloc.start()
+    soup = parse(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best * 1e3, peak / 1024 / 1024, soup
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--pages', default=PAGES_DIR, help="directory of saved pages")
+    arg_parser.add_argument('--save', action='store_true', help="download the vendor pages first")
+    arg_parser.add_argument('--repeat', type=int, default=3, help="timing runs per page and backend")
+    args = arg_parser.parse_args()
+    
+    module = load_blog_scraper()
+    if args.save:
+        save_pages(module, args.pages)
+    pages = load_pages(args.pages)
+    
+    backends = [('html.parser (text)', None, False)]
+    for backend in ('html.parser', 'lxml'):
+        if backend == 'lxml' and module.DEFAULT_PARSER != 'lxml':
+            print("lxml is not installed, skipping it")
+            continue
+        backends.append((f'{backend} (bytes)', backend, False))
+        backends.append((f'{backend} (strained)', backend, True))
+    
+    totals = {label: [0.0, 0.0] for label, _, _ in backends}
+    print(f"{'page':<32}{'backend':<26}{'parse ms':>10}{'peak MB':>10}{'containers':>12}")
+    for name, content in pages.items():
+        response = module.FetchedPage(name, 200, {}, content)
+        for label, backend, strain in backends:
+            if backend is None:
+                # The original call: decode to str first, then build the whole tree
+                parse = lambda c: BeautifulSoup(response.text, 'html.parser')
+            else:
+                scraper = module.BlogScraper(cache_dir=scratch_cache_dir(), use_cache=False, parser_backend=backend,
+                                             strain_pages=strain)
+                parse = lambda c, s=scraper: s.make_soup(response, strain=True)
+            elapsed, peak, soup = measure(parse, content, args.repeat)
+            containers = len(module.collapse_nested_containers(module.ARTICLE_SELECTOR.select(soup)))
+            totals[label][0] += elapsed
+            totals[label][1] = max(totals[label][1], peak)
+            print(f"{name[:31]:<32}{label:<26}{elapsed:>10.1f}{peak:>10.1f}{containers:>12}")
+    
+    print("-" * 90)
+    for label, (elapsed, peak) in totals.items():
+        print(f"{'all pages':<32}{label:<26}{elapsed:>10.1f}{peak:>10.1f}")
+
+if __name__ == '__main__':
+    main()
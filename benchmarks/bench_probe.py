@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""Resolve and probe generated subdomains against local stand-in DNS and web servers, checking every result
+
+Names resolve through the stand-in DNS server of bench_resolver.py to a few loopback
+addresses, where stand-in web servers answer over HTTPS (when openssl can make a
+self-signed certificate) and HTTP: pages with a title, pages after 100 Continue and 103 Early
+Hints interim responses, chunked 404 pages, hosts answering 421 on a TLS connection opened
+for another name, HTTP-only hosts refusing the TLS handshake that are answered over
+HTTP/1.0 with the body ending at close, hosts too slow to answer in time and hosts
+dropping the connection. Every probe result must match what the servers serve. The run is repeated with a new connection per request to show what
+reusing the connections to each address saves.
+
+Usage: python3 benchmarks/bench_probe.py [--hosts N] [--concurrency N] [--timeout S]
+"""
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+
+from bench_resolver import ZONE, StandInDns
+from common import load_subdomain_resolver
+
+# Share of the generated hosts of each kind, the rest do not resolve
+KINDS = [('page', 0.5), ('hinted', 0.05), ('missing', 0.1), ('strict', 0.05), ('plain', 0.1), ('slow', 0.05), ('dropped', 0.05)]
+ADDRESSES = [f"127.0.0.{i}" for i in range(1, 9)]
+
+def build_hosts(count, seed=1):
+    """The wordlist, the DNS zone and {name: kind} for count generated hosts"""
+    rng = random.Random(seed)
+    words, zone, kinds = [], {}, {}
+    for i in range(count):
+        word = f"site{i}"
+        roll, kind = rng.random(), 'nx'
+        for candidate, share in KINDS:
+            if roll < share:
+                kind = candidate
+                break
+            roll -= share
+        name = f"{word}.{ZONE}"
+        words.append(word)
+        kinds[name] = kind
+        zone[name] = ('nx', None) if kind == 'nx' else ('a', ADDRESSES[i % len(ADDRESSES)])
+    return words, zone, kinds
+
+def self_signed_context(directory):
+    """A server SSL context with a throwaway certificate, None if openssl is not available"""
+    if not shutil.which('openssl'):
+        return None
+    cert, key = os.path.join(directory, 'cert.pem'), os.path.join(directory, 'key.pem')
+    subprocess.run(['openssl', 'req', '-x509', '-newkey', 'ec', '-pkeyopt', 'ec_paramgen_curve:prime256v1', '-nodes',
+                    '-days', '1', '-subj', f"/CN={ZONE}", '-keyout', key, '-out', cert], check=True, capture_output=True)
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    return context
+
+class StandInWeb:
+    """Web servers on every address of ADDRESSES, answering each host according to its kind, run in a thread"""
+    def __init__(self, kinds, slow_delay, ssl_context=None):
+        self.kinds = kinds
+        self.slow_delay = slow_delay
+        self.ssl_context = ssl_context
+        self.connections = {'http': 0, 'https': 0}
+        self.ports = {}
+        self.servers = []
+        # TLS connection -> name it was opened for
+        self.server_names = {}
+        self.loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        if ssl_context:
+            # HTTP-only hosts fail the handshake, so clients fall back to plain HTTP
+            def check_name(ssl_object, name, context):
+                if self.kinds.get(name) == 'plain':
+                    return ssl.ALERT_DESCRIPTION_UNRECOGNIZED_NAME
+                self.server_names[ssl_object] = name
+            ssl_context.sni_callback = check_name
+    
+    def start(self):
+        threading.Thread(target=self._serve, daemon=True).start()
+        self._ready.wait()
+        return self
+    
+    def _serve(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_until_complete(self.listen())
+        self._ready.set()
+        self.loop.run_forever()
+    
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+    
+    async def listen(self):
+        schemes = [('https', self.ssl_context), ('http', None)] if self.ssl_context else [('http', None)]
+        for scheme, context in schemes:
+            # Every address listens on the same port, the first free one they all have
+            for _ in range(20):
+                servers = []
+                try:
+                    servers.append(await asyncio.start_server(self.handler(scheme), ADDRESSES[0], 0, ssl=context))
+                    port = servers[0].sockets[0].getsockname()[1]
+                    for address in ADDRESSES[1:]:
+                        servers.append(await asyncio.start_server(self.handler(scheme), address, port, ssl=context))
+                except OSError:
+                    for server in servers:
+                        server.close()
+                    continue
+                self.ports[scheme] = port
+                self.servers += servers
+                break
+    
+    def handler(self, scheme):
+        async def serve(reader, writer):
+            self.connections[scheme] += 1
+            try:
+                # Requests on a kept-alive connection can be for any host on the address
+                while True:
+                    head = (await reader.readuntil(b'\r\n\r\n')).decode('ascii')
+                    host = next(line.split(':', 1)[1].strip() for line in head.split('\r\n')
+                                if line.lower().startswith('host:'))
+                    kind, number = self.kinds.get(host), host.split('.')[0][4:]
+                    tls_name = self.server_names.get(writer.get_extra_info('ssl_object'))
+                    if kind == 'strict' and scheme == 'https' and tls_name != host or kind == 'plain' and scheme == 'https':
+                        # Not served on a TLS connection opened for another name
+                        writer.write(b"HTTP/1.1 421 Misdirected Request\r\nContent-Length: 0\r\n\r\n")
+                    elif kind in ('page', 'strict', 'hinted'):
+                        if kind == 'hinted':
+                            writer.write(b"HTTP/1.1 100 Continue\r\n\r\nHTTP/1.1 103 Early Hints\r\n"
+                                         b"Link: </style.css>; rel=preload\r\n\r\n")
+                        body = f"<html><head><title>Site {number} &amp; co</title></head><body>{'x' * 2000}</body>"
+                        writer.write(f"HTTP/1.1 200 OK\r\nServer: stand-in/1.0\r\nContent-Type: text/html\r\n"
+                                     f"Content-Length: {len(body)}\r\n\r\n{body}".encode('ascii'))
+                    elif kind == 'missing':
+                        body = f"<title>Not Found</title><p>No page for {host}</p>"
+                        writer.write(f"HTTP/1.1 404 Not Found\r\nServer: stand-in/1.0\r\nTransfer-Encoding: chunked\r\n"
+                                     f"\r\n10\r\n{body[:16]}\r\n{len(body) - 16:x}\r\n{body[16:]}\r\n0\r\n\r\n"
+                                     .encode('ascii'))
+                    elif kind == 'plain':
+                        writer.write(f"HTTP/1.0 200 OK\r\nServer: legacy\r\n\r\n<title>Legacy {number}</title>"
+                                     .encode('ascii'))
+                        break
+                    elif kind == 'slow':
+                        # Until the client gives up and closes the connection
+                        await asyncio.wait_for(reader.read(), self.slow_delay)
+                        break
+                    else:
+                        break
+                    await writer.drain()
+            except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError, StopIteration,
+                    UnicodeDecodeError):
+                pass
+            finally:
+                self.server_names.pop(writer.get_extra_info('ssl_object'), None)
+                writer.close()
+        return serve
+
+def expected_result(kind, number, ports):
+    """(url scheme, status, title) a probe of a host of that kind must find, None for no response"""
+    tls = 'https' in ports
+    if kind in ('page', 'strict', 'hinted'):
+        return ('https' if tls else 'http', 200, f"Site {number} & co")
+    if kind == 'missing':
+        return ('https' if tls else 'http', 404, 'Not Found')
+    if kind == 'plain':
+        return ('http', 200, f"Legacy {number}")
+    return None
+
+async def resolve_and_probe(module, dns_port, web, names, concurrency, timeout, reuse):
+    """{name: probe result} of the names found, and the resolver's and prober's stats"""
+    resolver = module.SubdomainResolver([f"127.0.0.1:{dns_port}"], rate=0)
+    prober = module.HttpProber(concurrency, timeout, [(scheme, web.ports[scheme]) for scheme in ('https', 'http')
+                                                      if scheme in web.ports])
+    if not reuse:
+        prober.max_idle = 0
+    results = {}
+    
+    def on_probe(name, address, probe):
+        results[name] = probe
+    
+    async def on_result(name, result):
+        if result and result[0]:
+            await prober.submit(name, result[0][0], on_probe)
+    
+    await resolver.resolve_all(names, on_result)
+    await prober.join()
+    return results, resolver.stats, prober.stats
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--hosts', type=int, default=2000, help="generated subdomains")
+    arg_parser.add_argument('--concurrency', type=int, default=200, help="hosts probed at once")
+    arg_parser.add_argument('--timeout', type=float, default=1.0,
+                            help="longest wait of a probe, slow hosts take three times as long")
+    args = arg_parser.parse_args()
+    
+    module = load_subdomain_resolver()
+    words, zone, kinds = build_hosts(args.hosts)
+    names = list(kinds)
+    failures = 0
+    with tempfile.TemporaryDirectory() as directory:
+        ssl_context = self_signed_context(directory)
+        if not ssl_context:
+            print("openssl not found, probing over HTTP only")
+        dns = StandInDns(module, zone).start()
+        web = StandInWeb(kinds, args.timeout * 3, ssl_context).start()
+        try:
+            for reuse in (True, False):
+                web.connections = dict.fromkeys(web.connections, 0)
+                start = time.perf_counter()
+                results, resolver_stats, stats = asyncio.run(resolve_and_probe(
+                    module, dns.port, web, names, args.concurrency, args.timeout, reuse))
+                elapsed = time.perf_counter() - start
+                wrong = []
+                for name, kind in kinds.items():
+                    expected = None if kind == 'nx' else expected_result(kind, name.split('.')[0][4:], web.ports)
+                    probe = results.get(name)
+                    found = probe and (probe['url'].split(':')[0], probe['status'], probe['title'])
+                    if kind == 'nx' and name in results or kind != 'nx' and (name not in results or found != expected):
+                        wrong.append((name, expected, 'not resolved' if name not in results else found))
+                for name, expected, found in wrong[:10]:
+                    print(f"MISMATCH {name}: expected {expected}, got {found}")
+                failures += len(wrong)
+                answered = sum(1 for probe in results.values() if probe)
+                print(f"{'reused connections' if reuse else 'new connection each'}: {len(results)} hosts probed in "
+                      f"{elapsed:.2f} s ({len(results) / elapsed:.0f}/s), {answered} answered, {len(wrong)} mismatches, "
+                      f"{resolver_stats['failed']} names unresolved; {stats['probes']} requests, {stats['timeouts']} "
+                      f"timeouts, {stats['reused']} on a reused connection; the servers accepted "
+                      f"{web.connections['https']} HTTPS and {web.connections['http']} HTTP connections")
+        finally:
+            web.stop()
+            dns.stop()
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""Resolve a generated wordlist against a local stand-in DNS server, checking every answer and timing the run
+
+The stand-in answers over UDP and TCP on 127.0.0.1 from a generated zone: plain A records,
+CNAMEs sent along with their target's address or left for the resolver to follow, names
+whose UDP answer is truncated so they have to be asked again over TCP, names whose first
+query is dropped so they are only answered after a retransmission, names under a wildcard
+subzone that must be left out, and NXDOMAIN for the rest. The addresses found must match
+the zone exactly. --serial also times the first
+names resolved one at a time, as the shell loop of active-subdomain-finder.sh does.
+
+Usage: python3 benchmarks/bench_resolver.py [--names N] [--concurrency N] [--serial N]
+"""
+import argparse
+import asyncio
+import random
+import socket
+import struct
+import threading
+import time
+
+from common import load_subdomain_resolver
+
+ZONE = 'bench.test'
+# Share of the generated names of each kind, the rest do not exist
+KINDS = [('a', 0.4), ('cname', 0.1), ('chase', 0.05), ('truncated', 0.05), ('dropped', 0.05), ('wild', 0.1)]
+# Every name under this subzone resolves to WILDCARD_ADDRESS, except those it lists itself
+WILDCARD_ZONE = f"wild.{ZONE}"
+WILDCARD_ADDRESS = '10.255.255.1'
+
+def build_zone(count, seed=1):
+    """The wordlist and {name: (kind, address)} for count generated words"""
+    rng = random.Random(seed)
+    words, zone = [], {}
+    for i in range(count):
+        word = f"host{i}"
+        roll, kind = rng.random(), 'nx'
+        for candidate, share in KINDS:
+            if roll < share:
+                kind = candidate
+                break
+            roll -= share
+        address = f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}"
+        if kind == 'wild':
+            # A few names under the wildcard are real and must still be found
+            word = f"{word}.wild"
+            kind = 'a' if rng.random() < 0.1 else 'nx'
+        words.append(word)
+        zone[f"{word}.{ZONE}"] = (kind, address)
+        if kind in ('cname', 'chase'):
+            zone[f"edge-{word}.cdn.{ZONE}"] = ('a', address)
+    return words, zone
+
+class StandInDns:
+    """Authoritative-looking answers for a generated zone, over UDP and TCP on one local port"""
+    def __init__(self, module, zone):
+        self.module = module
+        self.zone = zone
+        self.dropped = set()
+        self.queries = {'udp': 0, 'tcp': 0}
+        self.loop = asyncio.new_event_loop()
+        self.port = None
+        self._ready = threading.Event()
+    
+    def record(self, owner, rtype, data):
+        return owner + struct.pack('!HHIH', rtype, self.module.CLASS_IN, 300, len(data)) + data
+    
+    def answer(self, query, udp):
+        """The response to a query, or None to drop it"""
+        module = self.module
+        query_id, = struct.unpack_from('!H', query)
+        (name, qtype), offset = module.read_question(query)
+        kind, address = self.zone.get(name, ('nx', None))
+        if kind == 'nx' and name.endswith('.' + WILDCARD_ZONE):
+            kind, address = 'a', WILDCARD_ADDRESS
+        flags = module.FLAG_QR | module.FLAG_RD | 0x0080
+        records = []
+        if kind == 'nx':
+            flags |= module.RCODE_NXDOMAIN
+        elif kind == 'dropped' and udp and name not in self.dropped:
+            self.dropped.add(name)
+            return None
+        elif kind == 'truncated' and udp:
+            flags |= module.FLAG_TC
+        else:
+            # The first owner points back at the question name, as real servers compress it
+            owner = b'\xc0\x0c'
+            if kind in ('cname', 'chase'):
+                target = f"edge-{name.split('.')[0]}.cdn.{ZONE}"
+                records.append(self.record(owner, module.TYPE_CNAME, module.encode_name(target)))
+                owner = module.encode_name(target)
+            if qtype == module.TYPE_A and kind != 'chase':
+                records.append(self.record(owner, module.TYPE_A, bytes(int(part) for part in address.split('.'))))
+        header = struct.pack('!HHHHHH', query_id, flags, 1, len(records), 0, 0)
+        return header + query[12:offset] + b''.join(records)
+    
+    def start(self):
+        threading.Thread(target=self._serve, daemon=True).start()
+        self._ready.wait()
+        return self
+    
+    def _serve(self):
+        asyncio.set_event_loop(self.loop)
+        server, module = self, self.module
+        
+        class Udp(asyncio.DatagramProtocol):
+            def connection_made(self, transport):
+                self.transport = transport
+                transport.get_extra_info('socket').setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, module.SOCKET_BUFFER)
+            
+            def datagram_received(self, data, addr):
+                server.queries['udp'] += 1
+                response = server.answer(data, udp=True)
+                if response is not None:
+                    self.transport.sendto(response, addr)
+        
+        async def tcp(reader, writer):
+            try:
+                while True:
+                    length, = struct.unpack('!H', await reader.readexactly(2))
+                    server.queries['tcp'] += 1
+                    response = server.answer(await reader.readexactly(length), udp=False)
+                    writer.write(struct.pack('!H', len(response)) + response)
+            except asyncio.IncompleteReadError:
+                writer.close()
+        
+        async def listen():
+            transport, _ = await self.loop.create_datagram_endpoint(Udp, local_addr=('127.0.0.1', 0))
+            self.port = transport.get_extra_info('sockname')[1]
+            await asyncio.start_server(tcp, '127.0.0.1', self.port)
+        
+        self.loop.run_until_complete(listen())
+        self._ready.set()
+        self.loop.run_forever()
+    
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+def resolve(module, server, names, concurrency, timeout):
+    """{name: addresses} of the names found, the resolver's stats and the seconds taken"""
+    resolver = module.SubdomainResolver([f"127.0.0.1:{server.port}"], concurrency, rate=0, timeout=timeout)
+    found = {}
+    
+    def on_result(name, result):
+        if result and result[0]:
+            found[name] = result[0]
+    
+    start = time.perf_counter()
+    asyncio.run(resolver.resolve_all(names, on_result))
+    return found, resolver.stats, time.perf_counter() - start
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--names', type=int, default=20000, help="words in the generated wordlist")
+    arg_parser.add_argument('--concurrency', type=int, default=1000, help="names resolved at once")
+    arg_parser.add_argument('--timeout', type=float, default=0.5, help="seconds before a query is sent again")
+    arg_parser.add_argument('--serial', type=int, default=0, metavar='N',
+                            help="also resolve the first N names one at a time")
+    args = arg_parser.parse_args()
+    
+    module = load_subdomain_resolver()
+    words, zone = build_zone(args.names)
+    names = [f"{word}.{ZONE}" for word in words]
+    expected = {name: [zone[name][1]] for name in names if zone[name][0] != 'nx'}
+    server = StandInDns(module, zone).start()
+    try:
+        found, stats, elapsed = resolve(module, server, names, args.concurrency, args.timeout)
+        wrong = [name for name in names if found.get(name) != expected.get(name)]
+        for name in wrong[:20]:
+            print(f"MISMATCH {name}: expected {expected.get(name)}, got {found.get(name)}")
+        print(f"{len(names)} names in {elapsed:.2f} s: {len(names) / elapsed:.0f} names/sec, "
+              f"{stats['queries'] / elapsed:.0f} queries/sec (concurrency {args.concurrency})")
+        print(f"{len(found)} active, {len(wrong)} mismatches, {stats['wildcard']} wildcard answers left out; "
+              f"{stats['queries']} queries, {stats['timeouts']} timeouts, {stats['tcp']} retried over TCP; the stand-in saw {server.queries['udp']} UDP and "
+              f"{server.queries['tcp']} TCP queries")
+        if args.serial:
+            server.dropped.clear()
+            sample = names[:args.serial]
+            _, _, serial = resolve(module, server, sample, 1, args.timeout)
+            print(f"one at a time: {len(sample)} names in {serial:.2f} s: {len(sample) / serial:.0f} names/sec, "
+                  f"{len(names) / (len(sample) / serial):.0f} s for the whole list "
+                  f"({serial / len(sample) / (elapsed / len(names)):.0f}x slower)")
+    finally:
+        server.stop()
+    return 1 if wrong else 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Time whole scans over recorded vendor pages served by the local replay server
+
+Reports pages per second, the latency of each scan stage, peak RSS and the posts
+found per blog. --save-baseline stores the posts and timings of the run, --baseline
+compares the run with a stored one and exits non-zero when posts are missing or new.
+Record the pages first with benchmarks/replay.py record. Stage latencies are only
+seen for work done in this process, so pipeline mode reports the fetch stage alone.
+
+Usage: python3 benchmarks/bench_scraper.py [--dir DIR] [--fetch-mode MODE] [--repeat N]
+                                           [--baseline FILE | --save-baseline FILE]
+"""
+import argparse
+import collections
+import contextlib
+import io
+import json
+import resource
+import time
+from datetime import timedelta
+
+from common import load_blog_scraper, scratch_cache_dir
+from replay import RECORDINGS_DIR, ReplayServer, has_recording, recorded_day, replay_scraper_class
+
+STAGES = ['make_request', 'parse_listing', 'extract_date', 'extract_title', 'extract_link']
+
+def timed(func, samples):
+    """Wrap func so the duration of every call is appended to samples"""
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            samples.append(time.perf_counter() - start)
+    return wrapper
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+def run_scan(module, server, args):
+    """One scan over the recording: the scraper, wall time, pages fetched and stage samples"""
+    scraper_class = replay_scraper_class(module, server)
+    # Every repeat starts from nothing learned, as the first one does
+    scraper = scraper_class(fetch_mode=args.fetch_mode, cache_dir=scratch_cache_dir(), use_cache=False,
+                            parse_processes=args.parse_processes, feed_first=server.manifest.get('feed_first', False))
+    # Dates on the recorded pages are relative to the day they were saved
+    scraper.today = recorded_day(server.manifest)
+    scraper.yesterday = scraper.today - timedelta(days=1)
+    samples = {stage: [] for stage in STAGES}
+    for stage in STAGES:
+        setattr(scraper, stage, timed(getattr(scraper, stage), samples[stage]))
+    
+    output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    start = time.perf_counter()
+    with output:
+        scraper.scrape_all_blogs()
+    elapsed = time.perf_counter() - start
+    return scraper, elapsed, scraper.metrics.report()['total']['requests'], samples
+
+def compare(baseline, report):
+    """Print how a run differs from the baseline, returning the number of changed posts"""
+    expected = {tuple(post) for post in baseline['posts']}
+    actual = {tuple(post) for post in report['posts']}
+    for label, posts in (('MISSING', expected - actual), ('NEW', actual - expected)):
+        for blog, title, date, url in sorted(posts)[:20]:
+            print(f"{label} {blog}: {date} {title} <{url}>")
+    print(f"posts: {len(actual)} now, {len(expected)} in the baseline, "
+          f"{len(expected - actual)} missing, {len(actual - expected)} new")
+    
+    change = (report['pages_per_sec'] / baseline['pages_per_sec'] - 1) * 100 if baseline['pages_per_sec'] else 0
+    print(f"pages/sec: {report['pages_per_sec']:.1f} now, {baseline['pages_per_sec']:.1f} in the baseline ({change:+.0f}%)")
+    for stage, mean in report['stage_mean_ms'].items():
+        before = baseline['stage_mean_ms'].get(stage)
+        if before and mean is not None:
+            print(f"{stage:<16} mean {mean:8.3f} ms now, {before:8.3f} ms in the baseline ({(mean / before - 1) * 100:+.0f}%)")
+    return len(expected ^ actual)
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--dir', default=RECORDINGS_DIR, help="directory of the recording")
+    arg_parser.add_argument('--fetch-mode', choices=['async', 'threads', 'pipeline'], default='threads',
+                            help="scan mode to time")
+    arg_parser.add_argument('--parse-processes', type=int, default=2, help="parse processes in pipeline mode")
+    arg_parser.add_argument('--repeat', type=int, default=3, help="scans to run, the fastest is reported")
+    arg_parser.add_argument('--baseline', help="compare with a baseline saved by --save-baseline")
+    arg_parser.add_argument('--save-baseline', help="save the posts and timings of this run")
+    arg_parser.add_argument('--verbose', action='store_true', help="show the scraper's progress output")
+    args = arg_parser.parse_args()
+    
+    if not has_recording(args.dir):
+        return 1
+    module = load_blog_scraper()
+    server = ReplayServer(args.dir).start()
+    try:
+        runs = [run_scan(module, server, args) for _ in range(args.repeat)]
+    finally:
+        server.stop()
+    scraper, elapsed, pages, samples = min(runs, key=lambda run: run[1])
+    
+    print(f"{pages} pages in {elapsed:.2f} s: {pages / elapsed:.1f} pages/sec ({args.fetch_mode}, best of {args.repeat})")
+    print(f"{'stage':<16}{'calls':>8}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    stage_mean_ms = {}
+    for stage, values in samples.items():
+        stage_mean_ms[stage] = sum(values) / len(values) * 1e3 if values else None
+        if values:
+            print(f"{stage:<16}{len(values):>8}{stage_mean_ms[stage]:>10.3f}"
+                  f"{percentile(values, 0.5) * 1e3:>10.3f}{percentile(values, 0.95) * 1e3:>10.3f}")
+    
+    # ru_maxrss is in KB on Linux; parse processes count as children
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    print(f"peak RSS: {own:.0f} MB (largest parse process {children:.0f} MB)")
+    
+    print("posts by blog:")
+    for blog, count in sorted(collections.Counter(post['Blog'] for post in scraper.results).items()):
+        print(f"- {blog}: {count}")
+    
+    report = {
+        'recorded': server.manifest['recorded'],
+        'fetch_mode': args.fetch_mode,
+        'pages_per_sec': pages / elapsed,
+        'stage_mean_ms': stage_mean_ms,
+        'posts': sorted([post['Blog'], post['Title'], post['Date'], post['URL']] for post in scraper.results),
+    }
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"baseline saved to {args.save_baseline}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        return 1 if compare(baseline, report) else 0
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,59 @@
+"""Helpers shared by the benchmark scripts"""
+import atexit
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRAPER_PATH = os.path.join(REPO_DIR, 'blog-scraper.py')
+RESOLVER_PATH = os.path.join(REPO_DIR, 'subdomain-resolver.py')
+
+def load_script(name, path):
+    """Import a script of the repository, whose file name is not a valid module name"""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+def load_blog_scraper():
+    return load_script('blog_scraper', SCRAPER_PATH)
+
+def load_subdomain_resolver():
+    return load_script('subdomain_resolver', RESOLVER_PATH)
+
+def scratch_cache_dir():
+    """A new cache directory removed at exit, so benchmark scrapers leave the state of real scans alone"""
+    directory = tempfile.mkdtemp(prefix='bench-cache-')
+    atexit.register(shutil.rmtree, directory, ignore_errors=True)
+    return directory
+
+def time_per_call(func, inputs, repeat=5):
+    """Best-of-repeat time in microseconds per call of func over inputs"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in inputs:
+            func(item)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(inputs) * 1e6
+
+def generated_listing(articles, depth=12):
+    """A listing page whose articles nest their metadata deep inside wrapper divs"""
+    parts = []
+    for i in range(articles):
+        day = i % 28 + 1
+        inner = f'<span class="author">Analyst {i}</span><span>Apr {day}, 2025</span>'
+        for level in range(depth):
+            inner = f'<div class="wrap-{level}"><p>Paragraph {level} of article {i}.</p>{inner}</div>'
+        parts.append(f'<article><h2><a href="/post/{i}">Post {i}</a></h2>{inner}</article>')
+    chrome = ''.join(f'<li><a href="/topic/{i}">Topic {i}</a></li>' for i in range(200))
+    scripts = ''.join(f'<script>window.config{i} = {{"key": "{"x" * 400}"}};</script>' for i in range(40))
+    return (f'<html><head><title>Listing</title>{scripts}</head><body><nav><ul>{chrome}</ul></nav>'
+            f'<main>{"".join(parts)}</main><footer><ul>{chrome}</ul></footer></body></html>')
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""Record the vendor pages a scan downloads and replay them from a local HTTP server
+
+`record` runs one scan against the live sites and saves every response make_request
+returns to benchmarks/recordings/ (or --dir), with a manifest mapping URLs to files.
+`serve` answers /replay?url=<original URL> from a recording until interrupted.
+Sitemaps are streamed outside make_request and are not recorded.
+
+Usage: python3 benchmarks/replay.py record [--dir DIR] [--feed-first]
+       python3 benchmarks/replay.py serve [--dir DIR] [--port PORT]
+"""
+import argparse
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlparse
+
+from common import REPO_DIR, load_blog_scraper, scratch_cache_dir
+
+RECORDINGS_DIR = os.path.join(REPO_DIR, 'benchmarks', 'recordings')
+MANIFEST = 'manifest.json'
+
+def has_recording(directory):
+    """Whether directory holds a recording, telling how to make one if not"""
+    if os.path.isfile(os.path.join(directory, MANIFEST)):
+        return True
+    print(f"No recording in {directory}, run python3 benchmarks/replay.py record first")
+    return False
+
+def load_manifest(directory):
+    with open(os.path.join(directory, MANIFEST)) as f:
+        return json.load(f)
+
+def recorded_day(manifest):
+    """The day the recording was made, which the replayed scan has to treat as today"""
+    return datetime.strptime(manifest['recorded'], '%Y-%m-%d')
+
+def record(module, directory, feed_first=False):
+    """Run a scan against the live sites, saving every page it downloads"""
+    os.makedirs(directory, exist_ok=True)
+    pages = {}
+    lock = threading.Lock()
+    
+    class RecordingScraper(module.BlogScraper):
+        def make_request(self, url, *args, **kwargs):
+            response = super().make_request(url, *args, **kwargs)
+            if response is not None:
+                name = hashlib.sha1(url.encode('utf-8')).hexdigest()[:16] + '.body'
+                module.write_file_atomic(os.path.join(directory, name), response.content)
+                with lock:
+                    pages[url] = {
+                        'file': name,
+                        'status': response.status_code,
+                        'content_type': response.headers.get('Content-Type', 'text/html'),
+                    }
+                print(f"recorded {url} ({len(response.content) // 1024} KB)")
+            return response
+    
+    scraper = RecordingScraper(fetch_mode='threads', cache_dir=scratch_cache_dir(), use_cache=False,
+                               feed_first=feed_first)
+    scraper.scrape_all_blogs()
+    manifest = {'recorded': scraper.today.strftime('%Y-%m-%d'), 'feed_first': feed_first, 'pages': pages}
+    module.write_file_atomic(os.path.join(directory, MANIFEST), json.dumps(manifest, indent=2, sort_keys=True))
+    print(f"{len(pages)} pages recorded in {directory}")
+    return manifest
+
+class ReplayServer:
+    """Local HTTP stand-in answering /replay?url=<original URL> from a recording"""
+    def __init__(self, directory, port=0):
+        self.directory = directory
+        self.manifest = load_manifest(directory)
+        pages = self.manifest['pages']
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body go out in separate writes, which Nagle would hold back
+            disable_nagle_algorithm = True
+            
+            def do_GET(self):
+                url = parse_qs(urlparse(self.path).query).get('url', [''])[0]
+                page = pages.get(url)
+                if page is None:
+                    body, status, content_type = b'not recorded', 404, 'text/plain'
+                else:
+                    with open(os.path.join(directory, page['file']), 'rb') as f:
+                        body = f.read()
+                    status, content_type = page['status'], page['content_type']
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self.httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}/replay?url="
+        self._thread = None
+    
+    def replay_url(self, url):
+        return self.base_url + quote(url, safe='')
+    
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+def replay_scraper_class(module, server):
+    """A BlogScraper subclass that downloads every page from the replay server instead of its site"""
+    class ReplayScraper(module.BlogScraper):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            # The stand-in serves every site from one host, which must not be rate limited as one
+            self.scheduler.reserve = lambda host: 0
+        
+        def make_request(self, url, *args, **kwargs):
+            response = super().make_request(server.replay_url(url), *args, **kwargs)
+            if response is not None:
+                # Links are resolved against the page's own URL, not the stand-in's
+                response.url = url
+            return response
+        
+        async def fetch_page_async(self, session, url, *args, **kwargs):
+            page = await super().fetch_page_async(session, server.replay_url(url), *args, **kwargs)
+            if page is not None:
+                page.url = url
+            return page
+    
+    return ReplayScraper
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('command', choices=['record', 'serve'])
+    arg_parser.add_argument('--dir', default=RECORDINGS_DIR, help="directory of the recording")
+    arg_parser.add_argument('--feed-first', action='store_true', help="record the RSS/Atom feeds scanned in feed-first mode")
+    arg_parser.add_argument('--port', type=int, default=8000, help="port to serve on")
+    args = arg_parser.parse_args()
+    
+    if args.command == 'record':
+        record(load_blog_scraper(), args.dir, args.feed_first)
+        return 0
+    if not has_recording(args.dir):
+        return 1
+    server = ReplayServer(args.dir, args.port)
+    print(f"Replaying {len(server.manifest['pages'])} pages at {server.base_url}<url>")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.httpd.server_close()
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
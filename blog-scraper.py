@@ -1,16 +1,62 @@
 #!/usr/bin/env python3
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.exceptions import MaxRetryError, ResponseError
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, CData, NavigableString, SoupStrainer, Tag
 from datetime import datetime, timedelta
+import argparse
+import asyncio
+import bisect
+import codecs
+import collections
 import concurrent.futures
+import email.utils
+import functools
+import csv
+import hashlib
+import heapq
+import html
+from html.parser import HTMLParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import importlib.util
+import json
 import re
+import sqlite3
 import sys
 import time
-from urllib.parse import urlparse, urljoin
-import pandas as pd
+from urllib.parse import urlparse, urljoin, urlsplit, urlunsplit, parse_qs, parse_qsl, urlencode
 from dateutil import parser
 import random
 import os
+import queue
+import soupsieve
+import tempfile
+import threading
+import xml.etree.ElementTree as ET
+import zlib
+
+try:
+    import aiohttp
+except ImportError:
+    # The asyncio fetcher is optional, the thread pool is used without it
+    aiohttp = None
+
+try:
+    from bs4.filter import ElementFilter
+except ImportError:
+    # BeautifulSoup < 4.13 filters parsing through SoupStrainer callables instead
+    ElementFilter = None
+
+# lxml is only used through BeautifulSoup, so checking that it is installed is enough
+DEFAULT_PARSER = 'lxml' if importlib.util.find_spec('lxml') is not None else 'html.parser'
+
+try:
+    import brotli
+except ImportError:
+    # Without a brotli decoder only gzip/deflate bodies are negotiated
+    brotli = None
 
 # Set up User-Agent rotation to avoid being blocked
 USER_AGENTS = [
@@ -59,15 +105,1511 @@ BLOG_URLS = {
     'Cybereason': 'https://www.cybereason.com/blog'
 }
 
-class BlogScraper:
+# Fetch settings
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 30
+DEFAULT_MAX_WORKERS = 5
+DEFAULT_CONCURRENCY = 20
+DEFAULT_PER_HOST_LIMIT = 2
+DEFAULT_PARSE_PROCESSES = os.cpu_count() or 1
+# Downloaded pages waiting for, or being parsed by, each parse process at most
+PIPELINE_QUEUE_DEPTH = 2
+# How often blocked pipeline stages check whether the run is over
+PIPELINE_POLL_INTERVAL = 0.5
+# Number of hosts each worker keeps keep-alive connections open for
+POOL_HOSTS = 64
+# Response bodies are read in chunks and cut off past this size
+MAX_BODY_BYTES = 10 * 1024 * 1024
+BODY_CHUNK_SIZE = 64 * 1024
+
+# Days of posts reported, counting today
+DEFAULT_WINDOW_DAYS = 2
+# Listing pages past the first requested ahead of the one being parsed while backfilling a blog
+BACKFILL_LOOKAHEAD = 3
+BACKFILL_MAX_PAGES = 50
+ACCEPT_ENCODING = 'gzip, deflate, br' if brotli is not None else 'gzip, deflate'
+
+# Retry policy for connect errors, 5xx and 429 responses
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 0.5
+RETRY_BACKOFF_MAX = 30
+RETRY_JITTER = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+class CappedRetry(Retry):
+    """urllib3 retry policy waiting no longer than RETRY_BACKOFF_MAX for a Retry-After, as retry_delay does
+    
+    With a run deadline, waits end by it and a retry that could not be sent before it is not made,
+    the last response or error standing instead.
+    """
+    # HostScheduler holding the run deadline, carried over to the copies urllib3 makes on each attempt
+    scheduler = None
+    
+    def new(self, **kw):
+        retry = super().new(**kw)
+        retry.scheduler = self.scheduler
+        return retry
+    
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, RETRY_BACKOFF_MAX)
+    
+    def wait(self, response=None):
+        """Seconds to wait before the next attempt"""
+        if self.respect_retry_after_header and response is not None:
+            retry_after = self.get_retry_after(response)
+            if retry_after:
+                return retry_after
+        return self.get_backoff_time()
+    
+    def remaining(self):
+        return self.scheduler.remaining() if self.scheduler else None
+    
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        retry = super().increment(method, url, response, error, _pool, _stacktrace)
+        remaining = self.remaining()
+        if remaining is not None and retry.wait(response) >= remaining:
+            raise MaxRetryError(_pool, url, error or ResponseError("run deadline reached before the next retry"))
+        return retry
+    
+    def sleep(self, response=None):
+        wait = self.wait(response)
+        remaining = self.remaining()
+        if remaining is not None:
+            wait = min(wait, remaining)
+        if wait > 0:
+            time.sleep(wait)
+
+def build_retry(scheduler=None):
+    """Build the urllib3 retry policy of a pooled session, keeping its retries within scheduler's deadline"""
+    options = dict(
+        total=RETRY_TOTAL,
+        backoff_factor=RETRY_BACKOFF,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    try:
+        retry = CappedRetry(backoff_jitter=RETRY_JITTER, backoff_max=RETRY_BACKOFF_MAX, **options)
+    except TypeError:
+        # urllib3 < 2 has no jitter or backoff cap
+        retry = CappedRetry(**options)
+    retry.scheduler = scheduler
+    return retry
+
+def retry_delay(attempt, retry_after=None):
+    """Seconds to wait before retry number attempt, honouring a Retry-After header"""
+    if retry_after:
+        try:
+            return min(max(float(retry_after), 0), RETRY_BACKOFF_MAX)
+        except ValueError:
+            try:
+                retry_at = email.utils.parsedate_to_datetime(retry_after)
+                wait = retry_at.timestamp() - time.time()
+                return min(max(wait, 0), RETRY_BACKOFF_MAX)
+            except (TypeError, ValueError):
+                pass
+    delay = RETRY_BACKOFF * (2 ** attempt) + random.uniform(0, RETRY_JITTER)
+    return min(delay, RETRY_BACKOFF_MAX)
+
+# Per-host rate limiting: a token bucket per host, halved on 429/503 and regrown on each success
+HOST_RATE = 2.0
+HOST_BURST = 4
+HOST_MIN_RATE = 0.1
+HOST_RATE_STEP = 0.25
+THROTTLE_STATUSES = (429, 503)
+# Per-host timeouts follow a moving average of the host's response time
+LATENCY_ALPHA = 0.3
+LATENCY_TIMEOUT_FACTOR = 4
+MIN_HOST_TIMEOUT = 3
+
+class DeadlineReached(requests.exceptions.RequestException):
+    """The run deadline passed before a request could be sent"""
+
+class HostScheduler:
+    """Run deadline, per-host token buckets and per-host timeouts learned from earlier runs"""
+    def __init__(self, path):
+        self.path = path
+        self.deadline = None
+        self._lock = threading.Lock()
+        # host -> [tokens, last refill, requests per second, no requests before]
+        self._buckets = {}
+        try:
+            with open(path) as f:
+                self.hosts = json.load(f)
+        except (OSError, ValueError):
+            self.hosts = {}
+    
+    def set_deadline(self, seconds):
+        """Give the run this many seconds from now, or no deadline for None"""
+        self.deadline = time.monotonic() + seconds if seconds else None
+    
+    def remaining(self):
+        """Seconds left before the run deadline, or None without one"""
+        if self.deadline is None:
+            return None
+        return max(self.deadline - time.monotonic(), 0)
+    
+    def expired(self):
+        return self.deadline is not None and time.monotonic() >= self.deadline
+    
+    def _bucket(self, host):
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            rate = self.hosts.get(host, {}).get('rate', HOST_RATE)
+            bucket = self._buckets[host] = [HOST_BURST, time.monotonic(), rate, 0]
+        return bucket
+    
+    def reserve(self, host):
+        """Take a token for host, returning how long to wait before using it, or None past the deadline"""
+        with self._lock:
+            bucket = self._bucket(host)
+            now = time.monotonic()
+            bucket[0] = min(HOST_BURST, bucket[0] + (now - bucket[1]) * bucket[2])
+            bucket[1] = now
+            wait = max(bucket[3] - now, 0)
+            if bucket[0] < 1:
+                wait = max(wait, (1 - bucket[0]) / bucket[2])
+            if self.deadline is not None and now + wait >= self.deadline:
+                return None
+            # The token may be borrowed from the future, later callers wait longer
+            bucket[0] -= 1
+            return wait
+    
+    def acquire(self, host):
+        """Block until a request to host may be sent, False if the deadline comes first"""
+        wait = self.reserve(host)
+        if wait is None:
+            return False
+        if wait:
+            time.sleep(wait)
+        return True
+    
+    async def acquire_async(self, host):
+        wait = self.reserve(host)
+        if wait is None:
+            return False
+        if wait:
+            await asyncio.sleep(wait)
+        return True
+    
+    def timeout(self, host, attempts=1):
+        """Read timeout for host: a few times its usual response time, with all attempts done by the deadline"""
+        latency = self.hosts.get(host, {}).get('latency')
+        timeout = READ_TIMEOUT
+        if latency is not None:
+            timeout = min(max(latency * LATENCY_TIMEOUT_FACTOR, MIN_HOST_TIMEOUT), READ_TIMEOUT)
+        remaining = self.remaining()
+        if remaining is not None:
+            timeout = min(timeout, max(remaining / attempts, 0.1))
+        return timeout
+    
+    def timeouts(self, host):
+        """(connect, read) timeouts for requests, whose retries urllib3 makes with the same timeouts"""
+        timeout = self.timeout(host, RETRY_TOTAL + 1)
+        return min(CONNECT_TIMEOUT, timeout), timeout
+    
+    def observe(self, host, latency, status=None, retry_after=None):
+        """Fold a response's latency into the host's average, slowing the host down if it pushed back"""
+        with self._lock:
+            stats = self.hosts.setdefault(host, {})
+            previous = stats.get('latency')
+            stats['latency'] = latency if previous is None else previous + LATENCY_ALPHA * (latency - previous)
+            bucket = self._bucket(host)
+            if status in THROTTLE_STATUSES:
+                self._throttle(bucket, retry_after)
+            else:
+                bucket[2] = min(bucket[2] + HOST_RATE_STEP, HOST_RATE)
+            stats['rate'] = bucket[2]
+    
+    def throttle(self, host, retry_after=None):
+        with self._lock:
+            bucket = self._bucket(host)
+            self._throttle(bucket, retry_after)
+            self.hosts.setdefault(host, {})['rate'] = bucket[2]
+    
+    def _throttle(self, bucket, retry_after):
+        bucket[2] = max(bucket[2] / 2, HOST_MIN_RATE)
+        if retry_after:
+            bucket[3] = max(bucket[3], time.monotonic() + retry_delay(0, retry_after))
+    
+    def failed(self, host, timeout):
+        """Count a request that timed out or failed as taking its whole timeout"""
+        with self._lock:
+            stats = self.hosts.setdefault(host, {})
+            previous = stats.get('latency')
+            stats['latency'] = timeout if previous is None else previous + LATENCY_ALPHA * (timeout - previous)
+    
+    def save(self):
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                write_file_atomic(self.path, json.dumps(self.hosts, indent=2, sort_keys=True))
+            except OSError as e:
+                print(f"Error saving host statistics: {e}")
+
+# On-disk cache settings
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'cybertools')
+HTTP_CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+def write_file_atomic(path, data):
+    """Write bytes or text to path so readers never see a half-written file"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+class FetchedPage:
+    """A downloaded page exposing the parts of requests.Response the parsers use"""
+    def __init__(self, url, status_code, headers, content, encoding=None, not_modified=False, truncated=False):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+        # Set when the body came from the HTTP cache because the server answered 304
+        self.not_modified = not_modified
+        # Set when the download stopped before the end of the body
+        self.truncated = truncated
+    
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or 'utf-8', errors='replace')
+
+class HttpCache:
+    """On-disk conditional GET cache of page bodies, validators and the posts extracted from them"""
+    def __init__(self, directory, max_bytes=HTTP_CACHE_MAX_BYTES, max_age=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        # When set, entries younger than this many seconds are used without revalidating
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+    
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.directory, key)
+        return base + '.json', base + '.body'
+    
+    def load(self, url):
+        """Return the cache entry for url, or None if there is none"""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(body_path):
+            return None
+        return entry
+    
+    def is_fresh(self, entry):
+        """Check whether the max-age override lets the entry be used without asking the server"""
+        return self.max_age is not None and time.time() - entry['stored_at'] < self.max_age
+    
+    def conditional_headers(self, entry):
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+    
+    def cached_page(self, url, entry):
+        """Rebuild the page from the cached body, or None if the body has been evicted"""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(body_path, 'rb') as f:
+                content = f.read()
+            # The meta file mtime is the LRU clock used by evict()
+            os.utime(meta_path)
+        except OSError:
+            return None
+        return FetchedPage(entry['url'], 200, CaseInsensitiveDict(entry['headers']), content,
+                           entry['encoding'], not_modified=True)
+    
+    def store(self, url, response):
+        """Store a successful response if it can be revalidated or reused later"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified and self.max_age is None:
+            return
+        entry = {
+            'url': str(response.url),
+            'stored_at': time.time(),
+            'etag': etag,
+            'last_modified': last_modified,
+            'encoding': response.encoding,
+            'headers': {k: v for k, v in response.headers.items() if k.lower() == 'content-type'},
+        }
+        meta_path, body_path = self._paths(url)
+        try:
+            write_file_atomic(body_path, response.content)
+            write_file_atomic(meta_path, json.dumps(entry))
+        except OSError as e:
+            print(f"Error writing HTTP cache entry for {url}: {e}")
+            return
+        self.evict()
+    
+    def cached_posts(self, url, window):
+        """Posts extracted from the cached body, if they were extracted for the same date window"""
+        entry = self.load(url)
+        if entry and entry.get('window') == window:
+            return entry.get('posts')
+        return None
+    
+    def store_posts(self, url, window, posts):
+        """Remember the posts extracted from the cached body of url"""
+        entry = self.load(url)
+        if not entry:
+            return
+        entry['window'] = window
+        entry['posts'] = posts
+        meta_path, _ = self._paths(url)
+        try:
+            write_file_atomic(meta_path, json.dumps(entry))
+        except OSError as e:
+            print(f"Error writing HTTP cache entry for {url}: {e}")
+    
+    def evict(self):
+        """Drop the least recently used entries until the cache fits in max_bytes"""
+        with self._lock:
+            entries = {}
+            total = 0
+            for name in os.listdir(self.directory):
+                if name.startswith('.'):
+                    continue
+                key, ext = os.path.splitext(name)
+                try:
+                    stat = os.stat(os.path.join(self.directory, name))
+                except OSError:
+                    continue
+                size, last_used = entries.get(key, (0, 0))
+                if ext == '.json':
+                    last_used = stat.st_mtime
+                entries[key] = (size + stat.st_size, last_used)
+                total += stat.st_size
+            
+            for key, (size, _) in sorted(entries.items(), key=lambda item: item[1][1]):
+                if total <= self.max_bytes:
+                    break
+                for ext in ('.json', '.body'):
+                    try:
+                        os.remove(os.path.join(self.directory, key + ext))
+                    except OSError:
+                        pass
+                total -= size
+
+# Common article containers
+ARTICLE_SELECTORS = [
+    'article', '.post', '.entry', '.blog-post', '.blog-entry',
+    '.article', '.news-item', '.card', '.content-item',
+    '.list-item', 'li.item', '.resource-item', '.col-md-4',
+    '.post-item', '.blog-item', '.m-post-card'
+]
+ARTICLE_SELECTOR = soupsieve.compile(', '.join(ARTICLE_SELECTORS))
+COMPILED_ARTICLE_SELECTORS = [soupsieve.compile(selector) for selector in ARTICLE_SELECTORS]
+MICROSOFT_ARTICLE_SELECTORS = ['article, .blog-post, .m-post-card, .c-card', '.blog-list-card, .card, .post']
+
+# Per-blog container selectors, used instead of ARTICLE_SELECTORS when set
+BLOG_CONTAINER_SELECTORS = {}
+
+# Tags and classes that can start an article container, used to parse nothing but those regions
+CONTAINER_TAGS = {'article'}
+CONTAINER_CLASSES = {
+    'post', 'entry', 'blog-post', 'blog-entry', 'article', 'news-item', 'card', 'content-item',
+    'list-item', 'resource-item', 'col-md-4', 'post-item', 'blog-item', 'm-post-card',
+    # Microsoft Security Blog
+    'c-card', 'blog-list-card',
+}
+CONTAINER_TAG_CLASSES = {('li', 'item')}
+
+def is_container_start(name, attrs):
+    """Check whether a start tag can open an article container"""
+    if name in CONTAINER_TAGS:
+        return True
+    classes = attrs.get('class') if attrs else None
+    if not classes:
+        return False
+    if isinstance(classes, str):
+        classes = classes.split()
+    return any(c in CONTAINER_CLASSES or (name, c) in CONTAINER_TAG_CLASSES for c in classes)
+
+if ElementFilter is not None:
+    class ContainerStrainer(ElementFilter):
+        """Keep only the subtrees that can hold article containers while parsing"""
+        def allow_tag_creation(self, nsprefix, name, attrs):
+            return is_container_start(name, attrs)
+        
+        def allow_string_creation(self, string):
+            return False
+    
+    CONTAINER_STRAINER = ContainerStrainer()
+else:
+    CONTAINER_STRAINER = SoupStrainer(is_container_start)
+
+def content_type_charset(content_type):
+    """The charset declared in a Content-Type header, or None to let the parser detect it"""
+    match = re.search(r'charset=[\'"]?([\w.:-]+)', content_type or '', re.I)
+    return match.group(1) if match else None
+
+def collapse_nested_containers(elements):
+    """Reduce nested container matches to the outermost one, unless it wraps several posts"""
+    matched = {id(element) for element in elements}
+    nested = {}
+    roots = []
+    for element in elements:
+        parent = next((p for p in element.parents if id(p) in matched), None)
+        if parent is None:
+            roots.append(element)
+        else:
+            nested.setdefault(id(parent), []).append(element)
+    
+    def keep(element):
+        children = nested.get(id(element))
+        if not children:
+            return [element]
+        kept = [container for child in children for container in keep(child)]
+        # A container holding several posts is a listing wrapper, not a post
+        return kept if len(kept) > 1 else [element]
+    
+    return [container for root in roots for container in keep(root)]
+
+# Month names recognised in free text dates
+MONTH_ABBREVIATIONS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+MONTH_NAMES = ['January', 'February', 'March', 'April', 'May', 'June', 'July', 'August',
+               'September', 'October', 'November', 'December']
+MONTH_NUMBERS = {name: number for names in (MONTH_ABBREVIATIONS, MONTH_NAMES)
+                 for number, name in enumerate(names, 1)}
+DATE_CACHE_SIZE = 8192
+# Longer fragments are scanned without being cached, they rarely repeat
+DATE_CACHE_MAX_TEXT = 256
+
+class DateRecognizer:
+    """Compiled, memoized recogniser for the date formats found on blog listings"""
+    _abbr = '|'.join(MONTH_ABBREVIATIONS)
+    _full = '|'.join(MONTH_NAMES)
+    # One alternative per format, listed in the order they are preferred in
+    PATTERN = re.compile(
+        # Apr 21, 2025
+        rf'(?P<f0>(?P<f0_m>{_abbr})\s+(?P<f0_d>\d{{1,2}}),?\s+(?P<f0_y>\d{{4}}))'
+        # April 21, 2025
+        rf'|(?P<f1>(?P<f1_m>{_full})\s+(?P<f1_d>\d{{1,2}}),?\s+(?P<f1_y>\d{{4}}))'
+        # 21 Apr 2025
+        rf'|(?P<f2>(?P<f2_d>\d{{1,2}})\s+(?P<f2_m>{_abbr})\s+(?P<f2_y>\d{{4}}))'
+        # 21 April 2025
+        rf'|(?P<f3>(?P<f3_d>\d{{1,2}})\s+(?P<f3_m>{_full})\s+(?P<f3_y>\d{{4}}))'
+        # 2025-04-21
+        r'|(?P<f4>(?P<f4_y>\d{4})[/\-.](?P<f4_m>\d{1,2})[/\-.](?P<f4_d>\d{1,2}))'
+        # 04/21/2025
+        r'|(?P<f5>(?P<f5_m>\d{1,2})[/\-.](?P<f5_d>\d{1,2})[/\-.](?P<f5_y>\d{4}))'
+    )
+    FORMATS = ['f0', 'f1', 'f2', 'f3', 'f4', 'f5']
+    ISO_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?)?')
+    
+    def __init__(self, cache_size=DATE_CACHE_SIZE):
+        self._parse_cached = functools.lru_cache(maxsize=cache_size)(self._parse)
+        self._search_cached = functools.lru_cache(maxsize=cache_size)(self._search)
+    
+    def parse(self, raw):
+        """Parse a whole string like dateutil does, returning None instead of raising"""
+        if not isinstance(raw, str):
+            return None
+        return self._parse_cached(raw)
+    
+    def search(self, text):
+        """Find the first date in free text, trying the formats in order of preference"""
+        if not text:
+            return None
+        text = text.strip()
+        if len(text) > DATE_CACHE_MAX_TEXT:
+            return self._search(text)
+        return self._search_cached(text)
+    
+    def cache_clear(self):
+        self._parse_cached.cache_clear()
+        self._search_cached.cache_clear()
+    
+    def _parse(self, raw):
+        if self.ISO_PATTERN.fullmatch(raw):
+            try:
+                return datetime.fromisoformat(raw)
+            except ValueError:
+                pass
+        match = self.PATTERN.fullmatch(raw)
+        if match:
+            date = self._convert(match)
+            if date:
+                return date
+        return self._dateutil_parse(raw)
+    
+    def _search(self, text):
+        # A single scan for the first hit of each format. It restarts one character after each
+        # hit rather than after its end, so overlapping dates of another format are not hidden.
+        candidates = {}
+        position = 0
+        while 'f0' not in candidates:
+            match = self.PATTERN.search(text, position)
+            if not match:
+                break
+            candidates.setdefault(match.lastgroup, match)
+            position = match.start() + 1
+        
+        for name in self.FORMATS:
+            match = candidates.get(name)
+            if match:
+                date = self._convert(match) or self._dateutil_parse(match.group(0))
+                if date:
+                    return date
+        return None
+    
+    def _convert(self, match):
+        """Build the datetime straight from the groups, or None where dateutil has to decide"""
+        name = match.lastgroup
+        year = int(match.group(name + '_y'))
+        if year < 1000:
+            # dateutil reads some zero-padded years as two-digit ones
+            return None
+        day = int(match.group(name + '_d'))
+        month = match.group(name + '_m')
+        if month.isalpha():
+            month = MONTH_NUMBERS[month]
+        else:
+            month = int(month)
+            separators = {char for char in match.group(name) if char in '/-.'}
+            if month > 12 or len(separators) > 1:
+                # dateutil swaps day and month or rejects mixed separators, leave it to decide
+                return None
+        try:
+            return datetime(year, month, day)
+        except ValueError:
+            return None
+    
+    def _dateutil_parse(self, raw):
+        try:
+            return parser.parse(raw)
+        except (ValueError, OverflowError, TypeError):
+            return None
+
+# Shared by every scraper so all extraction paths hit the same cache
+DATE_RECOGNIZER = DateRecognizer()
+
+# Elements extract_date takes the date from, in order of preference
+DATE_SELECTORS = [
+    # HTML5 time elements
+    'time', '[datetime]',
+    # Common date class/id patterns
+    '.date', '.post-date', '.entry-date', '#date', '.publish-date', '.meta-date', '.timestamp',
+    '.c-blog-date', '.blog-date',
+    # Common metadata elements that carry the date in their text
+    '.meta', '.entry-meta', '.post-meta', '.blog-meta', 'header', '.article-info', '.published',
+    '.posted-on', '.byline',
+]
+MICROSOFT_DATE_CLASSES = {'blog-post-meta-date', 'c-paragraph-4', 'posted-date'}
+# Elements whose short text is searched for a date when no selector matched
+DATE_TEXT_TAGS = {'p', 'span', 'div', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+DATE_TEXT_MAX_LENGTH = 100
+
+def _selector_lookup(selectors, prefix):
+    lookup = {}
+    for index, selector in enumerate(selectors):
+        if selector.startswith(prefix):
+            lookup.setdefault(selector.strip('.#[]'), index)
+    return lookup
+
+DATE_TAGS = {selector: index for index, selector in enumerate(DATE_SELECTORS) if selector.isalpha()}
+DATE_CLASSES = _selector_lookup(DATE_SELECTORS, '.')
+DATE_IDS = _selector_lookup(DATE_SELECTORS, '#')
+DATE_ATTRIBUTES = _selector_lookup(DATE_SELECTORS, '[')
+
+class ArticleScan:
+    """Everything extract_date looks at in an article, gathered in a single walk of its subtree"""
+    def __init__(self, article):
+        # Index into DATE_SELECTORS -> first descendant matching it, in document order
+        self.first_match = {}
+        self.microsoft_date = None
+        self.ld_json = []
+        # [element, lower bound of its stripped text length] in document order
+        self.text_elements = []
+        self._walk(article)
+    
+    def _walk(self, article):
+        # Explicit stack of [children iterator, non-whitespace characters below, text entry]
+        stack = [[iter(article.contents), 0, None]]
+        while stack:
+            frame = stack[-1]
+            child = next(frame[0], None)
+            if child is None:
+                stack.pop()
+                if frame[2] is not None:
+                    frame[2][1] = frame[1]
+                if stack:
+                    stack[-1][1] += frame[1]
+                continue
+            
+            if isinstance(child, Tag):
+                self._classify(child)
+                entry = None
+                if child.name in DATE_TEXT_TAGS:
+                    entry = [child, 0]
+                    self.text_elements.append(entry)
+                stack.append([iter(child.contents), 0, entry])
+            elif type(child) in (NavigableString, CData):
+                # Only strings get_text() always includes, so the count stays a lower bound
+                frame[1] += sum(map(len, child.split()))
+    
+    def _classify(self, element):
+        matches = []
+        if element.name in DATE_TAGS:
+            matches.append(DATE_TAGS[element.name])
+        attrs = element.attrs
+        if attrs:
+            for name in attrs:
+                if name in DATE_ATTRIBUTES:
+                    matches.append(DATE_ATTRIBUTES[name])
+            classes = attrs.get('class') or ()
+            if isinstance(classes, str):
+                classes = classes.split()
+            for name in classes:
+                if name in DATE_CLASSES:
+                    matches.append(DATE_CLASSES[name])
+                if self.microsoft_date is None and name in MICROSOFT_DATE_CLASSES:
+                    self.microsoft_date = element
+            if attrs.get('id') in DATE_IDS:
+                matches.append(DATE_IDS[attrs['id']])
+            if element.name == 'script' and attrs.get('type') == 'application/ld+json':
+                self.ld_json.append(element)
+        for index in matches:
+            self.first_match.setdefault(index, element)
+    
+    def matches(self):
+        """Elements matching DATE_SELECTORS, in order of preference"""
+        return [self.first_match[index] for index in sorted(self.first_match)]
+    
+    def selector_matches(self):
+        """(selector, element) for each of DATE_SELECTORS that matched, in order of preference"""
+        return [(DATE_SELECTORS[index], self.first_match[index]) for index in sorted(self.first_match)]
+    
+    def short_texts(self):
+        """Stripped texts of the DATE_TEXT_TAGS elements short enough to be a date line"""
+        for element, length in self.text_elements:
+            # get_text() is only paid for where the text could be short enough
+            if length < DATE_TEXT_MAX_LENGTH:
+                text = element.get_text().strip()
+                if len(text) < DATE_TEXT_MAX_LENGTH:
+                    yield text
+
+# Links to the next, older page of a listing, most reliable first
+NEXT_PAGE_PATTERNS = [re.compile(pattern, re.I | re.S) for pattern in (
+    r'<link\b[^>]*\brel=["\']?next\b[^>]*>',
+    r'<a\b[^>]*\brel=["\']?next\b[^>]*>',
+    r'<a\b[^>]*\bclass=["\'][^"\']*\b(?:next|older)(?:[-_](?:page|posts|link))?\b[^"\']*["\'][^>]*>',
+    r'<a\b[^>]*>(?:(?!</a>).){0,80}?\b(?:older|next|more)\s+(?:posts|entries|articles|stories|page)\b',
+    r'<a\b[^>]*\bhref=["\'][^"\']*(?:/page/2/?|[?&](?:page|paged|pg)=2)(?=["\'&#])[^>]*>',
+)]
+HREF_PATTERN = re.compile(r'\bhref=(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))', re.I)
+# The page number in the URL of page 2 of a listing
+PAGE_NUMBER_PATTERN = re.compile(r'(?:/page/|[?&](?:page|paged|pg)=)(2)(?=$|[/?&#])', re.I)
+
+def find_next_page(text, url):
+    """The URL of the next listing page linked from a page's HTML, or None"""
+    host = urlsplit(url).hostname
+    for pattern in NEXT_PAGE_PATTERNS:
+        for match in pattern.finditer(text):
+            href = HREF_PATTERN.search(match.group())
+            if not href:
+                continue
+            link = urljoin(url, html.unescape(next(group for group in href.groups() if group is not None)).strip())
+            if urlsplit(link).hostname == host and link.split('#')[0] != url.split('#')[0]:
+                return link
+    return None
+
+def page_url_template(url):
+    """(prefix, suffix) around the page number when url is page 2 of a numbered listing, or None"""
+    match = PAGE_NUMBER_PATTERN.search(url)
+    if not match:
+        return None
+    return url[:match.start(1)], url[match.end(1):]
+
+class ListingWatcher(HTMLParser):
+    """Follow a listing page while it downloads, noticing when its posts have gone past the date window"""
+    def __init__(self, window_start, charset=None):
+        super().__init__(convert_charrefs=True)
+        try:
+            self.decoder = codecs.getincrementaldecoder(charset or 'utf-8')(errors='replace')
+        except LookupError:
+            self.decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self.window_start = window_start
+        self.in_container = False
+        self.dated = False
+        self.skipping = None
+        self.older = 0
+        self.finished = False
+    
+    def feed_bytes(self, chunk):
+        """Decode and scan the next chunk of the body, returning True once the rest can be skipped"""
+        if not self.finished:
+            self.feed(self.decoder.decode(chunk))
+        return self.finished
+    
+    def handle_starttag(self, tag, attrs):
+        if tag in ('script', 'style'):
+            self.skipping = tag
+            return
+        attrs = dict(attrs)
+        if is_container_start(tag, attrs):
+            # A container runs until the next one starts, its first date counts
+            self.in_container = True
+            self.dated = False
+        elif self.in_container and not self.dated and attrs.get('datetime'):
+            self.container_date(DATE_RECOGNIZER.parse(attrs['datetime']))
+    
+    def handle_endtag(self, tag):
+        if tag == self.skipping:
+            self.skipping = None
+    
+    def handle_data(self, data):
+        if not self.in_container or self.dated or self.skipping:
+            return
+        text = data.strip()
+        if text and len(text) < DATE_TEXT_MAX_LENGTH:
+            self.container_date(DATE_RECOGNIZER.parse(text) or DATE_RECOGNIZER.search(text))
+    
+    def container_date(self, date):
+        if date is None:
+            return
+        self.dated = True
+        date = to_local_naive(date)
+        # Listings run newest first, so a run of older posts means the window is behind us
+        if date.replace(hour=0, minute=0, second=0, microsecond=0) < self.window_start:
+            self.older += 1
+            self.finished = self.older >= OLDER_POSTS_BEFORE_STOP
+        else:
+            self.older = 0
+
+class BodyBuffer:
+    """A response body read chunk by chunk, up to a size limit and optionally until a ListingWatcher is done"""
+    def __init__(self, url, max_bytes, watcher=None):
+        self.url = url
+        self.max_bytes = max_bytes
+        self.watcher = watcher
+        self.chunks = []
+        self.size = 0
+        self.truncated = False
+    
+    def add(self, chunk):
+        """Keep one more chunk, returning True when the rest of the body should not be read"""
+        if self.size + len(chunk) > self.max_bytes:
+            chunk = chunk[:self.max_bytes - self.size]
+            print(f"Body of {self.url} exceeds {self.max_bytes // 1024} KB, keeping only the start of it")
+            self.truncated = True
+        self.chunks.append(chunk)
+        self.size += len(chunk)
+        if not self.truncated and self.watcher is not None and self.watcher.feed_bytes(chunk):
+            self.truncated = True
+        return self.truncated
+    
+    @property
+    def content(self):
+        return b''.join(self.chunks)
+
+# RSS/Atom feed discovery and parsing
+FEED_TYPES = {'application/rss+xml', 'application/atom+xml', 'application/rdf+xml'}
+# Blogs found to have no feed are checked again after this many seconds
+FEED_REDISCOVERY_AGE = 7 * 24 * 3600
+FEED_CHUNK_SIZE = 64 * 1024
+FEED_ENTRY_TAGS = {'item', 'entry'}
+# Date fields in order of preference: RSS, Atom, Dublin Core (RSS 1.0)
+FEED_DATE_TAGS = ['pubDate', 'published', 'updated', 'date']
+
+def to_local_naive(date):
+    """Convert an aware datetime to naive local time so it compares with self.today"""
+    if date is not None and date.tzinfo is not None:
+        return date.astimezone().replace(tzinfo=None)
+    return date
+
+def looks_like_feed(response):
+    """Check whether a response is an RSS or Atom document rather than an HTML page"""
+    head = response.content[:1024].lstrip().lower()
+    if b'<html' in head:
+        return False
+    return b'<rss' in head or b'<feed' in head or b'<rdf:rdf' in head
+
+def parse_feed_date(raw):
+    if not raw:
+        return None
+    raw = raw.strip()
+    try:
+        # RFC 822 dates used by RSS
+        date = email.utils.parsedate_to_datetime(raw)
+    except (TypeError, ValueError, IndexError):
+        date = DATE_RECOGNIZER.parse(raw)
+    return to_local_naive(date)
+
+def iter_feed_entries(content):
+    """Stream (title, link, date) for each RSS item or Atom entry, clearing entries once read"""
+    pull_parser = ET.XMLPullParser(events=('end',))
+    for start in range(0, len(content), FEED_CHUNK_SIZE):
+        pull_parser.feed(content[start:start + FEED_CHUNK_SIZE])
+        for _, element in pull_parser.read_events():
+            if element.tag.rsplit('}', 1)[-1] not in FEED_ENTRY_TAGS:
+                continue
+            fields = {}
+            link = None
+            for child in element:
+                name = child.tag.rsplit('}', 1)[-1]
+                if name == 'link':
+                    # Atom links carry the URL in href, the alternate one is the post itself
+                    href = child.get('href')
+                    if href and child.get('rel', 'alternate') == 'alternate':
+                        link = link or href.strip()
+                    elif child.text and child.text.strip():
+                        link = link or child.text.strip()
+                elif name not in fields:
+                    fields[name] = (child.text or '').strip()
+            date = None
+            for name in FEED_DATE_TAGS:
+                date = parse_feed_date(fields.get(name))
+                if date:
+                    break
+            yield fields.get('title', ''), link, date
+            element.clear()
+    pull_parser.close()
+
+# Sitemaps for blogs whose listing pages are rendered by scripts
+SITEMAP_URLS = {
+    'Mandiant': 'https://www.mandiant.com/sitemap.xml',
+    'Recorded Future': 'https://www.recordedfuture.com/sitemap.xml',
+}
+SITEMAP_CHUNK_SIZE = 64 * 1024
+# Nested sitemap indexes followed, and child sitemaps read, per blog at most
+SITEMAP_MAX_DEPTH = 3
+SITEMAP_MAX_FILES = 50
+
+def title_from_url(url):
+    """A readable title from the last path segment of a post URL"""
+    slug = urlparse(url).path.rstrip('/').rsplit('/', 1)[-1]
+    slug = re.sub(r'\.(html?|php|aspx?)$', '', slug)
+    words = re.split(r'[-_+]+', slug)
+    return ' '.join(word.capitalize() for word in words if word)
+
+class FeedRegistry:
+    """Feed URL discovered for each blog, persisted between runs"""
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path) as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+    
+    def feed_url(self, blog_name):
+        entry = self.entries.get(blog_name)
+        return entry['url'] if entry else None
+    
+    def needs_discovery(self, blog_name):
+        """Check whether the index page should be searched for a feed link"""
+        entry = self.entries.get(blog_name)
+        if entry is None:
+            return True
+        return entry['url'] is None and time.time() - entry['checked'] > FEED_REDISCOVERY_AGE
+    
+    def remember(self, blog_name, feed_url):
+        with self._lock:
+            self.entries[blog_name] = {'url': feed_url, 'checked': time.time()}
+            self._save()
+    
+    def forget(self, blog_name):
+        with self._lock:
+            if self.entries.pop(blog_name, None) is not None:
+                self._save()
+    
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            write_file_atomic(self.path, json.dumps(self.entries, indent=2, sort_keys=True))
+        except OSError as e:
+            print(f"Error saving feed registry: {e}")
+
+# Selectors extract_title and extract_link try in turn
+TITLE_SELECTORS = ['h1', 'h2', 'h3', '.title', '.post-title', '.entry-title']
+LINK_SELECTORS = [
+    # Look for a link in the title
+    'h1 a, h2 a, h3 a, .title a, .post-title a, .entry-title a',
+    # Look for a "read more" link
+    'a.read-more, a.more-link, a.continue-reading',
+    # Look for any link
+    'a',
+]
+PROFILE_FIELDS = ('container', 'date', 'title', 'link')
+
+class ProfileStore:
+    """Selectors that found each blog's containers, dates, titles and links, learned between runs"""
+    def __init__(self, path, overrides=None):
+        self.path = path
+        # {blog: {field: selector}} from a config file, used as is and never relearned
+        self.overrides = overrides or {}
+        self._lock = threading.Lock()
+        self._hits = collections.defaultdict(collections.Counter)
+        try:
+            with open(path) as f:
+                self.learned = json.load(f)
+        except (OSError, ValueError):
+            self.learned = {}
+    
+    def selector(self, blog_name, field):
+        """The selector to try first for a field of a blog's articles, or None"""
+        selector = self.overrides.get(blog_name, {}).get(field)
+        if selector:
+            return selector
+        return self.learned.get(blog_name, {}).get(field)
+    
+    def record(self, blog_name, field, selector):
+        """Count a selector that found a field in one of the blog's articles"""
+        with self._lock:
+            self._hits[(blog_name, field)][selector] += 1
+    
+    def pop_hits(self, blog_name):
+        """The counts recorded for a blog, removed so they can be merged elsewhere"""
+        with self._lock:
+            return {field: dict(self._hits.pop((blog_name, field), {})) for field in PROFILE_FIELDS}
+    
+    def merge_hits(self, blog_name, hits):
+        with self._lock:
+            for field, counts in hits.items():
+                self._hits[(blog_name, field)].update(counts)
+    
+    def save(self, only_blog=None):
+        """Keep the selector that worked most often this run for each field, dropping ones that stopped matching,
+        for only_blog alone when given so the counts of blogs still being scraped are left alone"""
+        with self._lock:
+            learned = {blog_name: dict(fields) for blog_name, fields in self.learned.items()}
+            blogs = {blog_name for blog_name, _ in self._hits if only_blog is None or blog_name == only_blog}
+            for blog_name in blogs:
+                fields = {}
+                for field in PROFILE_FIELDS:
+                    counts = self._hits.pop((blog_name, field), None)
+                    if counts:
+                        fields[field] = counts.most_common(1)[0][0]
+                learned[blog_name] = fields
+            if learned == self.learned:
+                return
+            self.learned = learned
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                write_file_atomic(self.path, json.dumps(learned, indent=2, sort_keys=True))
+            except OSError as e:
+                print(f"Error saving extraction profiles: {e}")
+
+# Query parameters that only track where a reader came from
+TRACKING_PARAMS = {'amp', 'fbclid', 'gclid', 'mc_cid', 'mc_eid', 'ref', 'source'}
+# Consecutive articles older than the high-water mark after which a listing page is not read further
+OLDER_POSTS_BEFORE_STOP = 3
+
+def canonical_url(url):
+    """Normalise a post URL so the same post is recognised whatever link it was reached through"""
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or '').lower()
+    # AMP copies live under an amp. host or an /amp path suffix
+    if host.startswith('amp.'):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    path = re.sub(r'/{2,}', '/', parts.path) or '/'
+    if len(path) > 1:
+        path = path.rstrip('/')
+    if path.endswith('/amp'):
+        path = path[:-4] or '/'
+    query = sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS)
+    return urlunsplit(('https', host, path, urlencode(query), ''))
+
+class SeenStore:
+    """Posts reported by earlier runs, keyed by canonical URL, and the newest post date of each blog"""
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.conn:
+            self.conn.execute("""CREATE TABLE IF NOT EXISTS posts (
+                url TEXT PRIMARY KEY, blog TEXT NOT NULL, title TEXT, published TEXT, first_seen TEXT NOT NULL)""")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS high_water (blog TEXT PRIMARY KEY, date TEXT NOT NULL)")
+    
+    def high_water_marks(self):
+        """Newest post date recorded for each blog"""
+        with self._lock:
+            rows = self.conn.execute("SELECT blog, date FROM high_water").fetchall()
+        return {blog: datetime.strptime(date, '%Y-%m-%d') for blog, date in rows}
+    
+    def record_new(self, blog_name, posts):
+        """Record the posts of a blog and return the ones no earlier run had seen"""
+        new_posts = []
+        first_seen = datetime.now().isoformat(timespec='seconds')
+        with self._lock, self.conn:
+            for post in posts:
+                cursor = self.conn.execute(
+                    "INSERT OR IGNORE INTO posts (url, blog, title, published, first_seen) VALUES (?, ?, ?, ?, ?)",
+                    (canonical_url(post['URL']), blog_name, post['Title'], post['Date'], first_seen))
+                if cursor.rowcount:
+                    new_posts.append(post)
+            dates = [post['Date'] for post in posts if post['Date'][:1].isdigit()]
+            if dates:
+                self.conn.execute(
+                    "INSERT INTO high_water (blog, date) VALUES (?, ?) "
+                    "ON CONFLICT (blog) DO UPDATE SET date = max(date, excluded.date)",
+                    (blog_name, max(dates)))
+        return new_posts
+    
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+# Near-duplicate story detection
+DEDUP_THRESHOLD = 0.5
+# Posts further apart than this are different stories however alike their titles, e.g. weekly roundups
+DEDUP_MAX_DAYS = 3
+MINHASH_PERMUTATIONS = 64
+# 16 bands of 4 rows put titles with a Jaccard similarity of about 0.5 in a shared bucket
+LSH_BANDS = 16
+MINHASH_PRIME = (1 << 61) - 1
+TITLE_STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'by', 'for', 'from', 'how', 'in', 'into', 'is', 'it', 'its', 'new',
+    'of', 'on', 'or', 'our', 'the', 'their', 'this', 'to', 'us', 'via', 'we', 'what', 'who', 'why', 'with', 'you',
+}
+
+def title_features(title):
+    """Words of a title that tell stories apart, cut to a common stem so inflections still match"""
+    words = re.findall(r'[a-z0-9]+(?:[-.][a-z0-9]+)*', title.lower())
+    return {word[:7] for word in words if word not in TITLE_STOPWORDS and len(word) > 1}
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+class MinHashIndex:
+    """Locality-sensitive hashing of feature sets: sets whose MinHash signatures agree on a whole band share a bucket"""
+    def __init__(self, permutations=MINHASH_PERMUTATIONS, bands=LSH_BANDS, seed=1):
+        rng = random.Random(seed)
+        self.coefficients = [(rng.randrange(1, MINHASH_PRIME), rng.randrange(MINHASH_PRIME)) for _ in range(permutations)]
+        self.bands = bands
+        self.rows = permutations // bands
+        self.buckets = collections.defaultdict(list)
+        # Permuted hashes of each feature seen, as titles share most of their words
+        self.hashes = {}
+    
+    def feature_hashes(self, feature):
+        hashes = self.hashes.get(feature)
+        if hashes is None:
+            h = zlib.crc32(feature.encode('utf-8'))
+            hashes = self.hashes[feature] = [(a * h + b) % MINHASH_PRIME for a, b in self.coefficients]
+        return hashes
+    
+    def signature(self, features):
+        return list(map(min, zip(*map(self.feature_hashes, features))))
+    
+    def add(self, key, features):
+        """Index a non-empty feature set under key, returning the keys indexed earlier that share a bucket with it"""
+        signature = self.signature(features)
+        candidates = {}
+        for band in range(self.bands):
+            bucket = self.buckets[band, tuple(signature[band * self.rows:(band + 1) * self.rows])]
+            candidates.update(dict.fromkeys(bucket))
+            bucket.append(key)
+        return list(candidates)
+
+def cluster_stories(posts, threshold=DEDUP_THRESHOLD, max_days=DEDUP_MAX_DAYS):
+    """Drop copies of a post reached through other URLs, then group the posts of different blogs telling the same story
+    
+    Returns the remaining posts in their original order and the stories covered by more than one of them.
+    Only posts sharing an LSH bucket are compared, so the work grows with the number of posts, not of pairs.
+    """
+    unique = {}
+    for post in posts:
+        unique.setdefault(canonical_url(post['URL']), post)
+    posts = list(unique.values())
+    
+    parent = list(range(len(posts)))
+    
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+    
+    def day(date):
+        try:
+            return datetime.strptime(date, '%Y-%m-%d')
+        except ValueError:
+            return None
+    
+    index = MinHashIndex()
+    features = [title_features(post['Title']) for post in posts]
+    days = {date: day(date) for date in {post['Date'] for post in posts}}
+    for i, post in enumerate(posts):
+        if not features[i]:
+            continue
+        for j in index.add(i, features[i]):
+            other = posts[j]
+            if other['Blog'] == post['Blog'] or find(i) == find(j):
+                # Alike titles on one blog are usually parts of a series, not copies
+                continue
+            first, second = days[post['Date']], days[other['Date']]
+            if first is None or second is None or abs((first - second).days) > max_days:
+                continue
+            if jaccard(features[i], features[j]) >= threshold:
+                parent[find(j)] = find(i)
+    
+    stories = collections.defaultdict(list)
+    for i, post in enumerate(posts):
+        stories[find(i)].append(post)
+    return posts, [story for story in stories.values() if len(story) > 1]
+
+# Indicators of compromise pulled from article text, in the order they are reported
+IOC_TYPES = ['url', 'ipv4', 'domain', 'sha256', 'sha1', 'md5', 'cve', 'attack']
+IOC_FIELDS = ['Blog', 'URL', 'Type', 'Indicator']
+# Defanged dots such as [.] (.) {.} and [dot] keep indicators from turning into links
+IOC_DOT = r'(?:\.|\[\.\]|\(\.\)|\{\.\}|\[dot\]|\(dot\))'
+IOC_OCTET = r'(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)'
+# Pattern of each type, where several match at one place the earlier one wins
+IOC_PATTERNS = [
+    ('cve', r'\bCVE-\d{4}-\d{4,7}\b'),
+    ('attack', r'\bT1\d{3}(?:\.\d{3})?\b'),
+    ('sha256', r'\b[a-f0-9]{64}\b'),
+    ('sha1', r'\b[a-f0-9]{40}\b'),
+    ('md5', r'\b[a-f0-9]{32}\b'),
+    ('url', r'\b(?:https?|hxxps?|h\[xx\]ps?)(?:://|\[://\]|\[:\]//)[^\s<>"\']+'),
+    ('ipv4', rf'\b{IOC_OCTET}(?:{IOC_DOT}{IOC_OCTET}){{3}}\b'),
+    ('domain', rf'\b(?:[a-z0-9](?:[a-z0-9-]{{0,61}}[a-z0-9])?{IOC_DOT})+[a-z][a-z0-9-]{{1,23}}\b'),
+]
+# All types in one alternation, so the text is scanned once instead of once per type
+IOC_PATTERN = re.compile('|'.join(f'(?P<{kind}>{pattern})' for kind, pattern in IOC_PATTERNS), re.I)
+# Every indicator holds one of these characters, so words without one are skipped at C speed
+IOC_ANCHOR = re.compile(r'[\d.:(\[{](?![\s)\]},;]|$)')
+IOC_WORD_END = re.compile(r'[\s<>"\']')
+# How far back from an anchor character the start of its word is looked for first
+IOC_MAX_LOOKBACK = 80
+IOC_REFANG = re.compile(r'\[\.\]|\(\.\)|\{\.\}|\[dot\]|\(dot\)|\[://\]|\[:\]|^h\[?xx\]?p', re.I)
+# File names look like domains, some of these are real TLDs but hardly ever seen in indicators
+IOC_FILE_EXTENSIONS = {
+    'bat', 'bin', 'cfg', 'css', 'dat', 'dll', 'doc', 'docm', 'docx', 'exe', 'gif', 'htm', 'html', 'ini', 'jar',
+    'jpeg', 'jpg', 'js', 'json', 'lnk', 'log', 'msi', 'pdf', 'php', 'png', 'ps1', 'py', 'sh', 'svg', 'sys',
+    'tmp', 'txt', 'vbs', 'xls', 'xlsm', 'xlsx', 'xml', 'zip',
+}
+
+def refang(value):
+    """Undo the usual defanging of an indicator: hxxp, [.], (.), [dot], [://] and [:]"""
+    def replace(match):
+        marker = match.group().lower()
+        if marker.startswith('h'):
+            return 'http'
+        if '/' in marker:
+            return '://'
+        return ':' if ':' in marker else '.'
+    return IOC_REFANG.sub(replace, value)
+
+def iter_ioc_matches(text):
+    """IOC_PATTERN matches in text, running the pattern only over the words holding an anchor character"""
+    pos = 0
+    while True:
+        anchor = IOC_ANCHOR.search(text, pos)
+        if anchor is None:
+            return
+        hit = anchor.start()
+        lookback = max(hit - IOC_MAX_LOOKBACK, pos)
+        start = max(text.rfind(' ', lookback, hit), text.rfind('\n', lookback, hit), text.rfind('\t', lookback, hit)) + 1
+        if not start:
+            # A long word, or the first one: go back to where it really starts
+            start = max(text.rfind(' ', pos, hit), text.rfind('\n', pos, hit), text.rfind('\t', pos, hit), pos - 1) + 1
+        end = IOC_WORD_END.search(text, hit)
+        end = end.start() if end else len(text)
+        yield from IOC_PATTERN.finditer(text, start, end)
+        pos = end
+
+def extract_iocs(text):
+    """{type: [indicators]} found in text, refanged and deduplicated in order of appearance"""
+    found = {}
+    
+    def add(kind, value):
+        if kind == 'domain':
+            value = value.lower()
+            if value.rsplit('.', 1)[-1] in IOC_FILE_EXTENSIONS:
+                return
+        elif kind in ('sha256', 'sha1', 'md5'):
+            value = value.lower()
+        elif kind in ('cve', 'attack'):
+            value = value.upper()
+        found.setdefault(kind, {})[value] = None
+    
+    for match in iter_ioc_matches(text):
+        kind = match.lastgroup
+        value = refang(match.group())
+        if kind == 'url':
+            value = value.rstrip('.,;:!?)\'"')
+            try:
+                host = urlsplit(value).hostname
+            except ValueError:
+                continue
+            # The host of a URL is an indicator of its own
+            host_match = IOC_PATTERN.fullmatch(host or '')
+            if host_match and host_match.lastgroup in ('ipv4', 'domain'):
+                add(host_match.lastgroup, host)
+        add(kind, value)
+    return {kind: list(found[kind]) for kind in IOC_TYPES if kind in found}
+
+# Per-blog measurements and the Prometheus help text of each
+METRICS = {
+    'requests': 'HTTP requests sent',
+    'dns_seconds': 'Time spent resolving host names (async mode)',
+    'connect_seconds': 'Time spent opening connections (async mode)',
+    'ttfb_seconds': 'Time from sending a request to receiving the response headers',
+    'download_seconds': 'Time spent reading response bodies',
+    'bytes': 'Response body bytes received',
+    'truncated_bodies': 'Response bodies cut short by the size limit or the early stop',
+    'parse_seconds': 'Time spent parsing pages and extracting posts',
+    'candidate_containers': 'Article containers matched before deduplication',
+    'date_attempts': 'Articles a date was looked for in',
+    'date_hits': 'Articles a date was found in',
+    'results': 'Posts reported',
+    'backfill_pages': 'Listing pages read past the first while backfilling',
+    'ioc_pages': 'Article pages fetched for indicators',
+    'iocs': 'Indicators found in article pages',
+}
+
+class ScrapeMetrics:
+    """Per-blog timings and counters, safe to update from the fetch and parse threads"""
     def __init__(self):
+        self._lock = threading.Lock()
+        self.blogs = {}
+    
+    def add(self, blog_name, **values):
+        if blog_name is None:
+            return
+        with self._lock:
+            blog = self.blogs.setdefault(blog_name, dict.fromkeys(METRICS, 0))
+            for name, value in values.items():
+                blog[name] += value
+    
+    def pop(self, blog_name):
+        with self._lock:
+            return self.blogs.pop(blog_name, {})
+    
+    def report(self):
+        """Metrics of every blog plus the totals, with the date hit rate worked out"""
+        with self._lock:
+            blogs = {blog_name: dict(values) for blog_name, values in self.blogs.items()}
+        total = dict.fromkeys(METRICS, 0)
+        for values in blogs.values():
+            for name in METRICS:
+                total[name] += values[name]
+        for values in list(blogs.values()) + [total]:
+            values['date_hit_rate'] = values['date_hits'] / values['date_attempts'] if values['date_attempts'] else None
+        return {'blogs': blogs, 'total': total}
+    
+    def to_json(self):
+        return json.dumps(self.report(), indent=2, sort_keys=True)
+    
+    def to_prometheus(self):
+        """The per-blog metrics in the Prometheus text exposition format"""
+        blogs = self.report()['blogs']
+        lines = []
+        for name, help_text in METRICS.items():
+            metric = f"blog_scraper_{name}"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} gauge")
+            for blog_name in sorted(blogs):
+                label = blog_name.replace('\\', '\\\\').replace('"', '\\"')
+                lines.append(f'{metric}{{blog="{label}"}} {blogs[blog_name][name]:g}')
+        return '\n'.join(lines) + '\n'
+
+def build_trace_config():
+    """aiohttp hooks stamping when DNS resolution, connection setup and the response headers finish"""
+    trace_config = aiohttp.TraceConfig()
+    
+    def stamp(name):
+        async def hook(session, context, params):
+            if context.trace_request_ctx is not None:
+                context.trace_request_ctx[name] = time.perf_counter()
+        return hook
+    
+    trace_config.on_dns_resolvehost_start.append(stamp('dns_start'))
+    trace_config.on_dns_resolvehost_end.append(stamp('dns_end'))
+    trace_config.on_connection_create_start.append(stamp('connect_start'))
+    trace_config.on_connection_create_end.append(stamp('connect_end'))
+    trace_config.on_request_end.append(stamp('headers'))
+    return trace_config
+
+RESULT_FIELDS = ['Blog', 'Title', 'Date', 'URL']
+# Formats a ResultSink appends to while the scan runs, the others are reports written at the end
+SINK_FORMATS = ['jsonl', 'csv', 'parquet']
+RESULT_EXTENSIONS = {'jsonl': 'jsonl', 'csv': 'csv', 'parquet': 'parquet', 'html': 'html', 'markdown': 'md'}
+PARQUET_BATCH_SIZE = 1000
+
+def group_posts(posts):
+    """Posts grouped by date, newest first, then by blog name, in a single pass"""
+    groups = collections.defaultdict(lambda: collections.defaultdict(list))
+    for post in posts:
+        groups[post['Date']][post['Blog']].append(post)
+    return [(date, [(blog, groups[date][blog]) for blog in sorted(groups[date])])
+            for date in sorted(groups, reverse=True)]
+
+def sorted_posts(posts):
+    """Posts ordered by date, newest first, then by blog name"""
+    return [post for _, blogs in group_posts(posts) for _, blog_posts in blogs for post in blog_posts]
+
+class ResultSink:
+    """Appends posts to a JSONL, CSV or Parquet file as soon as each blog yields them"""
+    def __init__(self, path, output_format):
+        self.path = path
+        self.output_format = output_format
+        self.count = 0
+        self._lock = threading.Lock()
+        self._batch = []
+        self._file = None
+        self._writer = None
+        if output_format == 'parquet':
+            # pyarrow takes a while to import, so only runs writing Parquet pay for it
+            import pyarrow
+            import pyarrow.parquet
+            self._schema = pyarrow.schema([(field, pyarrow.string()) for field in RESULT_FIELDS])
+            self._table = pyarrow.Table.from_pylist
+            self._writer = pyarrow.parquet.ParquetWriter(path, self._schema)
+        else:
+            self._file = open(path, 'w', newline='', encoding='utf-8')
+            if output_format == 'csv':
+                self._writer = csv.DictWriter(self._file, fieldnames=RESULT_FIELDS)
+                self._writer.writeheader()
+    
+    def write(self, posts):
+        with self._lock:
+            for post in posts:
+                if self.output_format == 'jsonl':
+                    self._file.write(json.dumps(post, ensure_ascii=False) + '\n')
+                elif self.output_format == 'csv':
+                    self._writer.writerow(post)
+                else:
+                    self._batch.append(post)
+                self.count += 1
+            if len(self._batch) >= PARQUET_BATCH_SIZE:
+                self._flush_batch()
+            if self._file:
+                # Posts written so far survive a run that is killed halfway
+                self._file.flush()
+    
+    def _flush_batch(self):
+        if self._batch:
+            self._writer.write_table(self._table(self._batch, schema=self._schema))
+            self._batch = []
+    
+    def close(self):
+        with self._lock:
+            if self.output_format == 'parquet':
+                self._flush_batch()
+                self._writer.close()
+            else:
+                self._file.close()
+
+class BlogScraper:
+    def __init__(self, fetch_mode='async', max_concurrency=DEFAULT_CONCURRENCY,
+                 per_host_limit=DEFAULT_PER_HOST_LIMIT, max_workers=DEFAULT_MAX_WORKERS,
+                 cache_dir=DEFAULT_CACHE_DIR, use_cache=True, cache_max_bytes=HTTP_CACHE_MAX_BYTES,
+                 cache_max_age=None, container_selectors=None, parser_backend=DEFAULT_PARSER,
+                 strain_pages=True, feed_first=False, use_sitemaps=False, sitemaps=None, only_new=False,
+                 parse_processes=DEFAULT_PARSE_PROCESSES, sink=None, profiles=None, deadline=None,
+                 max_body_bytes=MAX_BODY_BYTES, early_stop=False, extract_iocs=False, dedupe=False,
+                 days=DEFAULT_WINDOW_DAYS, since=None, backfill=False):
+        self.fetch_mode = fetch_mode
+        # Posts are reported from the first day of the window to today: since when set, the last days days otherwise
+        self.window_days = days
+        self.since = since
+        # Follow the listing pagination of each blog until the pages are older than the window
+        self.backfill = backfill
+        # Drop posts reached through several URLs and group the blogs covering the same story
+        self.dedupe = dedupe
+        self.stories = []
+        # Fetch the article of every post found and pull the indicators out of it
+        self.extract_iocs = extract_iocs
+        self.iocs = {}
+        self.max_body_bytes = max_body_bytes
+        # Stop downloading a listing page once it has gone past the blog's date window
+        self.early_stop = early_stop
+        # ResultSink receiving each blog's posts as soon as they are found
+        self.sink = sink
+        self.parse_processes = parse_processes
+        # Blogs discovered through their sitemap instead of their listing page
+        self.sitemaps = dict(SITEMAP_URLS, **(sitemaps or {})) if use_sitemaps else {}
+        # Read posts from the blog's RSS/Atom feed, scraping the HTML only for blogs without one
+        self.feed_first = feed_first
+        self.parser_backend = parser_backend
+        # Parse only the regions of a page that can contain article containers
+        self.strain_pages = strain_pages
+        # Container selectors set in a profile config work like the configured ones
+        self.container_selectors = dict(BLOG_CONTAINER_SELECTORS)
+        self.container_selectors.update({blog_name: profile['container'] for blog_name, profile in (profiles or {}).items()
+                                         if profile.get('container')})
+        self.container_selectors.update(container_selectors or {})
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+        self.max_workers = max_workers
         self.today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
         self.yesterday = self.today - timedelta(days=1)
         self.results = []
         self.processed_blogs = 0
+        self._progress_lock = threading.Lock()
+        self.metrics = ScrapeMetrics()
         self.total_blogs = len(BLOG_URLS)
         self.debug_info = {}
+        self.dates = DATE_RECOGNIZER
+        self._local = threading.local()
+        self.cache_dir = cache_dir
+        self.http_cache = None
+        if use_cache:
+            self.http_cache = HttpCache(os.path.join(cache_dir, 'http'), cache_max_bytes, cache_max_age)
+        self.feeds = FeedRegistry(os.path.join(cache_dir, 'feeds.json'))
+        # Selectors tried first for each blog, learned from earlier runs or set in a profile config
+        self.profiles = ProfileStore(os.path.join(cache_dir, 'profiles.json'), profiles)
+        # Seconds the whole scan may take, with per-host rate limits and timeouts from earlier runs
+        self.deadline = deadline
+        self.scheduler = HostScheduler(os.path.join(cache_dir, 'hosts.json'))
+        # Report only posts missing from the seen-posts store, catching up from each blog's newest known post
+        self.seen = None
+        self.high_water = {}
+        if only_new:
+            self.seen = SeenStore(os.path.join(cache_dir, 'seen.sqlite3'))
+            self.high_water = self.seen.high_water_marks()
         
+    def advance_progress(self):
+        """Count one more blog as processed, returning the new count, which starts over once every blog was done"""
+        with self._progress_lock:
+            self.processed_blogs = self.processed_blogs % self.total_blogs + 1
+            return self.processed_blogs
+    
+    def refresh_dates(self):
+        """Move today and yesterday to the current day, returning True when the day changed"""
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        if today == self.today:
+            return False
+        self.today = today
+        self.yesterday = today - timedelta(days=1)
+        # Dates without a year or day were completed relative to the old day
+        self.dates.cache_clear()
+        return True
+    
+    def record_fetch(self, response, download_seconds, body):
+        """Add the timings of a blocking request to the metrics of the blog the thread is working on"""
+        # elapsed stops at the response headers, the body is read after that
+        self.metrics.add(getattr(self._local, 'blog_name', None), requests=1,
+                         ttfb_seconds=response.elapsed.total_seconds(), download_seconds=download_seconds,
+                         bytes=body.size, truncated_bodies=int(body.truncated))
+    
     def get_random_user_agent(self):
         return random.choice(USER_AGENTS)
     
@@ -77,86 +1619,156 @@ class BlogScraper:
             return f'https://{url}'
         return url
     
-    def make_request(self, url):
-        """Make a request with error handling and retries"""
+    def get_session(self):
+        """Return the calling worker's pooled session, creating it on first use"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(max_retries=build_retry(self.scheduler), pool_connections=POOL_HOSTS,
+                                  pool_maxsize=self.per_host_limit)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+            self._local.session = session
+        return session
+    
+    def scheduled_get(self, session, url, headers):
+        """GET url once its host's rate limit allows, with the host's timeout, returning before the body is read"""
+        host = urlparse(url).netloc
+        if not self.scheduler.acquire(host):
+            raise DeadlineReached(f"run deadline reached before {url} could be requested")
+        timeouts = self.scheduler.timeouts(host)
+        try:
+            response = session.get(url, headers=headers, timeout=timeouts, stream=True)
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+            self.scheduler.failed(host, timeouts[1])
+            raise
+        # Responses urllib3 already retried are only visible in the retry history
+        retries = getattr(response.raw, 'retries', None)
+        for attempt in getattr(retries, 'history', None) or ():
+            if attempt.status in THROTTLE_STATUSES:
+                self.scheduler.throttle(host)
+        self.scheduler.observe(host, response.elapsed.total_seconds(), response.status_code,
+                               response.headers.get('Retry-After'))
+        return response
+    
+    def make_request(self, url, listing=True):
+        """Make a request with error handling and retries, revalidating cached pages"""
         headers = {'User-Agent': self.get_random_user_agent()}
+        entry = self.http_cache.load(url) if self.http_cache else None
+        if entry:
+            if self.http_cache.is_fresh(entry):
+                page = self.http_cache.cached_page(url, entry)
+                if page:
+                    return page
+            headers.update(self.http_cache.conditional_headers(entry))
+        
         try:
-            response = requests.get(url, headers=headers, timeout=30)
-            response.raise_for_status()
-            return response
+            session = self.get_session()
+            response = self.scheduled_get(session, url, headers)
+            if response.status_code == 304 and entry:
+                response.close()
+                page = self.http_cache.cached_page(url, entry)
+                if page:
+                    return page
+                # The body was evicted in the meantime, so ask for the full page again
+                headers = {'User-Agent': headers['User-Agent']}
+                response = self.scheduled_get(session, url, headers)
+            with response:
+                response.raise_for_status()
+                page = self.read_page(response, url, listing)
+            # A cut-off body is not the page the validators stand for
+            if self.http_cache and not page.truncated:
+                self.http_cache.store(url, page)
+            return page
         except requests.exceptions.RequestException as e:
             print(f"Error fetching {url}: {e}")
             return None
     
+    def body_buffer(self, url, content_type, blog_name):
+        """Where to collect the body of url, watching for the end of the date window if early stop is on"""
+        watcher = None
+        if self.early_stop and blog_name is not None:
+            watcher = ListingWatcher(self.window_start(blog_name), content_type_charset(content_type))
+        return BodyBuffer(url, self.max_body_bytes, watcher)
+    
+    def read_page(self, response, url, listing=True):
+        """Read a streamed response chunk by chunk into a FetchedPage, listing pages possibly stopping early"""
+        started = time.perf_counter()
+        blog_name = getattr(self._local, 'blog_name', None) if listing else None
+        body = self.body_buffer(url, response.headers.get('Content-Type'), blog_name)
+        for chunk in response.iter_content(BODY_CHUNK_SIZE):
+            if body.add(chunk):
+                break
+        self.record_fetch(response, time.perf_counter() - started, body)
+        return FetchedPage(response.url, response.status_code, response.headers, body.content,
+                           response.encoding, truncated=body.truncated)
+    
     def extract_date_from_text(self, text):
         """Try to extract date from a text string using regex patterns"""
-        # Common date formats
-        date_patterns = [
-            # Apr 21, 2025
-            r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d{1,2}),?\s+(\d{4})',
-            # April 21, 2025
-            r'(January|February|March|April|May|June|July|August|September|October|November|December)\s+(\d{1,2}),?\s+(\d{4})',
-            # 21 Apr 2025
-            r'(\d{1,2})\s+(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d{4})',
-            # 21 April 2025
-            r'(\d{1,2})\s+(January|February|March|April|May|June|July|August|September|October|November|December)\s+(\d{4})',
-            # 2025-04-21
-            r'(\d{4})[/\-.](\d{1,2})[/\-.](\d{1,2})',
-            # 04/21/2025
-            r'(\d{1,2})[/\-.](\d{1,2})[/\-.](\d{4})'
-        ]
-        
-        if not text:
-            return None
-        
-        # Clean the text
-        text = text.strip()
-        
-        # Try each pattern
-        for pattern in date_patterns:
-            match = re.search(pattern, text)
-            if match:
-                try:
-                    return parser.parse(match.group(0))
-                except:
-                    continue
+        return to_local_naive(self.dates.search(text))
+    
+    def parse_date(self, raw):
+        """Parse a date string as naive local time, comparable with self.today even when it gives an offset"""
+        return to_local_naive(self.dates.parse(raw))
+    
+    def date_from_element(self, date_element):
+        """The date in an element's datetime attribute or text, or None"""
+        # First try to get datetime attribute
+        if date_element.has_attr('datetime'):
+            date = self.parse_date(date_element['datetime'])
+            if date:
+                return date
         
-        return None
+        # Try to parse the text content
+        date_text = date_element.get_text().strip()
+        date = self.parse_date(date_text)
+        if date:
+            return date
+        return self.extract_date_from_text(date_text)
     
     def extract_date(self, article, blog_name, url):
-        """Try various methods to extract the date from an article"""
+        """Try the blog's profiled date selector, then various methods walking the article only once"""
         date = None
+        if blog_name != 'Microsoft Security':
+            selector = self.profiles.selector(blog_name, 'date')
+            if selector:
+                try:
+                    date_element = article.select_one(selector)
+                    date = self.date_from_element(date_element) if date_element else None
+                except Exception:
+                    date = None
+                if date:
+                    self.profiles.record(blog_name, 'date', selector)
+                    return date
+        
+        scan = ArticleScan(article)
         
         # Custom handling for Microsoft Security Blog
         if blog_name == 'Microsoft Security':
             try:
                 # Look for the time element, which usually contains the date
-                time_element = article.select_one('time')
+                time_element = scan.first_match.get(DATE_TAGS['time'])
                 if time_element:
                     if time_element.has_attr('datetime'):
-                        try:
-                            date = parser.parse(time_element['datetime'])
+                        date = self.parse_date(time_element['datetime'])
+                        if date:
                             return date
-                        except:
-                            pass
                     
-                    try:
-                        date = parser.parse(time_element.get_text().strip())
+                    date = self.parse_date(time_element.get_text().strip())
+                    if date:
                         return date
-                    except:
-                        pass
                 
                 # Microsoft often has a specific class for the date
-                date_element = article.select_one('.blog-post-meta-date, .c-paragraph-4, .posted-date')
-                if date_element:
-                    try:
-                        date = parser.parse(date_element.get_text().strip())
+                if scan.microsoft_date:
+                    date = self.parse_date(scan.microsoft_date.get_text().strip())
+                    if date:
                         return date
-                    except:
-                        pass
                 
                 # Look for date patterns in text content
-                for element in article.select('p, span, div'):
+                for element, _ in scan.text_elements:
+                    if element.name not in ('p', 'span', 'div'):
+                        continue
                     text = element.get_text().strip()
                     if 'published' in text.lower() or 'posted' in text.lower() or 'date' in text.lower():
                         extracted_date = self.extract_date_from_text(text)
@@ -164,134 +1776,105 @@ class BlogScraper:
                             return extracted_date
                 
                 # Check for a structured data script tag
-                for script in article.find_all('script', type='application/ld+json'):
+                for script in scan.ld_json:
                     try:
-                        import json
                         data = json.loads(script.string)
                         if 'datePublished' in data:
-                            return parser.parse(data['datePublished'])
+                            date = self.parse_date(data['datePublished'])
+                            if date:
+                                return date
                     except:
                         pass
             except Exception as e:
                 print(f"Error extracting date from Microsoft blog: {e}")
         
-        # Common date patterns to check for all blogs
-        date_patterns = [
-            # Look for HTML5 time elements
-            lambda a: a.select_one('time'),
-            lambda a: a.select_one('[datetime]'),
-            
-            # Look for common date class/id patterns
-            lambda a: a.select_one('.date'),
-            lambda a: a.select_one('.post-date'),
-            lambda a: a.select_one('.entry-date'),
-            lambda a: a.select_one('#date'),
-            lambda a: a.select_one('.publish-date'),
-            lambda a: a.select_one('.meta-date'),
-            lambda a: a.select_one('.timestamp'),
-            lambda a: a.select_one('.c-blog-date'),
-            lambda a: a.select_one('.blog-date'),
-            
-            # Look for date text in common metadata elements
-            lambda a: a.select_one('.meta'),
-            lambda a: a.select_one('.entry-meta'),
-            lambda a: a.select_one('.post-meta'),
-            lambda a: a.select_one('.blog-meta'),
-            lambda a: a.select_one('header'),
-            lambda a: a.select_one('.article-info'),
-            lambda a: a.select_one('.published'),
-            lambda a: a.select_one('.posted-on'),
-            lambda a: a.select_one('.byline')
-        ]
-        
-        # Try each pattern
-        for pattern in date_patterns:
+        # Try the DATE_SELECTORS matches in order of preference
+        for selector, date_element in scan.selector_matches():
             try:
-                date_element = pattern(article)
-                if date_element:
-                    # First try to get datetime attribute
-                    if date_element.has_attr('datetime'):
-                        try:
-                            date = parser.parse(date_element['datetime'])
-                            return date
-                        except:
-                            pass
-                    
-                    # Try to parse the text content
-                    try:
-                        date = parser.parse(date_element.get_text().strip())
-                        return date
-                    except:
-                        date_text = date_element.get_text().strip()
-                        extracted_date = self.extract_date_from_text(date_text)
-                        if extracted_date:
-                            return extracted_date
+                date = self.date_from_element(date_element)
+                if date:
+                    self.profiles.record(blog_name, 'date', selector)
+                    return date
             except:
                 continue
         
-        # If we still don't have a date, look for text patterns in the article
-        if not date:
-            # Look for any element with text that might contain a date
-            for element in article.select('p, span, div, h1, h2, h3, h4, h5, h6'):
-                try:
-                    text = element.get_text().strip()
-                    if len(text) < 100:  # Avoid processing long paragraphs
-                        extracted_date = self.extract_date_from_text(text)
-                        if extracted_date:
-                            return extracted_date
-                except:
-                    continue
+        # If we still don't have a date, look for text patterns in short elements of the article
+        for text in scan.short_texts():
+            extracted_date = self.extract_date_from_text(text)
+            if extracted_date:
+                return extracted_date
         
         # If we can't find a date, return None
         return None
     
-    def is_current_or_previous_day(self, date):
-        """Check if the date is from today or yesterday"""
+    def window_first_day(self):
+        """First day of the date window"""
+        return self.since or self.today - timedelta(days=self.window_days - 1)
+    
+    def window_start(self, blog_name):
+        """Oldest post date reported for a blog: the first day of the window, or its high-water mark when that is older"""
+        mark = self.high_water.get(blog_name)
+        first_day = self.window_first_day()
+        if mark is not None and mark < first_day:
+            return mark
+        return first_day
+    
+    def date_window(self, blog_name):
+        """Key identifying the dates a set of extracted posts was filtered for"""
+        return [self.window_start(blog_name).strftime('%Y-%m-%d'), self.today.strftime('%Y-%m-%d')]
+    
+    def cached_posts(self, blog_name, url, response):
+        """Posts extracted last time from a page the server reported unchanged, or None"""
+        # Backfilling needs the page's pagination, which is not kept with the posts
+        if self.http_cache is None or self.backfill or not getattr(response, 'not_modified', False):
+            return None
+        return self.http_cache.cached_posts(url, self.date_window(blog_name))
+    
+    def remember_posts(self, blog_name, url, posts):
+        if self.http_cache is not None:
+            self.http_cache.store_posts(url, self.date_window(blog_name), posts)
+    
+    def is_wanted(self, date, blog_name):
+        """Check if a post date falls between the blog's window start and today"""
         if not date:
             return False
-        
-        # Convert to date only for comparison
         date_only = date.replace(hour=0, minute=0, second=0, microsecond=0)
-        
-        # For debugging
-        today_str = self.today.strftime('%Y-%m-%d')
-        yesterday_str = self.yesterday.strftime('%Y-%m-%d')
-        date_str = date_only.strftime('%Y-%m-%d')
-        
-        is_today = date_only == self.today
-        is_yesterday = date_only == self.yesterday
-        
-        return is_today or is_yesterday
+        return self.window_start(blog_name) <= date_only <= self.today
+    
+    def is_before_high_water(self, date, blog_name):
+        """Check if a post is older than the newest post an earlier run already reported for the blog"""
+        mark = self.high_water.get(blog_name)
+        return bool(date and mark) and date.replace(hour=0, minute=0, second=0, microsecond=0) < mark
+    
+    def profiled_selectors(self, blog_name, field, selectors):
+        """The selectors to try for a field, the blog's profiled one first"""
+        profiled = self.profiles.selector(blog_name, field) if blog_name else None
+        return [profiled] + selectors if profiled else selectors
     
-    def extract_title(self, article):
+    def extract_title(self, article, blog_name=None):
         """Extract the title of an article"""
         # Try different selectors for the title
-        for selector in ['h1', 'h2', 'h3', '.title', '.post-title', '.entry-title']:
+        for selector in self.profiled_selectors(blog_name, 'title', TITLE_SELECTORS):
             title_element = article.select_one(selector)
             if title_element:
+                if blog_name:
+                    self.profiles.record(blog_name, 'title', selector)
                 return title_element.get_text().strip()
         return "Unknown Title"
     
-    def extract_link(self, article, base_url):
+    def extract_link(self, article, base_url, blog_name=None):
         """Extract the full URL of an article"""
         # Try to find a link in the article or its title
-        link_selectors = [
-            # Look for a link in the title
-            lambda a: a.select_one('h1 a, h2 a, h3 a, .title a, .post-title a, .entry-title a'),
-            # Look for a "read more" link
-            lambda a: a.select_one('a.read-more, a.more-link, a.continue-reading'),
-            # Look for any link
-            lambda a: a.select_one('a')
-        ]
-        
-        for selector in link_selectors:
+        for selector in self.profiled_selectors(blog_name, 'link', LINK_SELECTORS):
             try:
-                link_element = selector(article)
+                link_element = article.select_one(selector)
                 if link_element and link_element.has_attr('href'):
                     link = link_element['href']
                     # Make sure it's an absolute URL
                     if not link.startswith(('http://', 'https://')):
                         link = urljoin(base_url, link)
+                    if blog_name:
+                        self.profiles.record(blog_name, 'link', selector)
                     return link
             except:
                 continue
@@ -305,236 +1888,994 @@ class BlogScraper:
         
         return None
     
-    def custom_process_microsoft(self, url):
-        """Custom processing for Microsoft Security Blog"""
-        blog_results = []
+    def make_soup(self, response, strain=False):
+        """Parse a page straight from its bytes, optionally keeping only the container regions"""
+        parse_only = CONTAINER_STRAINER if strain and self.strain_pages else None
+        charset = content_type_charset(response.headers.get('Content-Type'))
+        return BeautifulSoup(response.content, self.parser_backend, parse_only=parse_only, from_encoding=charset)
+    
+    def article_text(self, response):
+        """Visible text of an article page, the article element alone when there is one"""
+        soup = self.make_soup(response)
+        for element in soup(['script', 'style', 'noscript', 'template']):
+            element.decompose()
+        root = soup.find('article') or soup.find('main') or soup.body or soup
+        return root.get_text(' ')
+    
+    def find_article_containers(self, soup, blog_name):
+        """Find article containers in one selector pass, each exactly once and outermost first"""
+        selector = self.container_selectors.get(blog_name)
+        learned = None if selector else self.profiles.selector(blog_name, 'container')
+        matched = []
+        if selector:
+            matched = soup.select(selector)
+            candidates = len(matched)
+        elif learned:
+            # The one selector that matched every post of this blog last time
+            matched = soup.select(learned)
+            candidates = len(matched)
+        if not matched and not selector:
+            learned = None
+            matched = ARTICLE_SELECTOR.select(soup)
+            # What the selector-by-selector cascade used to collect, duplicates included
+            candidates = sum(1 for element in matched for compiled in COMPILED_ARTICLE_SELECTORS
+                             if compiled.match(element))
+        articles = collapse_nested_containers(matched)
+        
+        if learned and articles:
+            self.profiles.record(blog_name, 'container', learned)
+        elif articles and not selector:
+            # Learn the selector when a single one of the defaults finds all the posts
+            for default, compiled in zip(ARTICLE_SELECTORS, COMPILED_ARTICLE_SELECTORS):
+                if all(compiled.match(article) for article in articles):
+                    self.profiles.record(blog_name, 'container', default)
+                    break
         
+        # If we didn't find any articles with the selectors, try getting links and headers
+        if not articles:
+            parents = {}
+            # Get all potential heading elements that might be article titles
+            for header in soup.select('h1, h2, h3'):
+                # If the header is wrapped in a link or has a link inside
+                link = header.find('a') or header.parent.find('a')
+                if link:
+                    parents.setdefault(id(header.parent), header.parent)
+            articles = list(parents.values())
+            candidates = len(articles)
+        
+        self.debug_info.setdefault(blog_name, {"parsed_dates": []})["containers"] = {
+            "candidates": candidates,
+            "deduplicated": len(articles),
+        }
+        return articles
+    
+    def fetch_url(self, blog_name, url):
+        """The URL to download for a blog: its known feed in feed-first mode, its index page otherwise"""
+        if self.feed_first:
+            feed_url = self.feeds.feed_url(blog_name)
+            if feed_url:
+                return feed_url
+        return self.clean_url(url)
+    
+    def discover_feed(self, response, base_url):
+        """Find the RSS/Atom feed advertised by an index page with <link rel="alternate">"""
+        soup = BeautifulSoup(response.content, self.parser_backend, parse_only=SoupStrainer('link'))
+        for link in soup.find_all('link', href=True):
+            rel = link.get('rel') or []
+            if isinstance(rel, str):
+                rel = rel.split()
+            title = (link.get('title') or '').lower()
+            if ('alternate' in [r.lower() for r in rel] and link.get('type', '').lower() in FEED_TYPES
+                    and 'comment' not in title and '/comments/' not in link['href']):
+                return urljoin(base_url, link['href'])
+        return None
+    
+    def parse_feed(self, blog_name, response):
+        """Recent posts from a feed document, or None if it cannot be read"""
+        blog_results = []
+        started = time.perf_counter()
+        attempts = hits = 0
         try:
-            response = self.make_request(url)
-            if not response:
-                return []
+            for title, link, date in iter_feed_entries(response.content):
+                attempts += 1
+                hits += date is not None
+                if title and link and self.is_wanted(date, blog_name):
+                    blog_results.append({
+                        'Blog': blog_name,
+                        'Title': title,
+                        'Date': date.strftime('%Y-%m-%d'),
+                        'URL': urljoin(str(response.url), link)
+                    })
+        except ET.ParseError as e:
+            print(f"Error parsing feed for {blog_name}: {e}")
+            if not blog_results:
+                return None
+        finally:
+            self.metrics.add(blog_name, parse_seconds=time.perf_counter() - started,
+                             date_attempts=attempts, date_hits=hits)
+        return blog_results
+    
+    def process_feed(self, blog_name, url, response):
+        """Posts from the blog's feed, or None when the HTML index page has to be scraped instead"""
+        feed_url = self.feeds.feed_url(blog_name)
+        if not looks_like_feed(response):
+            if not self.feeds.needs_discovery(blog_name):
+                return None
+            feed_url = self.discover_feed(response, url)
+            if feed_url:
+                response = self.make_request(feed_url)
+                if not response or not looks_like_feed(response):
+                    feed_url = None
+            # Blogs without a usable feed are only checked again after FEED_REDISCOVERY_AGE
+            self.feeds.remember(blog_name, feed_url)
+            if not feed_url:
+                return None
+        
+        # An unchanged feed yields the same posts
+        blog_results = self.cached_posts(blog_name, feed_url, response)
+        if blog_results is None:
+            blog_results = self.parse_feed(blog_name, response)
+            if blog_results is None:
+                # Rediscover the feed next time rather than keep fetching a broken one
+                self.feeds.forget(blog_name)
+                return None
+            self.remember_posts(blog_name, feed_url, blog_results)
+        
+        processed = self.advance_progress()
+        print(f"Progress: [{processed}/{self.total_blogs}] - {blog_name} - Found {len(blog_results)} recent posts (feed)")
+        return blog_results
+    
+    def stream_sitemap(self, url):
+        """Yield (kind, loc, lastmod, title) for each entry of a sitemap while it downloads"""
+        headers = {'User-Agent': self.get_random_user_agent()}
+        response = self.scheduled_get(self.get_session(), url, headers)
+        with response:
+            response.raise_for_status()
+            pull_parser = ET.XMLPullParser(events=('start', 'end'))
+            root = None
+            inflate = None
+            for chunk in response.iter_content(SITEMAP_CHUNK_SIZE):
+                if inflate is None:
+                    # .xml.gz sitemaps are served as gzip files rather than gzip-encoded responses
+                    inflate = zlib.decompressobj(16 + zlib.MAX_WBITS) if chunk[:2] == b'\x1f\x8b' else False
+                pull_parser.feed(inflate.decompress(chunk) if inflate else chunk)
+                for event, element in pull_parser.read_events():
+                    if event == 'start':
+                        if root is None:
+                            root = element
+                        continue
+                    kind = element.tag.rsplit('}', 1)[-1]
+                    if kind not in ('url', 'sitemap'):
+                        continue
+                    fields = {child.tag.rsplit('}', 1)[-1]: (child.text or '').strip() for child in element}
+                    # Google News sitemaps carry the headline as news:title
+                    title = next((child.text.strip() for child in element.iter()
+                                  if child.tag.endswith('}title') and 'news' in child.tag and child.text), None)
+                    yield kind, fields.get('loc'), parse_feed_date(fields.get('lastmod')), title
+                    # Drop the entries already read so memory stays flat on huge sitemaps
+                    root.clear()
+            pull_parser.close()
+    
+    def process_sitemap(self, blog_name, url):
+        """Posts under the blog's index URL modified inside the date window, or None if the sitemap failed"""
+        index_url = self.clean_url(url)
+        prefix = urlparse(index_url)
+        blog_results = []
+        pending = [(self.sitemaps[blog_name], 0)]
+        fetched = 0
+        
+        while pending and fetched < SITEMAP_MAX_FILES:
+            sitemap_url, depth = pending.pop(0)
+            fetched += 1
+            try:
+                for kind, loc, lastmod, title in self.stream_sitemap(sitemap_url):
+                    if not loc:
+                        continue
+                    if kind == 'sitemap':
+                        # Child sitemaps last modified before the window cannot hold anything newer
+                        if depth < SITEMAP_MAX_DEPTH and (lastmod is None or lastmod >= self.window_start(blog_name)):
+                            pending.append((loc, depth + 1))
+                        continue
+                    
+                    post = urlparse(loc)
+                    if (post.netloc != prefix.netloc or not post.path.startswith(prefix.path)
+                            or post.path.rstrip('/') == prefix.path.rstrip('/')):
+                        continue
+                    if self.is_wanted(lastmod, blog_name):
+                        blog_results.append({
+                            'Blog': blog_name,
+                            'Title': title or title_from_url(loc),
+                            'Date': lastmod.strftime('%Y-%m-%d'),
+                            'URL': loc
+                        })
+            except (requests.exceptions.RequestException, ET.ParseError, zlib.error) as e:
+                print(f"Error reading sitemap {sitemap_url}: {e}")
+                if depth == 0:
+                    return None
+        
+        processed = self.advance_progress()
+        print(f"Progress: [{processed}/{self.total_blogs}] - {blog_name} - Found {len(blog_results)} recent posts (sitemap)")
+        return blog_results
+    
+    def parse_microsoft(self, url, response):
+        """Custom parsing for Microsoft Security Blog"""
+        blog_results = []
+        
+        soup = self.make_soup(response, strain=True)
+        
+        # Microsoft's blog posts are usually in article elements or divs with specific classes,
+        # with a second set of classes to try when none of those are found
+        articles = []
+        for selector in MICROSOFT_ARTICLE_SELECTORS:
+            articles = collapse_nested_containers(soup.select(selector))
+            if articles:
+                break
+        
+        hits = 0
+        window_start = self.window_start('Microsoft Security')
+        before_window = 0
+        for article in articles:
+            # Try to extract date
+            date = None
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # Look for date elements
+            date_elements = article.select('.blog-post-meta-date, time, .c-paragraph-4, .date, .posted-date')
+            for date_element in date_elements:
+                # Try to parse datetime attribute first, then the text content
+                date_text = date_element.get_text().strip()
+                if date_element.has_attr('datetime'):
+                    date = self.parse_date(date_element['datetime'])
+                else:
+                    date = self.parse_date(date_text)
+                if date:
+                    break
+                
+                # Try regex pattern matching
+                date = self.extract_date_from_text(date_text)
+                if date:
+                    break
             
-            # Microsoft's blog posts are usually in article elements or divs with specific classes
-            articles = soup.select('article, .blog-post, .m-post-card, .c-card')
+            # If we still don't have a date, look for dates in other elements
+            if not date:
+                for element in article.select('p, span, div'):
+                    text = element.get_text().strip()
+                    date = self.extract_date_from_text(text)
+                    if date:
+                        break
             
-            if not articles:
-                # Try another approach for Microsoft's blog
-                articles = soup.select('.blog-list-card, .card, .post')
+            hits += date is not None
+            if date:
+                before_window = before_window + 1 if date.replace(hour=0, minute=0, second=0, microsecond=0) < window_start else 0
             
-            for article in articles:
-                # Try to extract date
-                date = None
-                
-                # Look for date elements
-                date_elements = article.select('.blog-post-meta-date, time, .c-paragraph-4, .date, .posted-date')
-                for date_element in date_elements:
-                    try:
-                        # Try to parse datetime attribute first
-                        if date_element.has_attr('datetime'):
-                            date = parser.parse(date_element['datetime'])
-                            break
-                        
-                        # Try to parse text content
-                        date_text = date_element.get_text().strip()
-                        date = parser.parse(date_text)
+            # Check if date is inside the window
+            if self.is_wanted(date, 'Microsoft Security'):
+                # Extract title
+                title = None
+                title_elements = article.select('h1, h2, h3, .title, .post-title')
+                for title_element in title_elements:
+                    title_text = title_element.get_text().strip()
+                    if title_text:
+                        title = title_text
                         break
-                    except:
-                        # Try regex pattern matching
-                        date = self.extract_date_from_text(date_element.get_text().strip())
-                        if date:
-                            break
                 
-                # If we still don't have a date, look for dates in other elements
-                if not date:
-                    for element in article.select('p, span, div'):
-                        text = element.get_text().strip()
-                        date = self.extract_date_from_text(text)
-                        if date:
+                # Extract link
+                link = None
+                link_elements = article.select('a')
+                for link_element in link_elements:
+                    if link_element.has_attr('href'):
+                        href = link_element['href']
+                        if href and not href.startswith('#') and not href.startswith('javascript:'):
+                            if not href.startswith(('http://', 'https://')):
+                                link = urljoin(url, href)
+                            else:
+                                link = href
                             break
                 
-                # Check if date is today or yesterday
-                if self.is_current_or_previous_day(date):
-                    # Extract title
-                    title = None
-                    title_elements = article.select('h1, h2, h3, .title, .post-title')
-                    for title_element in title_elements:
-                        title_text = title_element.get_text().strip()
-                        if title_text:
-                            title = title_text
-                            break
-                    
-                    # Extract link
-                    link = None
-                    link_elements = article.select('a')
-                    for link_element in link_elements:
-                        if link_element.has_attr('href'):
-                            href = link_element['href']
-                            if href and not href.startswith('#') and not href.startswith('javascript:'):
-                                if not href.startswith(('http://', 'https://')):
-                                    link = urljoin(url, href)
-                                else:
-                                    link = href
-                                break
-                    
-                    if title and link:
-                        date_str = date.strftime('%Y-%m-%d') if date else "Unknown Date"
-                        blog_results.append({
-                            'Blog': 'Microsoft Security',
-                            'Title': title,
-                            'Date': date_str,
-                            'URL': link
-                        })
-            
+                if title and link:
+                    date_str = date.strftime('%Y-%m-%d') if date else "Unknown Date"
+                    blog_results.append({
+                        'Blog': 'Microsoft Security',
+                        'Title': title,
+                        'Date': date_str,
+                        'URL': link
+                    })
+        
+        self.metrics.add('Microsoft Security', candidate_containers=len(articles),
+                         date_attempts=len(articles), date_hits=hits)
+        self.record_listing('Microsoft Security', url, response,
+                            not hits or before_window >= min(hits, OLDER_POSTS_BEFORE_STOP))
+        return blog_results
+    
+    def process_blog(self, blog_name, url, response=None):
+        """Process a single blog URL, keeping only unseen posts in only-new mode"""
+        return self.new_posts(blog_name, self.scrape_blog(blog_name, url, response))
+    
+    def new_posts(self, blog_name, blog_results):
+        """The posts no earlier run has seen in only-new mode, all of them otherwise"""
+        if self.seen is not None and blog_results:
+            new_results = self.seen.record_new(blog_name, blog_results)
+            print(f"{blog_name}: {len(new_results)} of {len(blog_results)} posts not seen before")
+            blog_results = new_results
+        self.metrics.add(blog_name, results=len(blog_results))
+        return blog_results
+    
+    def scrape_blog(self, blog_name, url, response=None):
+        """Extract the recent posts of a blog, fetching its page unless it was already downloaded"""
+        try:
+            url, response, blog_results = self.fetch_blog(blog_name, url, response)
+            if blog_results is None:
+                started = time.perf_counter()
+                blog_results = self.parse_listing(blog_name, url, response)
+                self.metrics.add(blog_name, parse_seconds=time.perf_counter() - started)
+                self.finish_blog(blog_name, url, blog_results)
             return blog_results
             
         except Exception as e:
-            print(f"Error processing Microsoft Security Blog: {str(e)}")
+            self.blog_failed(blog_name, e)
             return []
     
-    def process_blog(self, blog_name, url):
-        """Process a single blog URL"""
-        blog_results = []
+    def fetch_blog(self, blog_name, url, response=None):
+        """The I/O half of processing a blog: (url, page, None) when a listing page is left to parse, (url, None, posts) otherwise"""
+        # Requests made from here on are counted against this blog
+        self._local.blog_name = blog_name
+        if blog_name in self.sitemaps:
+            sitemap_results = self.process_sitemap(blog_name, url)
+            if sitemap_results is not None:
+                return url, None, sitemap_results
         
-        try:
-            # Special case for Microsoft Security Blog
-            if blog_name == 'Microsoft Security':
-                return self.custom_process_microsoft(url)
-            
+        if self.feed_first:
+            if response is None:
+                response = self.make_request(self.fetch_url(blog_name, url))
+                if not response and self.feeds.feed_url(blog_name):
+                    # The known feed is gone, look for it again on the index page
+                    self.feeds.forget(blog_name)
+                    response = self.make_request(self.clean_url(url))
+            if response:
+                feed_results = self.process_feed(blog_name, self.clean_url(url), response)
+                if feed_results is not None:
+                    return url, None, feed_results
+                if looks_like_feed(response):
+                    # The feed was unusable, fall back to the index page
+                    response = None
+        
+        # The Microsoft Security Blog URL is used as configured
+        if blog_name != 'Microsoft Security':
             url = self.clean_url(url)
+        if response is None:
             response = self.make_request(url)
-            if not response:
-                return []
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Common article containers
-            article_selectors = [
-                'article', '.post', '.entry', '.blog-post', '.blog-entry',
-                '.article', '.news-item', '.card', '.content-item',
-                '.list-item', 'li.item', '.resource-item', '.col-md-4',
-                '.post-item', '.blog-item', '.m-post-card'
-            ]
-            
-            articles = []
-            for selector in article_selectors:
-                found = soup.select(selector)
-                if found:
-                    articles.extend(found)
-                    
-            # If we didn't find any articles with the selectors, try getting links and headers
-            if not articles:
-                # Get all potential heading elements that might be article titles
-                headers = soup.select('h1, h2, h3')
-                for header in headers:
-                    # If the header is wrapped in a link or has a link inside
-                    link = header.find('a') or header.parent.find('a')
-                    if link:
-                        articles.append(header.parent)
+        if not response:
+            return url, None, []
+        
+        # An unchanged page yields the same posts, so skip parsing it again
+        cached = self.cached_posts(blog_name, url, response)
+        if cached is not None:
+            processed = self.advance_progress()
+            print(f"Progress: [{processed}/{self.total_blogs}] - {blog_name} - Found {len(cached)} recent posts (unchanged)")
+            return url, None, cached
+        return url, response, None
+    
+    def parse_listing(self, blog_name, url, response):
+        """The CPU half of processing a blog: the recent posts found on its listing page"""
+        # Special case for Microsoft Security Blog
+        if blog_name == 'Microsoft Security':
+            return self.parse_microsoft(url, response)
+        
+        blog_results = []
+        
+        # A configured selector may point anywhere, so only the default selectors allow straining
+        strain = blog_name not in self.container_selectors
+        soup = self.make_soup(response, strain=strain)
+        articles = self.find_article_containers(soup, blog_name)
+        if not articles and strain and self.strain_pages:
+            # The heading fallback needs the parts of the page the strainer dropped
+            soup = self.make_soup(response)
+            articles = self.find_article_containers(soup, blog_name)
+        
+        # Process each article, newest first on a listing page
+        older = 0
+        attempts = hits = 0
+        window_start = self.window_start(blog_name)
+        before_window = 0
+        seen_before = False
+        for article in articles:
+            date = self.extract_date(article, blog_name, url)
+            attempts += 1
+            hits += date is not None
+            if date:
+                before_window = before_window + 1 if date.replace(hour=0, minute=0, second=0, microsecond=0) < window_start else 0
             
-            # Process each article
-            for article in articles:
-                date = self.extract_date(article, blog_name, url)
-                
-                # For debugging
-                if blog_name not in self.debug_info:
-                    self.debug_info[blog_name] = {"parsed_dates": []}
-                
-                if date:
-                    self.debug_info[blog_name]["parsed_dates"].append(
-                        f"{date.strftime('%Y-%m-%d')} - is_recent: {self.is_current_or_previous_day(date)}"
-                    )
-                
-                if self.is_current_or_previous_day(date):
-                    title = self.extract_title(article)
-                    link = self.extract_link(article, url)
-                    if link and title and title != "Unknown Title":
-                        # Format date string
-                        date_str = date.strftime('%Y-%m-%d') if date else "Unknown Date"
-                        blog_results.append({
-                            'Blog': blog_name,
-                            'Title': title,
-                            'Date': date_str,
-                            'URL': link
-                        })
+            # Everything past a run of posts older than the high-water mark was seen by an earlier run
+            if self.is_before_high_water(date, blog_name):
+                older += 1
+                if older >= OLDER_POSTS_BEFORE_STOP:
+                    seen_before = True
+                    break
+            elif date:
+                older = 0
             
-            # Update progress counter
-            self.processed_blogs += 1
-            print(f"Progress: [{self.processed_blogs}/{self.total_blogs}] - {blog_name} - Found {len(blog_results)} recent posts")
+            # For debugging
+            if blog_name not in self.debug_info:
+                self.debug_info[blog_name] = {"parsed_dates": []}
             
-            return blog_results
+            if date:
+                self.debug_info[blog_name]["parsed_dates"].append(
+                    f"{date.strftime('%Y-%m-%d')} - is_recent: {self.is_wanted(date, blog_name)}"
+                )
             
-        except Exception as e:
-            # Update progress counter even on error
-            self.processed_blogs += 1
-            print(f"Progress: [{self.processed_blogs}/{self.total_blogs}] - Error processing {blog_name}: {str(e)}")
-            return []
+            if self.is_wanted(date, blog_name):
+                title = self.extract_title(article, blog_name)
+                link = self.extract_link(article, url, blog_name)
+                if link and title and title != "Unknown Title":
+                    # Format date string
+                    date_str = date.strftime('%Y-%m-%d') if date else "Unknown Date"
+                    blog_results.append({
+                        'Blog': blog_name,
+                        'Title': title,
+                        'Date': date_str,
+                        'URL': link
+                    })
+        
+        self.metrics.add(blog_name, candidate_containers=self.debug_info[blog_name]["containers"]["candidates"],
+                         date_attempts=attempts, date_hits=hits)
+        # Older pages are of no use once this one ends in posts before the window, or has no dates to tell
+        self.record_listing(blog_name, url, response,
+                            seen_before or not hits or before_window >= min(hits, OLDER_POSTS_BEFORE_STOP))
+        return blog_results
+    
+    def record_listing(self, blog_name, url, response, past_window):
+        """Remember where a listing page leads in backfill mode, past_window meaning older pages are of no use"""
+        if self.backfill:
+            self.debug_info.setdefault(blog_name, {"parsed_dates": []})["listing"] = {
+                "past_window": past_window,
+                "next_page": find_next_page(response.text, url),
+                "digest": hashlib.sha1(response.content).hexdigest(),
+            }
+    
+    def finish_blog(self, blog_name, url, blog_results):
+        """Remember the posts parsed from a blog's page and report progress"""
+        self.remember_posts(blog_name, url, blog_results)
+        
+        # Update progress counter
+        processed = self.advance_progress()
+        containers = self.debug_info.get(blog_name, {}).get("containers")
+        if containers:
+            print(f"Progress: [{processed}/{self.total_blogs}] - {blog_name} - Found {len(blog_results)} recent posts "
+                  f"({containers['candidates']} candidate containers, {containers['deduplicated']} after deduplication)")
+        else:
+            print(f"Progress: [{processed}/{self.total_blogs}] - {blog_name} - Found {len(blog_results)} recent posts")
+    
+    def blog_failed(self, blog_name, error):
+        # Update progress counter even on error
+        processed = self.advance_progress()
+        print(f"Progress: [{processed}/{self.total_blogs}] - Error processing {blog_name}: {str(error)}")
     
     def scrape_all_blogs(self):
-        """Scrape all blogs using a thread pool"""
-        print(f"Starting scan of {self.total_blogs} security blogs for posts on {self.today.strftime('%Y-%m-%d')} and {self.yesterday.strftime('%Y-%m-%d')}...")
+        """Scrape all blogs with the asyncio fetcher, or the thread pool as a fallback"""
+        print(f"Starting scan of {self.total_blogs} security blogs for posts {self.window_label()}...")
         print("-" * 80)
         
-        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
+        if self.fetch_mode == 'async' and aiohttp is None:
+            print("aiohttp is not installed, falling back to the thread pool")
+        
+        self.scheduler.set_deadline(self.deadline)
+        if self.fetch_mode == 'pipeline':
+            self.scrape_all_blogs_pipeline()
+        elif self.fetch_mode == 'async' and aiohttp is not None:
+            asyncio.run(self.scrape_all_blogs_async())
+        else:
+            self.scrape_all_blogs_threaded()
+        
+        if self.backfill:
+            self.backfill_blogs()
+        
+        if self.dedupe and self.results:
+            found = len(self.results)
+            self.results, self.stories = cluster_stories(self.results)
+            print(f"{found - len(self.results)} duplicate posts dropped, "
+                  f"{len(self.stories)} stories covered by more than one blog")
+        
+        if self.extract_iocs and self.results:
+            print(f"Fetching {len(self.results)} articles for indicators of compromise...")
+            self.iocs = self.collect_iocs(self.results)
+        
+        self.profiles.save()
+        self.scheduler.save()
+        
+        return self.results
+    
+    def deadline_reached(self, blog_names):
+        """Report the blogs given up on when the run deadline passed"""
+        blog_names = sorted(blog_names)
+        if blog_names:
+            print(f"Run deadline of {self.deadline}s reached, returning partial results without: {', '.join(blog_names)}")
+    
+    def add_results(self, blog_results):
+        """Collect the posts of one blog and pass them on to the sink"""
+        self.results.extend(blog_results)
+        if self.sink is not None and blog_results:
+            self.sink.write(blog_results)
+    
+    def backfill_blogs(self):
+        """Read the listing pages after the first of every blog whose first page did not go back to the window start"""
+        listings = {blog_name: info["listing"] for blog_name, info in self.debug_info.items()
+                    if info.get("listing") and info["listing"]["next_page"] and not info["listing"]["past_window"]}
+        if not listings:
+            return
+        print(f"Backfilling {len(listings)} blogs back to {self.window_first_day().strftime('%Y-%m-%d')}...")
+        # The same post can be listed on two pages, for one because new posts pushed it down
+        known = {canonical_url(post['URL']) for post in self.results}
+        blog_pool = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers)
+        # Kept apart from the blog threads, which wait on the pages they requested
+        page_pool = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            future_to_blog = {blog_pool.submit(self.backfill_blog, blog_name, listing, page_pool): blog_name
+                              for blog_name, listing in listings.items()}
+            for future in concurrent.futures.as_completed(future_to_blog, timeout=self.scheduler.remaining()):
+                blog_name = future_to_blog[future]
+                try:
+                    blog_results = []
+                    for post in future.result():
+                        key = canonical_url(post['URL'])
+                        if key not in known:
+                            known.add(key)
+                            blog_results.append(post)
+                    if blog_results:
+                        self.add_results(self.new_posts(blog_name, blog_results))
+                except Exception as e:
+                    print(f"Error backfilling {blog_name}: {str(e)}")
+        except concurrent.futures.TimeoutError:
+            self.deadline_reached(blog_name for future, blog_name in future_to_blog.items() if not future.done())
+        finally:
+            blog_pool.shutdown(wait=False, cancel_futures=True)
+            page_pool.shutdown(wait=False, cancel_futures=True)
+    
+    def backfill_blog(self, blog_name, listing, page_pool):
+        """The posts on a blog's listing pages after the first, parsed in order until one is past the window start
+        
+        Numbered pages are requested BACKFILL_LOOKAHEAD ahead of the one being parsed, the host's rate limit
+        spacing the requests out; pages only reachable through the previous one's link are fetched one by one.
+        """
+        next_url = listing["next_page"]
+        template = page_url_template(next_url)
+        number = 2
+        digests = {listing["digest"]}
+        visited = set()
+        pending = collections.deque()
+        blog_results = []
+        pages = 0
+        try:
+            while pages < BACKFILL_MAX_PAGES:
+                while template and len(pending) < BACKFILL_LOOKAHEAD and number <= BACKFILL_MAX_PAGES + 1:
+                    pending.append(page_pool.submit(self.fetch_listing_page, blog_name, f"{template[0]}{number}{template[1]}"))
+                    number += 1
+                if not pending:
+                    if template or not next_url or next_url in visited:
+                        break
+                    visited.add(next_url)
+                    pending.append(page_pool.submit(self.fetch_listing_page, blog_name, next_url))
+                page_url, response = pending.popleft().result()
+                if not response:
+                    break
+                # A listing ignoring the page number serves its first page again
+                digest = hashlib.sha1(response.content).hexdigest()
+                if digest in digests:
+                    break
+                digests.add(digest)
+                pages += 1
+                started = time.perf_counter()
+                blog_results.extend(self.parse_listing(blog_name, page_url, response))
+                self.metrics.add(blog_name, parse_seconds=time.perf_counter() - started)
+                listing = self.debug_info[blog_name]["listing"]
+                if listing["past_window"]:
+                    break
+                next_url = listing["next_page"]
+        finally:
+            # Pages requested past the last one needed are dropped, those already downloading are wasted
+            for future in pending:
+                future.cancel()
+        self.metrics.add(blog_name, backfill_pages=pages)
+        print(f"{blog_name}: {pages} older listing pages, {len(blog_results)} more posts")
+        return blog_results
+    
+    def fetch_listing_page(self, blog_name, url):
+        """(url, response) of a listing page past the first, fetched on a page pool thread"""
+        # Requests made from here on are counted against this blog
+        self._local.blog_name = blog_name
+        return url, self.make_request(url)
+    
+    def collect_iocs(self, posts):
+        """Fetch the articles of posts on the worker threads, returning {post URL: {type: [indicators]}}"""
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return dict(zip([post['URL'] for post in posts], executor.map(self.article_iocs, posts)))
+    
+    def article_iocs(self, post):
+        """The indicators in the article a post links to, {} if it could not be fetched"""
+        # The article is counted against the blog, but is no listing page to stop early on
+        self._local.blog_name = post['Blog']
+        response = self.make_request(post['URL'], listing=False)
+        if not response:
+            return {}
+        iocs = extract_iocs(self.article_text(response))
+        self.metrics.add(post['Blog'], ioc_pages=1, iocs=sum(len(values) for values in iocs.values()))
+        return iocs
+    
+    def scrape_all_blogs_threaded(self):
+        """Scrape all blogs using a thread pool"""
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
             future_to_blog = {
                 executor.submit(self.process_blog, blog_name, url): (blog_name, url)
                 for blog_name, url in BLOG_URLS.items()
             }
             
-            for future in concurrent.futures.as_completed(future_to_blog):
+            for future in concurrent.futures.as_completed(future_to_blog, timeout=self.scheduler.remaining()):
                 blog_name, url = future_to_blog[future]
                 try:
                     blog_results = future.result()
                     if blog_results:
-                        self.results.extend(blog_results)
+                        self.add_results(blog_results)
+                except Exception as e:
+                    print(f"Error processing {blog_name}: {str(e)}")
+        except concurrent.futures.TimeoutError:
+            self.deadline_reached(blog_name for future, (blog_name, _) in future_to_blog.items() if not future.done())
+        finally:
+            # Stragglers are left to finish on their own, their requests time out by the deadline anyway
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        return self.results
+    
+    def parse_settings(self):
+        """What a parse process needs to parse listing pages the way this scraper would"""
+        return {
+            'cache_dir': self.cache_dir,
+            'container_selectors': self.container_selectors,
+            'parser_backend': self.parser_backend,
+            'strain_pages': self.strain_pages,
+            'profiles': self.profiles.overrides,
+            'today': self.today,
+            'window_days': self.window_days,
+            'since': self.since,
+            'backfill': self.backfill,
+            'high_water': self.high_water,
+        }
+    
+    def scrape_all_blogs_pipeline(self):
+        """Download pages on threads and parse them in a process pool, with bounded queues between the stages"""
+        depth = self.parse_processes * PIPELINE_QUEUE_DEPTH
+        pages = queue.Queue(maxsize=depth)
+        in_flight = threading.BoundedSemaphore(depth)
+        done = queue.Queue()
+        
+        def fetch_stage(blog_name, url):
+            try:
+                url, response, blog_results = self.fetch_blog(blog_name, url)
+                if response is not None:
+                    # Only the plain page data is sent to the parse processes
+                    page = FetchedPage(str(response.url), response.status_code, CaseInsensitiveDict(response.headers),
+                                       response.content, response.encoding)
+            except Exception as e:
+                self.blog_failed(blog_name, e)
+                response, blog_results = None, []
+            if response is None:
+                done.put((blog_name, url, blog_results, None))
+                return
+            # Blocks while the parse processes are behind, so downloaded pages do not pile up
+            while not stopped.is_set():
+                try:
+                    pages.put((blog_name, url, page), timeout=PIPELINE_POLL_INTERVAL)
+                    return
+                except queue.Full:
+                    continue
+        
+        def parse_stage(parse_pool):
+            while not stopped.is_set():
+                try:
+                    item = pages.get(timeout=PIPELINE_POLL_INTERVAL)
+                except queue.Empty:
+                    continue
+                if item is None:
+                    return
+                blog_name, url, page = item
+                while not in_flight.acquire(timeout=PIPELINE_POLL_INTERVAL):
+                    if stopped.is_set():
+                        return
+                try:
+                    job = parse_pool.submit(parse_page_in_worker, blog_name, url, page)
+                except Exception as e:
+                    in_flight.release()
+                    self.blog_failed(blog_name, e)
+                    done.put((blog_name, url, [], None))
+                    continue
+                job.add_done_callback(functools.partial(parsed, blog_name, url))
+        
+        def parsed(blog_name, url, job):
+            in_flight.release()
+            done.put((blog_name, url, None, job))
+        
+        stopped = threading.Event()
+        parse_pool = concurrent.futures.ProcessPoolExecutor(max_workers=self.parse_processes, initializer=init_parse_worker,
+                                                            initargs=(self.parse_settings(),))
+        fetch_pool = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers)
+        dispatcher = threading.Thread(target=parse_stage, args=(parse_pool,), daemon=True)
+        dispatcher.start()
+        try:
+            for blog_name, url in BLOG_URLS.items():
+                fetch_pool.submit(fetch_stage, blog_name, url)
+            
+            pending = set(BLOG_URLS)
+            while pending:
+                try:
+                    blog_name, url, blog_results, job = done.get(timeout=self.scheduler.remaining())
+                except queue.Empty:
+                    self.deadline_reached(pending)
+                    break
+                pending.discard(blog_name)
+                if job is not None:
+                    try:
+                        blog_results, self.debug_info[blog_name], metrics, hits = job.result()
+                        self.metrics.add(blog_name, **metrics)
+                        self.profiles.merge_hits(blog_name, hits)
+                        self.finish_blog(blog_name, url, blog_results)
+                    except Exception as e:
+                        self.blog_failed(blog_name, e)
+                        continue
+                try:
+                    self.add_results(self.new_posts(blog_name, blog_results))
+                except Exception as e:
+                    print(f"Error processing {blog_name}: {str(e)}")
+        finally:
+            stopped.set()
+            try:
+                pages.put_nowait(None)
+            except queue.Full:
+                pass
+            dispatcher.join()
+            # Past the deadline nothing still queued or running is waited for
+            fetch_pool.shutdown(wait=False, cancel_futures=True)
+            parse_pool.shutdown(wait=not self.scheduler.expired(), cancel_futures=True)
+        
+        return self.results
+    
+    def record_async_fetch(self, blog_name, timings, size):
+        """Add the timings stamped by the trace hooks for one request to the blog's metrics"""
+        finished = time.perf_counter()
+        headers = timings.get('headers', finished)
+        values = {'requests': 1, 'ttfb_seconds': headers - timings['start'],
+                  'download_seconds': finished - headers, 'bytes': size}
+        if 'dns_end' in timings:
+            values['dns_seconds'] = timings['dns_end'] - timings['dns_start']
+        if 'connect_end' in timings:
+            # Host name resolution happens while the connection is being created
+            values['connect_seconds'] = timings['connect_end'] - timings['connect_start'] - values.get('dns_seconds', 0)
+        self.metrics.add(blog_name, **values)
+    
+    async def fetch_page_async(self, session, url, global_limit, host_limits, blog_name=None):
+        """Fetch a page on the event loop, honouring the concurrency limits and retry policy"""
+        headers = {'User-Agent': self.get_random_user_agent(), 'Accept-Encoding': ACCEPT_ENCODING}
+        entry = self.http_cache.load(url) if self.http_cache else None
+        if entry:
+            if self.http_cache.is_fresh(entry):
+                page = self.http_cache.cached_page(url, entry)
+                if page:
+                    return page
+            headers.update(self.http_cache.conditional_headers(entry))
+        
+        host = urlparse(url).netloc
+        for attempt in range(RETRY_TOTAL + 1):
+            retry_after = None
+            # Wait for the host's rate limit before taking any slot
+            if not await self.scheduler.acquire_async(host):
+                print(f"Error fetching {url}: run deadline reached")
+                return None
+            read_timeout = self.scheduler.timeout(host)
+            timeout = aiohttp.ClientTimeout(total=self.scheduler.remaining(), sock_read=read_timeout,
+                                            sock_connect=min(CONNECT_TIMEOUT, read_timeout))
+            # Take the host slot first so a busy host never sits on a global slot while it waits
+            async with host_limits[host], global_limit:
+                try:
+                    timings = {'start': time.perf_counter()}
+                    async with session.get(url, headers=headers, timeout=timeout, trace_request_ctx=timings) as response:
+                        self.scheduler.observe(host, timings.get('headers', time.perf_counter()) - timings['start'],
+                                               response.status, response.headers.get('Retry-After'))
+                        page = None
+                        if response.status == 304 or (response.status in RETRY_STATUSES and attempt < RETRY_TOTAL):
+                            self.record_async_fetch(blog_name, timings, 0)
+                        if response.status == 304 and entry:
+                            page = self.http_cache.cached_page(url, entry)
+                        if page:
+                            return page
+                        if response.status == 304:
+                            # The body was evicted in the meantime, so ask for the full page again
+                            entry = None
+                            headers = {k: v for k, v in headers.items() if not k.startswith('If-')}
+                        elif response.status in RETRY_STATUSES and attempt < RETRY_TOTAL:
+                            retry_after = response.headers.get('Retry-After')
+                        else:
+                            response.raise_for_status()
+                            body = self.body_buffer(url, response.headers.get('Content-Type'), blog_name)
+                            async for chunk in response.content.iter_chunked(BODY_CHUNK_SIZE):
+                                if body.add(chunk):
+                                    break
+                            self.record_async_fetch(blog_name, timings, body.size)
+                            self.metrics.add(blog_name, truncated_bodies=int(body.truncated))
+                            page = FetchedPage(str(response.url), response.status, CaseInsensitiveDict(response.headers),
+                                               body.content, response.charset, truncated=body.truncated)
+                            if self.http_cache and not page.truncated:
+                                self.http_cache.store(url, page)
+                            return page
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    self.scheduler.failed(host, read_timeout)
+                    if attempt == RETRY_TOTAL:
+                        print(f"Error fetching {url}: {e}")
+                        return None
+                except aiohttp.ClientError as e:
+                    print(f"Error fetching {url}: {e}")
+                    return None
+            # Back off outside the limits so other requests can use the slots meanwhile
+            delay = retry_delay(attempt, retry_after)
+            remaining = self.scheduler.remaining()
+            if remaining is not None and delay >= remaining:
+                print(f"Error fetching {url}: run deadline reached")
+                return None
+            await asyncio.sleep(delay)
+        return None
+    
+    async def fetch_blog_async(self, session, blog_name, url, global_limit, host_limits):
+        index_url = self.clean_url(url)
+        fetch_url = self.fetch_url(blog_name, url)
+        response = await self.fetch_page_async(session, fetch_url, global_limit, host_limits, blog_name)
+        if response is None and fetch_url != index_url:
+            # The known feed is gone, look for it again on the index page
+            self.feeds.forget(blog_name)
+            response = await self.fetch_page_async(session, index_url, global_limit, host_limits, blog_name)
+        return blog_name, index_url, response
+    
+    async def scrape_all_blogs_async(self):
+        """Fetch all blogs concurrently and parse each page as soon as it arrives"""
+        global_limit = asyncio.Semaphore(self.max_concurrency)
+        host_limits = collections.defaultdict(lambda: asyncio.Semaphore(self.per_host_limit))
+        timeout = aiohttp.ClientTimeout(sock_connect=CONNECT_TIMEOUT, sock_read=READ_TIMEOUT)
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency, limit_per_host=self.per_host_limit)
+        loop = asyncio.get_running_loop()
+        
+        # Parsing is CPU bound, so it runs off the event loop to keep the other downloads moving
+        parse_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        try:
+            parse_jobs = {}
+            async with aiohttp.ClientSession(timeout=timeout, connector=connector,
+                                             trace_configs=[build_trace_config()]) as session:
+                fetches = []
+                for blog_name, url in BLOG_URLS.items():
+                    if blog_name in self.sitemaps:
+                        # Sitemaps are streamed by process_blog itself, on a thread of the default executor
+                        parse_jobs[loop.run_in_executor(None, self.process_blog, blog_name, url)] = blog_name
+                    else:
+                        fetches.append(asyncio.create_task(
+                            self.fetch_blog_async(session, blog_name, url, global_limit, host_limits)))
+                fetched = set()
+                try:
+                    for fetch in asyncio.as_completed(fetches, timeout=self.scheduler.remaining()):
+                        blog_name, url, response = await fetch
+                        fetched.add(blog_name)
+                        if response is None:
+                            continue
+                        job = loop.run_in_executor(parse_pool, self.process_blog, blog_name, url, response)
+                        parse_jobs[job] = blog_name
+                except asyncio.TimeoutError:
+                    # Cancel the downloads still running so the partial results come back on time
+                    for fetch in fetches:
+                        fetch.cancel()
+                    self.deadline_reached(set(BLOG_URLS) - fetched - set(parse_jobs.values()))
+            
+            if parse_jobs:
+                finished, unfinished = await asyncio.wait(parse_jobs, timeout=self.scheduler.remaining())
+                self.deadline_reached(parse_jobs[job] for job in unfinished)
+            for job, blog_name in parse_jobs.items():
+                if not job.done():
+                    continue
+                try:
+                    blog_results = job.result()
+                    if blog_results:
+                        self.add_results(blog_results)
                 except Exception as e:
                     print(f"Error processing {blog_name}: {str(e)}")
+        finally:
+            # Past the deadline, parse jobs still running are not waited for
+            parse_pool.shutdown(wait=not self.scheduler.expired(), cancel_futures=True)
         
         return self.results
     
+    def report_filename(self, output_format):
+        """Name of a results file, stamped with the dates scanned and the current time"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        today_str = self.today.strftime('%Y-%m-%d')
+        first_day_str = self.window_first_day().strftime('%Y-%m-%d')
+        return f"security_blog_posts_{today_str}_and_{first_day_str}_{timestamp}.{RESULT_EXTENSIONS[output_format]}"
+    
+    def window_label(self):
+        """The days scanned, in words"""
+        first_day = self.window_first_day()
+        if first_day == self.yesterday:
+            return f"on {self.today.strftime('%Y-%m-%d')} and {self.yesterday.strftime('%Y-%m-%d')}"
+        return f"from {first_day.strftime('%Y-%m-%d')} to {self.today.strftime('%Y-%m-%d')}"
+    
+    def story_order(self, posts):
+        """Posts in report order, with the posts of other blogs telling the same story right after the first one
+        
+        Yields (post, others): others lists the rest of the post's story, or is None for a post listed under another.
+        """
+        order = {id(post): index for index, post in enumerate(sorted_posts(self.results))}
+        others = {}
+        for story in self.stories:
+            story = sorted(story, key=lambda post: order[id(post)])
+            others[id(story[0])] = story[1:]
+            others.update((id(post), None) for post in story[1:])
+        for post in posts:
+            rest = others.get(id(post), [])
+            if rest is not None:
+                yield post, rest
+                for other in rest:
+                    yield other, None
+    
     def save_results(self, output_format='csv'):
         """Save the results to a file"""
         if not self.results:
             print("No results to save.")
             return None
-            
-        df = pd.DataFrame(self.results)
         
-        # Sort by date (newest first) and then by blog name
-        df = df.sort_values(['Date', 'Blog'], ascending=[False, True])
-        
-        # Create timestamp and date strings for filenames
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = self.report_filename(output_format)
         today_str = self.today.strftime('%Y-%m-%d')
-        yesterday_str = self.yesterday.strftime('%Y-%m-%d')
+        first_day_str = self.window_first_day().strftime('%Y-%m-%d')
         
-        if output_format == 'csv':
-            filename = f"security_blog_posts_{today_str}_and_{yesterday_str}_{timestamp}.csv"
-            df.to_csv(filename, index=False)
+        # Group by date (newest first) and then by blog name in one pass
+        groups = group_posts(self.results)
+        
+        if output_format in SINK_FORMATS:
+            try:
+                sink = ResultSink(filename, output_format)
+            except ImportError:
+                print("Parquet output needs pyarrow (pip install pyarrow)")
+                return None
+            sink.write(post for post, _ in self.story_order(sorted_posts(self.results)))
+            sink.close()
         elif output_format == 'html':
-            filename = f"security_blog_posts_{today_str}_and_{yesterday_str}_{timestamp}.html"
-            df.to_html(filename, index=False)
+            with open(filename, 'w', encoding='utf-8') as f:
+                f.write('<table border="1" class="dataframe">\n  <thead>\n    <tr style="text-align: right;">\n')
+                for field in RESULT_FIELDS:
+                    f.write(f"      <th>{field}</th>\n")
+                f.write("    </tr>\n  </thead>\n  <tbody>\n")
+                for post, _ in self.story_order(sorted_posts(self.results)):
+                    f.write("    <tr>\n")
+                    for field in RESULT_FIELDS:
+                        f.write(f"      <td>{html.escape(post[field])}</td>\n")
+                    f.write("    </tr>\n")
+                f.write("  </tbody>\n</table>")
         elif output_format == 'markdown':
-            filename = f"security_blog_posts_{today_str}_and_{yesterday_str}_{timestamp}.md"
-            with open(filename, 'w') as f:
+            with open(filename, 'w', encoding='utf-8') as f:
                 f.write("# Recent Cybersecurity Blog Posts\n\n")
                 f.write(f"Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-                f.write(f"Posts from: {yesterday_str} to {today_str}\n\n")
+                f.write(f"Posts from: {first_day_str} to {today_str}\n\n")
                 
-                # Group by date
-                for date in sorted(df['Date'].unique(), reverse=True):
+                for date, blogs in groups:
+                    # Posts of a story are listed under the blog that has it first
+                    blogs = [(blog, [(post, others) for post, others in self.story_order(blog_posts) if others is not None])
+                             for blog, blog_posts in blogs]
+                    blogs = [(blog, blog_posts) for blog, blog_posts in blogs if blog_posts]
+                    if not blogs:
+                        continue
                     f.write(f"## Posts from {date}\n\n")
-                    date_posts = df[df['Date'] == date]
                     
-                    # Group by blog
-                    for blog in sorted(date_posts['Blog'].unique()):
+                    for blog, blog_posts in blogs:
                         f.write(f"### {blog}\n\n")
-                        blog_posts = date_posts[date_posts['Blog'] == blog]
                         
-                        for _, row in blog_posts.iterrows():
-                            f.write(f"**{row['Title']}**\n\n")
-                            f.write(f"[Read more]({row['URL']})\n\n")
+                        for post, others in blog_posts:
+                            f.write(f"**{post['Title']}**\n\n")
+                            f.write(f"[Read more]({post['URL']})\n\n")
+                            if others:
+                                f.write("Also covered by:\n\n")
+                                for other in others:
+                                    f.write(f"- {other['Blog']}: [{other['Title']}]({other['URL']})\n")
+                                f.write("\n")
                         
                         f.write("\n")
                     
@@ -543,70 +2884,440 @@ class BlogScraper:
         print(f"Results saved to {filename}")
         return filename
     
+    def save_iocs(self, path):
+        """Write one CSV row per indicator found in the articles, returning the number of rows"""
+        rows = 0
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=IOC_FIELDS)
+            writer.writeheader()
+            for post in sorted_posts(self.results):
+                for kind, values in self.iocs.get(post['URL'], {}).items():
+                    for value in values:
+                        writer.writerow({'Blog': post['Blog'], 'URL': post['URL'], 'Type': kind, 'Indicator': value})
+                        rows += 1
+        return rows
+    
     def display_results(self):
         """Display the results in the terminal"""
         if not self.results:
-            print("\nNo blog posts found from today or yesterday.")
+            print(f"\nNo blog posts found {self.window_label()}.")
             return False
-            
-        df = pd.DataFrame(self.results)
         
         # Sort by date (newest first) and then by blog name
-        df = df.sort_values(['Date', 'Blog'], ascending=[False, True])
+        posts = sorted_posts(self.results)
         
         print("\n" + "="*80)
-        print(f"FOUND {len(df)} BLOG POSTS PUBLISHED ON {self.today.strftime('%Y-%m-%d')} OR {self.yesterday.strftime('%Y-%m-%d')}")
+        print(f"FOUND {len(posts)} BLOG POSTS PUBLISHED {self.window_label().upper().replace(' AND ', ' OR ')}")
         print("="*80)
         
         # Count posts by date
-        date_counts = df['Date'].value_counts().to_dict()
+        date_counts = collections.Counter(post['Date'] for post in posts)
         today_str = self.today.strftime('%Y-%m-%d')
         yesterday_str = self.yesterday.strftime('%Y-%m-%d')
         
         today_count = date_counts.get(today_str, 0)
         yesterday_count = date_counts.get(yesterday_str, 0)
-        unknown_count = len(df) - today_count - yesterday_count
+        first_day_str = self.window_first_day().strftime('%Y-%m-%d')
+        earlier_count = sum(count for date, count in date_counts.items() if first_day_str <= date < yesterday_str)
+        unknown_count = len(posts) - today_count - yesterday_count - earlier_count
         
         print(f"Posts from today ({today_str}): {today_count}")
         print(f"Posts from yesterday ({yesterday_str}): {yesterday_count}")
+        if earlier_count > 0:
+            print(f"Posts from earlier days ({first_day_str} onwards): {earlier_count}")
         if unknown_count > 0:
             print(f"Posts with unknown/other date: {unknown_count}")
         print("-"*80)
         
         # Count posts by source
-        blog_counts = df['Blog'].value_counts()
+        blog_counts = collections.Counter(post['Blog'] for post in posts)
         print("\nPosts by source:")
-        for blog, count in blog_counts.items():
+        for blog, count in blog_counts.most_common():
             print(f"- {blog}: {count}")
         
+        if self.stories:
+            print(f"\nStories covered by more than one blog: {len(self.stories)}")
+        
         print("\nDETAILED RESULTS:")
         print("-"*80)
         
-        for idx, row in df.iterrows():
-            print(f"\n{idx+1}. {row['Title']}")
-            print(f"   Blog: {row['Blog']}")
-            print(f"   Date: {row['Date']}")
-            print(f"   URL:  {row['URL']}")
+        stories = [(post, others) for post, others in self.story_order(posts) if others is not None]
+        for idx, (post, others) in enumerate(stories):
+            print(f"\n{idx+1}. {post['Title']}")
+            print(f"   Blog: {post['Blog']}")
+            print(f"   Date: {post['Date']}")
+            print(f"   URL:  {post['URL']}")
+            iocs = self.iocs.get(post['URL'])
+            if iocs:
+                print(f"   IOCs: {', '.join(f'{len(values)} {kind}' for kind, values in iocs.items())}")
+            for other in others:
+                print(f"   Also: {other['Blog']} ({other['Date']}) - {other['Title']}")
+                print(f"         {other['URL']}")
             print("-"*80)
         
         return True
 
+# The scraper each parse process of the pipeline parses pages with
+_parse_scraper = None
+
+def init_parse_worker(settings):
+    global _parse_scraper
+    _parse_scraper = BlogScraper(fetch_mode='threads', cache_dir=settings['cache_dir'], use_cache=False,
+                                 container_selectors=settings['container_selectors'],
+                                 parser_backend=settings['parser_backend'], strain_pages=settings['strain_pages'],
+                                 profiles=settings['profiles'], days=settings['window_days'],
+                                 since=settings['since'], backfill=settings['backfill'])
+    _parse_scraper.today = settings['today']
+    _parse_scraper.yesterday = settings['today'] - timedelta(days=1)
+    _parse_scraper.high_water = settings['high_water']
+
+def parse_page_in_worker(blog_name, url, page):
+    """Parse a listing page in a pipeline parse process, returning its posts, debug info, metrics and profile hits"""
+    _parse_scraper.debug_info.pop(blog_name, None)
+    started = time.perf_counter()
+    blog_results = _parse_scraper.parse_listing(blog_name, url, page)
+    _parse_scraper.metrics.add(blog_name, parse_seconds=time.perf_counter() - started)
+    return (blog_results, _parse_scraper.debug_info.get(blog_name, {"parsed_dates": []}),
+            _parse_scraper.metrics.pop(blog_name), _parse_scraper.profiles.pop_hits(blog_name))
+
+# Service mode settings
+SERVICE_PORT = 8787
+SERVICE_REFRESH_INTERVAL = 30 * 60
+# Posts older than this are dropped from the service's index
+SERVICE_RETENTION_DAYS = 14
+
+class ResultIndex:
+    """Posts found by the service, indexed by date and blog"""
+    def __init__(self, retention_days=SERVICE_RETENTION_DAYS):
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+        # date -> blog -> canonical URL -> post
+        self.posts = {}
+        # The keys of posts, oldest first
+        self.dates = []
+    
+    def update(self, blog_name, posts, today):
+        """Add a blog's latest posts, replacing earlier copies, and drop posts past the retention period"""
+        cutoff = (today - timedelta(days=self.retention_days)).strftime('%Y-%m-%d')
+        with self._lock:
+            for post in posts:
+                date = post['Date']
+                if date not in self.posts:
+                    bisect.insort(self.dates, date)
+                    self.posts[date] = {}
+                self.posts[date].setdefault(blog_name, {})[canonical_url(post['URL'])] = post
+            while self.dates and self.dates[0] < cutoff:
+                del self.posts[self.dates.pop(0)]
+    
+    def query(self, since=None, blogs=None, limit=None):
+        """Posts dated since (YYYY-MM-DD) or later, of the given blogs only if any, newest first then by blog name"""
+        with self._lock:
+            start = bisect.bisect_left(self.dates, since) if since else 0
+            posts = []
+            for date in reversed(self.dates[start:]):
+                by_blog = self.posts[date]
+                for blog_name in sorted(by_blog.keys() & blogs if blogs else by_blog):
+                    posts.extend(by_blog[blog_name].values())
+                if limit and len(posts) >= limit:
+                    break
+        return posts[:limit] if limit else posts
+    
+    def counts(self):
+        """Number of posts held for each blog"""
+        counts = collections.Counter()
+        with self._lock:
+            for by_blog in self.posts.values():
+                for blog_name, posts in by_blog.items():
+                    counts[blog_name] += len(posts)
+        return counts
+
+class ScrapeService:
+    """Keep a scraper resident, refreshing each blog on its own schedule and answering queries on a local port"""
+    def __init__(self, scraper, port=SERVICE_PORT, interval=SERVICE_REFRESH_INTERVAL, intervals=None,
+                 retention_days=SERVICE_RETENTION_DAYS):
+        self.scraper = scraper
+        # Seconds between two refreshes of each blog
+        self.intervals = {blog_name: (intervals or {}).get(blog_name, interval) for blog_name in BLOG_URLS}
+        self.index = ResultIndex(retention_days)
+        self.status = {}
+        self.stopped = threading.Event()
+        self._wakeup = threading.Condition()
+        # (monotonic time, blog) of each blog waiting for its next refresh
+        self._due = [(time.monotonic(), blog_name) for blog_name in BLOG_URLS]
+        heapq.heapify(self._due)
+        service = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                params = parse_qs(url.query)
+                try:
+                    if url.path == '/posts':
+                        body = service.posts_response(params)
+                    elif url.path == '/blogs':
+                        body = service.blogs_response()
+                    elif url.path == '/metrics':
+                        self.respond(200, service.scraper.metrics.to_prometheus(), 'text/plain; version=0.0.4')
+                        return
+                    else:
+                        self.respond(404, json.dumps({'error': f"unknown path {url.path}"}))
+                        return
+                except ValueError as e:
+                    self.respond(400, json.dumps({'error': str(e)}))
+                    return
+                self.respond(200, json.dumps(body))
+            
+            def respond(self, status, body, content_type='application/json'):
+                body = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        # Only local tools are meant to query the service
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self.httpd.daemon_threads = True
+    
+    def posts_response(self, params):
+        """Answer /posts?since=YYYY-MM-DD&blog=NAME&limit=N, where blog may be repeated"""
+        since = params.get('since', [None])[0]
+        if since:
+            try:
+                since = datetime.fromisoformat(since).strftime('%Y-%m-%d')
+            except ValueError:
+                raise ValueError(f"since must be an ISO date, not {since!r}")
+        limit = params.get('limit', [None])[0]
+        if limit:
+            if not limit.isdigit():
+                raise ValueError(f"limit must be a number, not {limit!r}")
+            limit = int(limit)
+        posts = self.index.query(since, set(params.get('blog', [])), limit)
+        return {'count': len(posts), 'posts': posts}
+    
+    def blogs_response(self):
+        """Answer /blogs with the refresh status and post count of every blog"""
+        counts = self.index.counts()
+        return {blog_name: dict(self.status.get(blog_name, {}), posts=counts[blog_name],
+                                interval=self.intervals[blog_name])
+                for blog_name in BLOG_URLS}
+    
+    def refresh(self, blog_name):
+        """Scrape one blog again and put its posts in the index, then schedule its next refresh"""
+        try:
+            self.scraper.refresh_dates()
+            # Debug output is kept per run, and a service run never ends
+            self.scraper.debug_info.pop(blog_name, None)
+            started = time.perf_counter()
+            posts = self.scraper.process_blog(blog_name, BLOG_URLS[blog_name])
+            if self.scraper.sink is not None and posts:
+                self.scraper.sink.write(posts)
+            if self.scraper.extract_iocs:
+                # Blogs are refreshed in parallel already, so one blog's articles are fetched in turn
+                posts = [dict(post, IOCs=self.scraper.article_iocs(post)) for post in posts]
+            self.index.update(blog_name, posts, self.scraper.today)
+            if self.scraper.seen is not None:
+                # The next refresh only reports what is newer than this one did, as a new run would
+                mark = self.scraper.seen.high_water_marks().get(blog_name)
+                if mark is not None:
+                    self.scraper.high_water[blog_name] = mark
+            # Other blogs may still be refreshing, their counts are saved when they finish
+            self.scraper.profiles.save(blog_name)
+            self.scraper.scheduler.save()
+            self.status[blog_name] = {
+                'refreshed': datetime.now().isoformat(timespec='seconds'),
+                'seconds': round(time.perf_counter() - started, 3),
+                'found': len(posts),
+            }
+        except Exception as e:
+            print(f"Error refreshing {blog_name}: {str(e)}")
+        finally:
+            with self._wakeup:
+                heapq.heappush(self._due, (time.monotonic() + self.intervals[blog_name], blog_name))
+                self._wakeup.notify()
+    
+    def run_schedule(self):
+        """Hand every blog to the worker threads whenever it is due, until stopped"""
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.scraper.max_workers)
+        try:
+            while True:
+                with self._wakeup:
+                    while not self.stopped.is_set():
+                        wait = self._due[0][0] - time.monotonic() if self._due else None
+                        if wait is not None and wait <= 0:
+                            break
+                        self._wakeup.wait(wait)
+                    if self.stopped.is_set():
+                        return
+                    # A blog is only scheduled again once its refresh is over, so refreshes never overlap
+                    _, blog_name = heapq.heappop(self._due)
+                executor.submit(self.refresh, blog_name)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def serve_forever(self):
+        """Refresh and answer queries until interrupted"""
+        host, port = self.httpd.server_address[:2]
+        print(f"Serving posts of {len(BLOG_URLS)} blogs at http://{host}:{port}/posts, /blogs and /metrics")
+        scheduler = threading.Thread(target=self.run_schedule, daemon=True)
+        scheduler.start()
+        try:
+            self.httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+    
+    def stop(self):
+        self.stopped.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        self.httpd.server_close()
+
+def parse_args(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Scan cybersecurity blogs for posts from today and yesterday")
+    arg_parser.add_argument('--fetch-mode', choices=['async', 'threads', 'pipeline'], default='async',
+                        help="asyncio fetcher (needs aiohttp), the thread pool fallback, "
+                             "or fetch threads feeding a pool of parse processes")
+    arg_parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help="maximum number of requests in flight (async mode)")
+    arg_parser.add_argument('--per-host', type=int, default=DEFAULT_PER_HOST_LIMIT,
+                        help="maximum number of requests in flight per host (async mode)")
+    arg_parser.add_argument('--workers', type=int, default=DEFAULT_MAX_WORKERS,
+                        help="number of worker threads (threads and pipeline modes)")
+    arg_parser.add_argument('--parse-processes', type=int, default=DEFAULT_PARSE_PROCESSES,
+                        help="number of parse processes (pipeline mode)")
+    arg_parser.add_argument('--container-selector', action='append', default=[], metavar='BLOG=SELECTOR',
+                        help="CSS selector for the article containers of one blog (repeatable)")
+    arg_parser.add_argument('--parser', choices=['lxml', 'html.parser'], default=DEFAULT_PARSER,
+                        help="BeautifulSoup parser backend (lxml when installed)")
+    arg_parser.add_argument('--full-parse', action='store_true',
+                        help="build the whole document tree instead of only the article regions")
+    arg_parser.add_argument('--feed-first', action='store_true',
+                        help="read posts from RSS/Atom feeds, scraping HTML only for blogs without one")
+    arg_parser.add_argument('--sitemaps', action='store_true',
+                        help="discover posts of the SITEMAP_URLS blogs from their sitemaps")
+    arg_parser.add_argument('--sitemap', action='append', default=[], metavar='BLOG=URL',
+                        help="sitemap to use for one more blog in --sitemaps mode (repeatable)")
+    arg_parser.add_argument('--only-new', action='store_true',
+                        help="report only posts no earlier run has seen, catching up on days missed since the last run")
+    arg_parser.add_argument('--sink', choices=SINK_FORMATS,
+                        help="write each post to a file of this format as soon as it is found")
+    arg_parser.add_argument('--sink-path',
+                        help="file for --sink (default: a timestamped security_blog_posts_* file)")
+    arg_parser.add_argument('--metrics-json', metavar='PATH',
+                        help="write per-blog fetch and parse metrics to a JSON file")
+    arg_parser.add_argument('--metrics-prom', metavar='PATH',
+                        help="write per-blog metrics in the Prometheus text format (e.g. for the node exporter textfile collector)")
+    arg_parser.add_argument('--profile-config', metavar='PATH',
+                        help="JSON file of {blog: {container|date|title|link: selector}} to use instead of the learned profiles")
+    arg_parser.add_argument('--deadline', type=float, default=None, metavar='SECONDS',
+                        help="return the posts found so far once the scan has run this long")
+    arg_parser.add_argument('--max-body-size', type=int, default=MAX_BODY_BYTES // (1024 * 1024), metavar='MB',
+                        help="stop reading a response body past this many MB")
+    arg_parser.add_argument('--early-stop', action='store_true',
+                        help="stop downloading a listing page once it shows posts older than the date window")
+    arg_parser.add_argument('--iocs', metavar='PATH',
+                        help="fetch the article of every post found and write the IPs, domains, URLs, hashes, "
+                             "CVE and ATT&CK IDs in it to this CSV file (--serve adds them to /posts instead)")
+    arg_parser.add_argument('--days', type=int, default=DEFAULT_WINDOW_DAYS,
+                        help="report posts from this many days, counting today")
+    arg_parser.add_argument('--since', metavar='YYYY-MM-DD',
+                        help="report posts from this day on (instead of --days)")
+    arg_parser.add_argument('--backfill', action='store_true',
+                        help="follow each listing's pagination (next/older posts links, ?page=N, /page/N/) "
+                             "until a page is older than the date window, e.g. to catch up after an outage")
+    arg_parser.add_argument('--dedupe', action='store_true',
+                        help="drop posts reached through several URLs (tracking parameters, AMP copies) and list "
+                             "the posts of other blogs covering the same story under the first one")
+    arg_parser.add_argument('--save', choices=list(RESULT_EXTENSIONS),
+                        help="save the results in this format without asking (for cron)")
+    arg_parser.add_argument('--serve', action='store_true',
+                        help="keep running, refreshing each blog on the worker threads on its own schedule "
+                             "and answering queries on http://127.0.0.1:PORT")
+    arg_parser.add_argument('--port', type=int, default=SERVICE_PORT,
+                        help="port of the query API in --serve mode")
+    arg_parser.add_argument('--refresh-interval', type=int, default=SERVICE_REFRESH_INTERVAL, metavar='SECONDS',
+                        help="seconds between two refreshes of a blog in --serve mode")
+    arg_parser.add_argument('--refresh', action='append', default=[], metavar='BLOG=SECONDS',
+                        help="refresh interval of one blog in --serve mode (repeatable)")
+    arg_parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help="directory for the HTTP cache and other state kept between runs")
+    arg_parser.add_argument('--no-cache', action='store_true',
+                        help="always download and parse every page in full")
+    arg_parser.add_argument('--cache-size', type=int, default=HTTP_CACHE_MAX_BYTES // (1024 * 1024),
+                        help="maximum size of the HTTP cache in MB")
+    arg_parser.add_argument('--cache-max-age', type=int, default=None,
+                        help="reuse cached pages younger than this many seconds without revalidating")
+    return arg_parser.parse_args(argv)
+
 def main():
+    args = parse_args()
+    profiles = None
+    if args.profile_config:
+        with open(args.profile_config) as f:
+            profiles = json.load(f)
+    
     print("\nCybersecurity Blog Post Scanner")
     print("=" * 40)
     
-    scraper = BlogScraper()
-    scraper.scrape_all_blogs()
+    scraper = BlogScraper(fetch_mode=args.fetch_mode, max_concurrency=args.concurrency,
+                          per_host_limit=args.per_host, max_workers=args.workers,
+                          cache_dir=args.cache_dir, use_cache=not args.no_cache,
+                          cache_max_bytes=args.cache_size * 1024 * 1024, cache_max_age=args.cache_max_age,
+                          container_selectors=dict(item.split('=', 1) for item in args.container_selector),
+                          parser_backend=args.parser, strain_pages=not args.full_parse,
+                          feed_first=args.feed_first, use_sitemaps=args.sitemaps,
+                          sitemaps=dict(item.split('=', 1) for item in args.sitemap), only_new=args.only_new,
+                          parse_processes=args.parse_processes, profiles=profiles, deadline=args.deadline,
+                          max_body_bytes=args.max_body_size * 1024 * 1024, early_stop=args.early_stop,
+                          extract_iocs=bool(args.iocs), dedupe=args.dedupe, days=args.days,
+                          since=datetime.strptime(args.since, '%Y-%m-%d') if args.since else None,
+                          backfill=args.backfill)
+    if args.sink:
+        try:
+            scraper.sink = ResultSink(args.sink_path or scraper.report_filename(args.sink), args.sink)
+        except ImportError:
+            print("Parquet output needs pyarrow (pip install pyarrow)")
+            return
+    
+    try:
+        if args.serve:
+            intervals = {blog_name: int(seconds) for blog_name, seconds in (item.split('=', 1) for item in args.refresh)}
+            ScrapeService(scraper, args.port, args.refresh_interval, intervals).serve_forever()
+            return
+        scraper.scrape_all_blogs()
+    finally:
+        if scraper.sink is not None:
+            scraper.sink.close()
+            print(f"{scraper.sink.count} posts written to {os.path.abspath(scraper.sink.path)}")
+    
+    if args.iocs:
+        rows = scraper.save_iocs(args.iocs)
+        print(f"{rows} indicators written to {os.path.abspath(args.iocs)}")
+    if args.metrics_json:
+        write_file_atomic(args.metrics_json, scraper.metrics.to_json())
+    if args.metrics_prom:
+        write_file_atomic(args.metrics_prom, scraper.metrics.to_prometheus())
     
     # Display only positive hits
     has_results = scraper.display_results()
     
-    # Ask user if they want to save results
-    if has_results:
+    if args.save:
+        filename = scraper.save_results(args.save)
+        if filename:
+            print(f"\nResults saved to {os.path.abspath(filename)}")
+        return
+    
+    # Ask user if they want to save results, unless nobody is there to answer
+    if has_results and sys.stdin.isatty():
         save = input("\nDo you want to save these results? (y/n): ").lower()
         if save == 'y':
-            format_choice = input("Choose format (csv, html, markdown): ").lower()
-            if format_choice in ['csv', 'html', 'markdown']:
+            format_choice = input("Choose format (csv, html, markdown, jsonl, parquet): ").lower()
+            if format_choice in RESULT_EXTENSIONS:
                 filename = scraper.save_results(format_choice)
                 if filename:
                     print(f"\nResults saved to {os.path.abspath(filename)}")
@@ -615,7 +3326,7 @@ def main():
                 filename = scraper.save_results('csv')
                 if filename:
                     print(f"\nResults saved to {os.path.abspath(filename)}")
-    else:
+    elif not has_results:
         print("\nNo results to save.")
 
 if __name__ == "__main__":
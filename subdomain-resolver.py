@@ -0,0 +1,819 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+import collections
+import csv
+import html
+import json
+import mmap
+import os
+import random
+import re
+import socket
+import ssl
+import string
+import struct
+import sys
+import tempfile
+import time
+
+# Query settings
+DEFAULT_CONCURRENCY = 1000
+# Queries per second sent to each resolver, and how many may go out at once after a pause
+DEFAULT_RATE = 500
+RATE_BURST = 50
+QUERY_TIMEOUT = 2.0
+# Retransmissions after a timeout, each to the next resolver
+QUERY_RETRIES = 3
+MAX_CNAME_DEPTH = 8
+DNS_PORT = 53
+# UDP payload size advertised with EDNS0, small enough not to be fragmented
+EDNS_PAYLOAD = 1232
+SOCKET_BUFFER = 4 * 1024 * 1024
+RESOLV_CONF = '/etc/resolv.conf'
+FALLBACK_RESOLVERS = ['1.1.1.1', '8.8.8.8']
+
+# Random names looked up under a zone to tell whether it answers for any name
+WILDCARD_PROBES = 3
+WILDCARD_LABEL_LENGTH = 16
+# Seconds between two saves of the position reached in the wordlist
+CHECKPOINT_INTERVAL = 10
+
+# HTTP probing of the active subdomains
+PROBE_CONCURRENCY = 200
+PROBE_PORTS = [('https', 443), ('http', 80)]
+# Longest and shortest wait for a connection or response; in between, a multiple of the usual response time
+PROBE_TIMEOUT = 5.0
+PROBE_MIN_TIMEOUT = 1.0
+PROBE_TIMEOUT_FACTOR = 4
+# Open connections kept per address and port for the next host served from it
+PROBE_IDLE_CONNECTIONS = 4
+# Bytes of a page read to find its title, the connection is dropped if the page is longer
+PROBE_BODY_BYTES = 64 * 1024
+PROBE_TITLE_LENGTH = 120
+PROBE_USER_AGENT = 'Mozilla/5.0 (compatible; subdomain-resolver)'
+TITLE_PATTERN = re.compile(rb'<title[^>]*>(.*?)</title', re.I | re.S)
+
+# Wire format constants
+TYPE_A = 1
+TYPE_CNAME = 5
+TYPE_AAAA = 28
+TYPE_OPT = 41
+CLASS_IN = 1
+FLAG_QR = 0x8000
+FLAG_TC = 0x0200
+FLAG_RD = 0x0100
+RCODE_NOERROR = 0
+RCODE_SERVFAIL = 2
+RCODE_NXDOMAIN = 3
+RCODE_REFUSED = 5
+
+def encode_name(name):
+    """A domain name in wire format, uncompressed"""
+    wire = bytearray()
+    for label in name.rstrip('.').split('.'):
+        raw = label.encode('idna')
+        if not 0 < len(raw) < 64:
+            raise ValueError(f"Invalid label in {name!r}")
+        wire.append(len(raw))
+        wire += raw
+    wire.append(0)
+    return bytes(wire)
+
+def build_query(query_id, name, qtype):
+    """A recursive query for one name and type, with an EDNS0 record allowing larger UDP answers"""
+    header = struct.pack('!HHHHHH', query_id, FLAG_RD, 1, 0, 0, 1)
+    question = encode_name(name) + struct.pack('!HH', qtype, CLASS_IN)
+    # OPT pseudo-record: root owner, the payload size in the class field, no extended flags or options
+    opt = b'\0' + struct.pack('!HHIH', TYPE_OPT, EDNS_PAYLOAD, 0, 0)
+    return header + question + opt
+
+def read_name(message, offset):
+    """(name, offset past it) of the possibly compressed name at offset"""
+    labels = []
+    end = None
+    for _ in range(128):
+        length = message[offset]
+        if length & 0xC0 == 0xC0:
+            # A pointer to the rest of the name earlier in the message
+            if end is None:
+                end = offset + 2
+            offset = (length & 0x3F) << 8 | message[offset + 1]
+            continue
+        if length & 0xC0:
+            raise ValueError(f"Unknown label type at {offset}")
+        offset += 1
+        if not length:
+            return '.'.join(labels), end if end is not None else offset
+        if offset + length > len(message):
+            raise ValueError("Name runs past the end of the message")
+        labels.append(message[offset:offset + length].decode('ascii', 'replace').lower())
+        offset += length
+    raise ValueError("Too many labels or a compression loop")
+
+def read_question(message):
+    """(name, type) asked in a message, and the offset past the question section"""
+    name, offset = read_name(message, 12)
+    qtype, = struct.unpack_from('!H', message, offset)
+    return (name, qtype), offset + 4
+
+def parse_response(message):
+    """(rcode, answers) of a response, answers being (owner, type, value) for its A, AAAA and CNAME records
+    
+    Raises ValueError or struct.error on a malformed message.
+    """
+    flags, qdcount, ancount = struct.unpack_from('!HHH', message, 2)
+    offset = 12
+    for _ in range(qdcount):
+        _, offset = read_name(message, offset)
+        offset += 4
+    answers = []
+    for _ in range(ancount):
+        owner, offset = read_name(message, offset)
+        rtype, rclass, _, length = struct.unpack_from('!HHIH', message, offset)
+        offset += 10
+        if offset + length > len(message):
+            raise ValueError("Record runs past the end of the message")
+        data = message[offset:offset + length]
+        value = None
+        if rclass != CLASS_IN:
+            pass
+        elif rtype == TYPE_A and length == 4:
+            value = socket.inet_ntop(socket.AF_INET, data)
+        elif rtype == TYPE_AAAA and length == 16:
+            value = socket.inet_ntop(socket.AF_INET6, data)
+        elif rtype == TYPE_CNAME:
+            value = read_name(message, offset)[0]
+        if value is not None:
+            answers.append((owner, rtype, value))
+        offset += length
+    return flags & 0xF, answers
+
+def parse_resolver(text):
+    """(host, port) of a resolver given as IP, IP:PORT or [IPv6]:PORT"""
+    if text.startswith('['):
+        host, _, port = text[1:].partition(']:')
+        return host.rstrip(']'), int(port or DNS_PORT)
+    if text.count(':') == 1:
+        host, port = text.split(':')
+        return host, int(port)
+    return text, DNS_PORT
+
+def system_resolvers(path=RESOLV_CONF):
+    """The nameservers of resolv.conf, or public ones when it lists none"""
+    resolvers = []
+    try:
+        with open(path) as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) >= 2 and fields[0] == 'nameserver':
+                    # Scoped IPv6 addresses cannot be used as they are
+                    resolvers.append(fields[1].split('%')[0])
+    except OSError:
+        pass
+    return resolvers or FALLBACK_RESOLVERS
+
+class TokenBucket:
+    """Spaces out the queries to one resolver to a rate per second, letting a burst through after a pause"""
+    def __init__(self, rate, burst=RATE_BURST):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+    
+    async def acquire(self):
+        if not self.rate:
+            return
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        # Take the token before sleeping so queries waiting at the same time queue up one interval apart
+        self.tokens -= 1
+        if self.tokens < 0:
+            await asyncio.sleep(-self.tokens / self.rate)
+
+class ResolverConnection(asyncio.DatagramProtocol):
+    """Queries to one resolver over a shared UDP socket, responses matched to them by ID and question"""
+    def __init__(self, address, rate):
+        self.address = address
+        self.bucket = TokenBucket(rate)
+        self.transport = None
+        # query ID -> (question, future)
+        self.pending = {}
+    
+    def connection_made(self, transport):
+        self.transport = transport
+        # Answers to thousands of queries in flight arrive in bursts the default buffer drops
+        try:
+            transport.get_extra_info('socket').setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER)
+        except OSError:
+            pass
+    
+    def datagram_received(self, data, addr):
+        if len(data) < 12:
+            return
+        query_id, flags = struct.unpack_from('!HH', data)
+        waiting = self.pending.get(query_id)
+        if waiting is None or not flags & FLAG_QR:
+            return
+        try:
+            question, _ = read_question(data)
+        except (ValueError, IndexError, struct.error):
+            return
+        # A late answer to a query whose ID was reused, or a forged one, asks a different question
+        if question == waiting[0] and not waiting[1].done():
+            waiting[1].set_result(data)
+    
+    def error_received(self, exc):
+        # ICMP errors cannot be tied to a query, which times out and is sent again
+        pass
+    
+    def new_id(self):
+        while True:
+            query_id = random.getrandbits(16)
+            if query_id not in self.pending:
+                return query_id
+    
+    async def query(self, name, qtype, timeout):
+        """The raw response to a question over UDP, raising asyncio.TimeoutError when none comes in time"""
+        await self.bucket.acquire()
+        query_id = self.new_id()
+        future = asyncio.get_running_loop().create_future()
+        self.pending[query_id] = ((name, qtype), future)
+        try:
+            self.transport.sendto(build_query(query_id, name, qtype))
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            del self.pending[query_id]
+    
+    async def query_tcp(self, name, qtype, timeout):
+        """The raw response to a question over TCP, for answers too large for UDP"""
+        await self.bucket.acquire()
+        message = build_query(random.getrandbits(16), name, qtype)
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(*self.address), timeout)
+        try:
+            writer.write(struct.pack('!H', len(message)) + message)
+            length, = struct.unpack('!H', await asyncio.wait_for(reader.readexactly(2), timeout))
+            return await asyncio.wait_for(reader.readexactly(length), timeout)
+        finally:
+            writer.close()
+
+class SubdomainResolver:
+    """Resolve many names at once, keeping up to concurrency of them in flight across the resolvers"""
+    def __init__(self, resolvers, concurrency=DEFAULT_CONCURRENCY, rate=DEFAULT_RATE, timeout=QUERY_TIMEOUT,
+                 retries=QUERY_RETRIES, record_types=(TYPE_A,), filter_wildcards=True):
+        self.resolver_addresses = [parse_resolver(resolver) for resolver in resolvers]
+        self.concurrency = concurrency
+        self.rate = rate
+        self.timeout = timeout
+        self.retries = retries
+        self.record_types = record_types
+        # Drop answers matching what random names under the same zone resolve to
+        self.filter_wildcards = filter_wildcards
+        # parent zone -> task finding the addresses and CNAMEs its wildcard records give
+        self.wildcards = {}
+        self.connections = []
+        self._next = 0
+        self.stats = dict.fromkeys(['queries', 'timeouts', 'tcp', 'errors', 'resolved', 'inactive', 'wildcard',
+                                    'failed'], 0)
+    
+    async def open(self):
+        loop = asyncio.get_running_loop()
+        for address in self.resolver_addresses:
+            _, connection = await loop.create_datagram_endpoint(
+                lambda address=address: ResolverConnection(address, self.rate), remote_addr=address)
+            self.connections.append(connection)
+    
+    def close(self):
+        for connection in self.connections:
+            connection.transport.close()
+        self.connections = []
+    
+    async def query(self, name, qtype):
+        """(rcode, answers) for a question, retransmitting to the next resolver on timeouts and errors; None if all fail"""
+        first = self._next
+        self._next = (self._next + 1) % len(self.connections)
+        for attempt in range(self.retries + 1):
+            connection = self.connections[(first + attempt) % len(self.connections)]
+            self.stats['queries'] += 1
+            try:
+                message = await connection.query(name, qtype, self.timeout)
+                if struct.unpack_from('!H', message, 2)[0] & FLAG_TC:
+                    # The answer did not fit in a datagram, ask again over TCP
+                    self.stats['tcp'] += 1
+                    message = await connection.query_tcp(name, qtype, self.timeout)
+                rcode, answers = parse_response(message)
+            except asyncio.TimeoutError:
+                self.stats['timeouts'] += 1
+                continue
+            except (OSError, EOFError, ValueError, IndexError, struct.error):
+                self.stats['errors'] += 1
+                continue
+            if rcode in (RCODE_SERVFAIL, RCODE_REFUSED):
+                self.stats['errors'] += 1
+                continue
+            return rcode, answers
+        return None
+    
+    async def resolve(self, fqdn):
+        """(addresses, cnames) of a name, following CNAME chains the answers leave unresolved; None when no resolver answered"""
+        try:
+            fqdn = fqdn.encode('idna').decode('ascii').lower().rstrip('.')
+        except UnicodeError:
+            # Empty or overlong labels cannot be asked for
+            self.stats['failed'] += 1
+            return None
+        addresses, cnames = [], []
+        answered = False
+        for qtype in self.record_types:
+            name = fqdn
+            for _ in range(MAX_CNAME_DEPTH):
+                result = await self.query(name, qtype)
+                if result is None:
+                    break
+                answered = True
+                rcode, answers = result
+                aliases = {owner: value for owner, rtype, value in answers if rtype == TYPE_CNAME}
+                target = name
+                while target in aliases and len(cnames) < MAX_CNAME_DEPTH:
+                    target = aliases.pop(target)
+                    if target not in cnames:
+                        cnames.append(target)
+                found = [value for owner, rtype, value in answers if rtype == qtype and owner == target]
+                addresses.extend(value for value in found if value not in addresses)
+                if found or rcode != RCODE_NOERROR or target == name:
+                    break
+                # The chain ends at a name the answer holds no address for
+                name = target
+        if not answered:
+            self.stats['failed'] += 1
+            return None
+        return addresses, cnames
+    
+    async def wildcard_answers(self, parent):
+        """(addresses, cnames) random names under parent resolve to, both empty when it has no wildcard records"""
+        task = self.wildcards.get(parent)
+        if task is None:
+            # Every name of the zone waits for the same probes
+            task = self.wildcards[parent] = asyncio.ensure_future(self.probe_wildcard(parent))
+        return await task
+    
+    async def probe_wildcard(self, parent):
+        labels = [''.join(random.choices(string.ascii_lowercase + string.digits, k=WILDCARD_LABEL_LENGTH))
+                  for _ in range(WILDCARD_PROBES)]
+        addresses, cnames = set(), set()
+        for result in await asyncio.gather(*(self.resolve(f"{label}.{parent}") for label in labels)):
+            if result:
+                addresses.update(result[0])
+                cnames.update(result[1])
+        if addresses:
+            print(f"Wildcard DNS detected for *.{parent} ({', '.join(sorted(addresses))}), leaving out names answered the same")
+        return addresses, cnames
+    
+    async def is_wildcard(self, name, addresses, cnames):
+        """Check whether a name only resolves through a wildcard record of its parent zone"""
+        parent = name.lower().rstrip('.').split('.', 1)[-1]
+        wildcard_addresses, wildcard_cnames = await self.wildcard_answers(parent)
+        if cnames and cnames[-1] in wildcard_cnames:
+            return True
+        return bool(wildcard_addresses) and set(addresses) <= wildcard_addresses
+    
+    async def resolve_subdomain(self, name):
+        """resolve(name), reporting no addresses for a name its zone's wildcard answers"""
+        result = await self.resolve(name)
+        if result is None:
+            return None
+        addresses, cnames = result
+        if addresses and self.filter_wildcards and await self.is_wildcard(name, addresses, cnames):
+            self.stats['wildcard'] += 1
+            return [], cnames
+        self.stats['resolved' if addresses else 'inactive'] += 1
+        return result
+    
+    async def resolve_all(self, names, on_result):
+        """Resolve every name of an iterable, calling on_result(name, result) as each one completes
+        
+        When on_result returns an awaitable, the worker waits for it before taking the next name.
+        """
+        names = iter(names)
+        
+        async def worker():
+            # Workers pull the next name themselves, so the wordlist is read as fast as it is resolved
+            for name in names:
+                outcome = on_result(name, await self.resolve_subdomain(name))
+                if outcome is not None:
+                    await outcome
+        
+        await self.open()
+        try:
+            await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        finally:
+            self.close()
+
+def page_title(body):
+    """The whitespace-collapsed <title> of an HTML page, '' if it has none"""
+    match = TITLE_PATTERN.search(body)
+    if not match:
+        return ''
+    title = ' '.join(html.unescape(match.group(1).decode('utf-8', 'replace')).split())
+    return title[:PROBE_TITLE_LENGTH]
+
+class HttpProber:
+    """Request the front page of resolved hosts over HTTPS then HTTP, reusing the connections to each address
+    
+    The names probed are all under one domain, so those sharing an address are mostly behind the same
+    front end and can share its connections, TLS ones included. A server refusing a name on a TLS
+    connection opened for another one answers 421, the request is then made on a connection of its own.
+    Certificates are not checked: the point is whether something answers, not whether it can be trusted.
+    """
+    def __init__(self, concurrency=PROBE_CONCURRENCY, timeout=PROBE_TIMEOUT, ports=PROBE_PORTS):
+        self.semaphore = asyncio.BoundedSemaphore(concurrency)
+        self.timeout = timeout
+        self.ports = ports
+        self.max_idle = PROBE_IDLE_CONNECTIONS
+        # (address, port) -> [(reader, writer)] of idle keep-alive connections
+        self.idle = {}
+        # address -> smoothed seconds per response
+        self.latency = {}
+        self.tasks = set()
+        self.ssl_context = ssl.create_default_context()
+        self.ssl_context.check_hostname = False
+        self.ssl_context.verify_mode = ssl.CERT_NONE
+        self.stats = dict.fromkeys(['probes', 'responses', 'connections', 'reused', 'timeouts', 'errors'], 0)
+    
+    def request_timeout(self, address):
+        latency = self.latency.get(address)
+        # Until an address has answered, how fast other addresses are says nothing about it
+        if latency is None:
+            return self.timeout
+        return min(max(latency * PROBE_TIMEOUT_FACTOR, PROBE_MIN_TIMEOUT), self.timeout)
+    
+    def observe(self, address, seconds):
+        previous = self.latency.get(address)
+        self.latency[address] = seconds if previous is None else previous * 0.8 + seconds * 0.2
+    
+    async def submit(self, name, address, on_probe):
+        """Probe a host in the background, calling on_probe(name, address, result) when done
+        
+        Waits while concurrency probes are already running, which holds back whoever feeds the prober.
+        """
+        await self.semaphore.acquire()
+        task = asyncio.ensure_future(self._probe_and_report(name, address, on_probe))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+    
+    async def _probe_and_report(self, name, address, on_probe):
+        try:
+            result = await self.probe(name, address)
+        except Exception:
+            self.stats['errors'] += 1
+            result = None
+        finally:
+            self.semaphore.release()
+        on_probe(name, address, result)
+    
+    async def join(self):
+        """Wait for every submitted probe, then close the idle connections"""
+        while self.tasks:
+            await asyncio.gather(*self.tasks)
+        self.close()
+    
+    def close(self):
+        for connections in self.idle.values():
+            for _, writer in connections:
+                writer.close()
+        self.idle.clear()
+    
+    async def probe(self, name, address):
+        """{url, status, title, server, ms} of the first scheme a host answers on, None if it answers on none"""
+        for scheme, port in self.ports:
+            result = await self.fetch(name, address, scheme, port)
+            if result is not None:
+                return result
+        return None
+    
+    async def fetch(self, name, address, scheme, port):
+        tls = scheme == 'https'
+        key = (address, port)
+        timeout = self.request_timeout(address)
+        self.stats['probes'] += 1
+        started = time.monotonic()
+        fresh = False
+        # An idle connection may have been closed by the server meanwhile, the request is then made on a new one
+        for _ in range(2):
+            idle = None if fresh else self.idle.get(key)
+            connection = idle.pop() if idle else None
+            reused = connection is not None
+            try:
+                if connection is None:
+                    connection = await asyncio.wait_for(asyncio.open_connection(
+                        address, port, ssl=self.ssl_context if tls else None,
+                        server_hostname=name if tls else None), timeout)
+                    self.stats['connections'] += 1
+                status, headers, body, keep_alive = await asyncio.wait_for(self.exchange(connection, name), timeout)
+            except asyncio.TimeoutError:
+                if connection is not None:
+                    connection[1].close()
+                self.stats['timeouts'] += 1
+                return None
+            except (OSError, ValueError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                if connection is not None:
+                    connection[1].close()
+                if reused:
+                    fresh = True
+                    continue
+                self.stats['errors'] += 1
+                return None
+            if status == 421 and reused:
+                connection[1].close()
+                fresh = True
+                continue
+            if keep_alive and len(self.idle.setdefault(key, [])) < self.max_idle:
+                self.idle[key].append(connection)
+            else:
+                connection[1].close()
+            elapsed = time.monotonic() - started
+            self.observe(address, elapsed)
+            self.stats['responses'] += 1
+            self.stats['reused'] += reused
+            default_port = 443 if tls else 80
+            url = f"{scheme}://{name}{'' if port == default_port else f':{port}'}/"
+            return {'url': url, 'status': status, 'title': page_title(body), 'server': headers.get('server', ''),
+                    'ms': round(elapsed * 1000)}
+        return None
+    
+    async def exchange(self, connection, name):
+        """(status, headers, body, whether the connection can be reused) of a GET / for name"""
+        reader, writer = connection
+        host = name.encode('idna').decode('ascii')
+        writer.write(f"GET / HTTP/1.1\r\nHost: {host}\r\nUser-Agent: {PROBE_USER_AGENT}\r\n"
+                     f"Accept: text/html,*/*;q=0.8\r\nConnection: keep-alive\r\n\r\n".encode('ascii'))
+        await writer.drain()
+        # Interim responses such as 100 Continue come before the final one, 101 hands the connection over
+        status = 100
+        while status < 200 and status != 101:
+            head = await reader.readuntil(b'\r\n\r\n')
+            lines = head.decode('iso-8859-1').split('\r\n')
+            version, status = lines[0].split(' ', 2)[:2]
+            status = int(status)
+        headers = {}
+        for line in lines[1:]:
+            if ':' in line:
+                field, value = line.split(':', 1)
+                headers[field.strip().lower()] = value.strip()
+        body, complete = await self.read_body(reader, headers, status)
+        keep_alive = version == 'HTTP/1.1' and status != 101 and headers.get('connection', '').lower() != 'close'
+        return status, headers, body, keep_alive and complete
+    
+    async def read_body(self, reader, headers, status):
+        """(up to PROBE_BODY_BYTES of the body, whether all of it was read)"""
+        if status < 200 or status in (204, 304):
+            return b'', True
+        if 'chunked' in headers.get('transfer-encoding', '').lower():
+            body = bytearray()
+            while True:
+                size = int((await reader.readuntil(b'\r\n')).split(b';')[0], 16)
+                if not size:
+                    # Trailer fields up to an empty line
+                    while await reader.readuntil(b'\r\n') != b'\r\n':
+                        pass
+                    return bytes(body), True
+                if len(body) + size > PROBE_BODY_BYTES:
+                    body += await reader.readexactly(PROBE_BODY_BYTES - len(body))
+                    return bytes(body), False
+                body += await reader.readexactly(size)
+                await reader.readexactly(2)
+        if 'content-length' in headers:
+            length = int(headers['content-length'])
+            if length > PROBE_BODY_BYTES:
+                return await reader.readexactly(PROBE_BODY_BYTES), False
+            return await reader.readexactly(length), True
+        # The body ends when the server closes the connection
+        body = bytearray()
+        while len(body) < PROBE_BODY_BYTES:
+            chunk = await reader.read(PROBE_BODY_BYTES - len(body))
+            if not chunk:
+                break
+            body += chunk
+        return bytes(body), False
+
+def write_file_atomic(path, data):
+    """Replace path with data, leaving the old file in place if writing fails midway"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+def read_wordlist(path, start=0):
+    """(word, offset past its line) for each word of a wordlist from byte offset start on, read through a memory map"""
+    with open(path, 'rb') as f:
+        try:
+            wordlist = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # An empty file cannot be mapped and has no words anyway
+            return
+    with wordlist:
+        if hasattr(wordlist, 'madvise'):
+            wordlist.madvise(mmap.MADV_SEQUENTIAL)
+        wordlist.seek(start)
+        for line in iter(wordlist.readline, b''):
+            word = line.strip()
+            if word:
+                yield word.decode('utf-8', 'replace'), wordlist.tell()
+
+class Checkpoint:
+    """The wordlist offset before which every name has been resolved, saved now and then so a run can be resumed
+    
+    Names complete out of order, so the offset only moves past a line once all lines before it are done.
+    """
+    def __init__(self, path, wordlist, domain, output):
+        self.path = path
+        self.key = {'wordlist': os.path.abspath(wordlist), 'size': os.path.getsize(wordlist), 'domain': domain,
+                    'output': os.path.abspath(output)}
+        self.offset = 0
+        self.saved = time.monotonic()
+        # [offset past the line, done] for each name handed out, in wordlist order
+        self._lines = collections.deque()
+        self._by_name = {}
+    
+    def load(self):
+        """The offset an earlier run of the same wordlist, domain and output stopped at, 0 if there is none"""
+        try:
+            with open(self.path) as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return 0
+        if {name: saved.get(name) for name in self.key} != self.key:
+            return 0
+        self.offset = saved['offset']
+        return self.offset
+    
+    def track(self, words, domain):
+        """The name of each (word, offset) under domain, remembering its line until it is done"""
+        for word, offset in words:
+            name = f"{word}.{domain}"
+            line = [offset, False]
+            self._lines.append(line)
+            # A wordlist can list a word twice, its lines are done in the order they were handed out
+            self._by_name.setdefault(name, collections.deque()).append(line)
+            yield name
+    
+    def done(self, name):
+        lines = self._by_name[name]
+        lines.popleft()[1] = True
+        if not lines:
+            del self._by_name[name]
+        while self._lines and self._lines[0][1]:
+            self.offset = self._lines.popleft()[0]
+    
+    def due(self):
+        return time.monotonic() - self.saved >= CHECKPOINT_INTERVAL
+    
+    def save(self):
+        write_file_atomic(self.path, json.dumps(dict(self.key, offset=self.offset), indent=2))
+        self.saved = time.monotonic()
+    
+    def remove(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+def parse_args(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Resolve subdomains from a wordlist and save the active ones")
+    arg_parser.add_argument('domain', help="domain to look for subdomains of")
+    arg_parser.add_argument('wordlist', nargs='?', default='list.txt', help="file of subdomain labels, one per line")
+    arg_parser.add_argument('output', nargs='?', default='active_subdomains.txt',
+                        help="file the active subdomains are written to as fqdn,ip lines")
+    arg_parser.add_argument('--resolver', action='append', default=[], metavar='IP[:PORT]',
+                        help="DNS resolver to query (repeatable, default: the nameservers of /etc/resolv.conf)")
+    arg_parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help="names being resolved at once")
+    arg_parser.add_argument('--rate', type=float, default=DEFAULT_RATE,
+                        help="queries per second sent to each resolver (0 for no limit)")
+    arg_parser.add_argument('--timeout', type=float, default=QUERY_TIMEOUT,
+                        help="seconds to wait for an answer before sending the query again")
+    arg_parser.add_argument('--retries', type=int, default=QUERY_RETRIES,
+                        help="times a query is sent again after a timeout")
+    arg_parser.add_argument('--aaaa', action='store_true',
+                        help="look up IPv6 addresses as well")
+    arg_parser.add_argument('--all-addresses', action='store_true',
+                        help="write a line for every address of a subdomain, not only the first")
+    arg_parser.add_argument('--keep-wildcards', action='store_true',
+                        help="keep names answered by a wildcard record instead of leaving them out")
+    arg_parser.add_argument('--restart', action='store_true',
+                        help="start from the top of the wordlist even if an earlier run left a checkpoint")
+    arg_parser.add_argument('--probe', action='store_true',
+                        help="request each active subdomain over HTTPS and HTTP, adding url,status,title,server,ms "
+                             "to its line")
+    arg_parser.add_argument('--probe-concurrency', type=int, default=PROBE_CONCURRENCY,
+                        help="hosts being probed at once")
+    arg_parser.add_argument('--probe-timeout', type=float, default=PROBE_TIMEOUT,
+                        help="longest wait in seconds for a connection or response when probing")
+    arg_parser.add_argument('--https-port', type=int, default=443, help="port probed over HTTPS (0 to skip HTTPS)")
+    arg_parser.add_argument('--http-port', type=int, default=80, help="port probed over HTTP (0 to skip HTTP)")
+    return arg_parser.parse_args(argv)
+
+def main():
+    args = parse_args()
+    if not os.path.isfile(args.wordlist):
+        print(f"Error: Subdomain list file '{args.wordlist}' not found")
+        return 1
+    
+    record_types = (TYPE_A, TYPE_AAAA) if args.aaaa else (TYPE_A,)
+    resolver = SubdomainResolver(args.resolver or system_resolvers(), args.concurrency, args.rate, args.timeout,
+                                 args.retries, record_types, filter_wildcards=not args.keep_wildcards)
+    checkpoint = Checkpoint(args.output + '.checkpoint', args.wordlist, args.domain, args.output)
+    start = 0 if args.restart or not os.path.isfile(args.output) else checkpoint.load()
+    print(f"Checking subdomains for {args.domain} using list from {args.wordlist}...")
+    print(f"Only active subdomains will be saved to {args.output}")
+    # Names resolved after the last checkpoint are resolved again, but not written twice
+    saved = set()
+    if start:
+        with open(args.output) as f:
+            saved = {line.split(',', 1)[0] for line in f}
+        print(f"Resuming at {start * 100 // max(checkpoint.key['size'], 1)}% of the list "
+              f"with {len(saved)} active subdomains already saved")
+    print("-------------------------------------------------------------")
+    
+    prober = None
+    if args.probe:
+        ports = [(scheme, port) for scheme, port in (('https', args.https_port), ('http', args.http_port)) if port]
+        prober = HttpProber(args.probe_concurrency, args.probe_timeout, ports)
+    
+    started = time.monotonic()
+    with open(args.output, 'a' if start else 'w', newline='') as output:
+        rows = csv.writer(output, lineterminator='\n')
+        # name -> addresses still being probed, the name is done once none are left
+        probing = {}
+        
+        def finish(name):
+            checkpoint.done(name)
+            if checkpoint.due():
+                # The lines of every name before the checkpoint must be on disk first
+                output.flush()
+                checkpoint.save()
+        
+        def on_probe(name, address, probe):
+            if probe:
+                print(f"[\033[0;32mACTIVE\033[0m] {name} ({address}) {probe['status']} {probe['url']} "
+                      f"[{probe['server'] or '-'}] \"{probe['title']}\" {probe['ms']} ms")
+                rows.writerow([name, address] + [probe[field] for field in ('url', 'status', 'title', 'server', 'ms')])
+            else:
+                print(f"[\033[0;32mACTIVE\033[0m] {name} ({address}) no HTTP response")
+                rows.writerow([name, address, '', '', '', '', ''])
+            probing[name] -= 1
+            if not probing[name]:
+                del probing[name]
+                finish(name)
+        
+        async def on_result(name, result):
+            if result and result[0] and name not in saved:
+                addresses = result[0] if args.all_addresses else result[0][:1]
+                saved.add(name)
+                if prober:
+                    # The line is written once the probe is done, meanwhile the resolver carries on
+                    probing[name] = len(addresses)
+                    for address in addresses:
+                        await prober.submit(name, address, on_probe)
+                    return
+                print(f"[\033[0;32mACTIVE\033[0m] {name} ({', '.join(addresses)})")
+                for address in addresses:
+                    output.write(f"{name},{address}\n")
+            finish(name)
+        
+        async def run(names):
+            await resolver.resolve_all(names, on_result)
+            if prober:
+                await prober.join()
+        
+        names = checkpoint.track(read_wordlist(args.wordlist, start), args.domain)
+        try:
+            asyncio.run(run(names))
+        except KeyboardInterrupt:
+            output.flush()
+            checkpoint.save()
+            print(f"\nInterrupted, run the same command again to carry on from {checkpoint.path}")
+            return 130
+    checkpoint.remove()
+    
+    elapsed = time.monotonic() - started
+    stats = resolver.stats
+    print("-------------------------------------------------------------")
+    print(f"Found {len(saved)} active subdomains and saved to {args.output}")
+    print(f"{stats['queries']} queries in {elapsed:.1f}s ({stats['queries'] / elapsed if elapsed else 0:.0f}/s), "
+          f"{stats['timeouts']} timeouts, {stats['tcp']} retried over TCP, {stats['failed']} names unanswered, "
+          f"{stats['wildcard']} wildcard answers left out")
+    if prober:
+        stats = prober.stats
+        print(f"{stats['responses']} HTTP responses to {stats['probes']} requests, {stats['timeouts']} timeouts, "
+              f"{stats['connections']} connections opened, {stats['reused']} requests on a reused connection")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())